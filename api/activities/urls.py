@@ -1,6 +1,7 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import ActivityDetailAPIView
 
 urlpatterns = [
-    path("<int:pk>/", ActivityDetailAPIView.as_view(), name="activity-detail"),
+    path("<int:pk>/", read_view(ActivityDetailAPIView), name="activity-detail"),
 ]
@@ -0,0 +1,114 @@
+"""
+Async entry points for the public read endpoints.
+
+Under ASGI, Django runs a plain sync view through
+sync_to_async(thread_sensitive=True), which funnels every request of a worker
+process through one shared thread. read_view() wraps a DRF view in a native
+async view that runs it on a bounded thread pool of its own instead, so many
+catalog reads can be waiting on the database at once while the event loop keeps
+accepting (and slowly writing to) other connections.
+
+Django 4.2's async ORM methods (aget, acount, ...) are themselves
+thread_sensitive sync_to_async wrappers and the read views lean on
+prefetch_related, which has no async form yet, so the pool is the one place the
+ORM work happens for these endpoints.
+
+read_view() is also where catalog reads are pointed at a read replica (see
+apps/common/db_router.py), with a retry on the primary if the replica fails.
+
+Streaming responses need an async iterator under ASGI: Django drains a sync
+one with sync_to_async(list) before sending anything. async_stream() adapts
+a sync generator batch by batch instead.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from itertools import islice
+
+from asgiref.sync import SyncToAsync, sync_to_async
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+
+from apps.common import db_router
+
+_executor = None
+
+
+def get_executor():
+    """
+    Returns the process-wide pool used by the async read views.
+    Each thread holds at most one DB connection, so ASYNC_READ_THREADS is also
+    the per-process connection ceiling for these endpoints.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_READ_THREADS,
+            thread_name_prefix="async-read",
+        )
+    return _executor
+
+
+def _render(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    # Render inside the routing context; serializers may still touch the DB
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def read_view(view_class, **initkwargs):
+    """
+    Drop-in replacement for view_class.as_view() on read-only endpoints.
+    Returns a sync view unless ASYNC_READ_VIEWS is enabled.
+    """
+    view = view_class.as_view(**initkwargs)
+
+    @wraps(view)
+    def sync_view(request, *args, **kwargs):
+        alias = db_router.replica_for(request)
+        if alias:
+            try:
+                with db_router.reading_from(alias):
+                    return _render(view, request, *args, **kwargs)
+            except OperationalError:
+                # Safe to replay a read; skip this replica until its next probe
+                db_router.mark_unhealthy(alias)
+        return _render(view, request, *args, **kwargs)
+
+    if not settings.ASYNC_READ_VIEWS:
+        return sync_view
+
+    def run(request, *args, **kwargs):
+        # Pool threads live outside Django's request cycle, so recycle stale
+        # connections here the way request_started/request_finished would
+        close_old_connections()
+        try:
+            return sync_view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        handler = SyncToAsync(run, thread_sensitive=False, executor=get_executor())
+        return await handler(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_stream(iterator, batch_size=500):
+    """
+    Async iterator over a sync generator of str chunks, joined `batch_size`
+    at a time. Every batch is pulled on the one thread-sensitive thread, so a
+    server-side cursor the generator holds stays on its connection's thread.
+    """
+    iterator = iter(iterator)
+    next_batch = sync_to_async(lambda: "".join(islice(iterator, batch_size)), thread_sensitive=True)
+
+    async def chunks():
+        while True:
+            chunk = await next_batch()
+            if not chunk:
+                return
+            yield chunk
+
+    return chunks()
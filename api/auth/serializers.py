@@ -1,8 +1,9 @@
-import random
-from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
 
+from .services import OTPService
+
 User = get_user_model()
 
 
@@ -17,7 +18,6 @@ class RegisterSerializer(serializers.Serializer):
         return value
 
     def create(self, validated_data):
-        otp = str(random.randint(100000, 999999))
         phone = validated_data["phone"]
         email = validated_data.get("email", "")
         full_name = validated_data.get("full_name", "")
@@ -33,23 +33,20 @@ class RegisterSerializer(serializers.Serializer):
         # Generate a unique username from phone number
         username = f"user_{phone}"
         
-        # Create user with random password (we don't use passwords, but Django requires one)
-        random_password = User.objects.make_random_password(length=50)
-        user = User.objects.create_user(
-            username=username,
-            phone=phone,
-            email=email,
-            first_name=first_name,
-            last_name=last_name,
-            password=random_password,
-        )
-        # Set unusable password so it can't be used for login
-        user.set_unusable_password()
-        user.otp_token = otp
-        user.otp_created_at = timezone.now()
-        user.is_phone_verified = False
-        user.save()
-        
+        with transaction.atomic():
+            # Rate limits apply before the user row is written
+            OTPService.issue(phone, self.context.get("request"))
+
+            # No password means an unusable one, so it can't be used for login
+            user = User.objects.create_user(
+                username=username,
+                phone=phone,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                password=None,
+                is_phone_verified=False,
+            )
         return user
 
 
@@ -62,16 +59,10 @@ class LoginSerializer(serializers.Serializer):
         return value
 
     def create(self, validated_data):
+        # The OTP lives in OTPCode, so logging in never writes the user row
         phone = validated_data["phone"]
-        user = User.objects.get(phone=phone)
-        
-        # Generate new OTP
-        otp = str(random.randint(100000, 999999))
-        user.otp_token = otp
-        user.otp_created_at = timezone.now()
-        user.save()
-        
-        return user
+        OTPService.issue(phone, self.context.get("request"))
+        return validated_data
 
 
 class OTPVerificationSerializer(serializers.Serializer):
@@ -81,24 +72,16 @@ class OTPVerificationSerializer(serializers.Serializer):
     def validate(self, attrs):
         phone = attrs.get("phone")
         otp = attrs.get("otp")
-        
+
+        error = OTPService.verify(phone, otp, self.context.get("request"))
+        if error:
+            raise serializers.ValidationError({"otp": error})
+
+        # OTPs are only issued for registered phones; the user is loaded once the code checks out
         try:
             user = User.objects.get(phone=phone)
         except User.DoesNotExist:
             raise serializers.ValidationError({"phone": "User with this phone number does not exist."})
-        
-        if not user.otp_token:
-            raise serializers.ValidationError({"otp": "No OTP found. Please request a new OTP."})
-        
-        if user.otp_token != otp:
-            raise serializers.ValidationError({"otp": "Invalid OTP."})
-        
-        # Check if OTP is expired (15 minutes)
-        from django.utils import timezone
-        if user.otp_created_at:
-            time_diff = timezone.now() - user.otp_created_at
-            if time_diff.total_seconds() > 900:  # 15 minutes
-                raise serializers.ValidationError({"otp": "OTP has expired. Please request a new one."})
-        
+
         attrs["user"] = user
         return attrs
@@ -0,0 +1,135 @@
+import secrets
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from apps.accounts.models import OTPCode
+from apps.notifications.services import NotificationService
+
+
+class RateLimitService:
+    """
+    Sliding-window rate limits kept in the Django cache.
+
+    Counts hits in fixed windows and weights the previous window by how much of
+    it still overlaps the sliding window, which approximates a true sliding log
+    with two cache keys per identity.
+    """
+
+    @staticmethod
+    def parse(rate):
+        # "5/900" -> (5 requests, 900 seconds)
+        limit, window = rate.split("/")
+        return int(limit), int(window)
+
+    @staticmethod
+    def hit(scope, ident, rate):
+        """
+        Records a hit and raises Throttled (HTTP 429 with Retry-After) once the
+        sliding-window count goes over the limit.
+        """
+        limit, window = RateLimitService.parse(rate)
+        now = time.time()
+        current = int(now // window)
+        elapsed = now - current * window
+
+        key = f"ratelimit:{scope}:{ident}:{current}"
+        previous = cache.get(f"ratelimit:{scope}:{ident}:{current - 1}", 0)
+        cache.add(key, 0, window * 2)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, window * 2)
+            count = 1
+
+        weighted = previous * (window - elapsed) / window + count
+        if weighted > limit:
+            raise Throttled(wait=window - elapsed)
+
+    @staticmethod
+    def client_ident(request):
+        """Client IP, honouring X-Forwarded-For up to REST_FRAMEWORK NUM_PROXIES."""
+        if request is None:
+            return "unknown"
+        return BaseThrottle().get_ident(request)
+
+
+class OTPService:
+    """
+    Issues and verifies login OTPs stored hashed in OTPCode, one row per phone.
+    """
+
+    @staticmethod
+    def hash_code(phone, code):
+        return salted_hmac("api.auth.otp", f"{phone}:{code}", algorithm="sha256").hexdigest()
+
+    @staticmethod
+    def issue(phone, request=None):
+        """
+        Generates a new OTP for the phone (replacing any pending one) and
+        queues the SMS that delivers it.
+        """
+        limits = settings.OTP_RATE_LIMITS
+        RateLimitService.hit("otp-send-phone", phone, limits["send_phone"])
+        RateLimitService.hit("otp-send-ip", RateLimitService.client_ident(request), limits["send_ip"])
+
+        code = f"{secrets.randbelow(1000000):06d}"
+        with transaction.atomic():
+            OTPCode.objects.update_or_create(
+                phone=phone,
+                defaults={
+                    "code_hash": OTPService.hash_code(phone, code),
+                    "attempts": 0,
+                    "expires_at": timezone.now() + timedelta(seconds=settings.OTP_TTL_SECONDS),
+                },
+            )
+            # Delivered by send_notifications; sending inline would hold up the login request
+            NotificationService.otp(phone, code)
+
+    @staticmethod
+    def verify(phone, code, request=None):
+        """
+        Checks a code against the pending OTP. Returns None on success (the OTP
+        is consumed) or an error message for the client.
+        """
+        RateLimitService.hit(
+            "otp-verify-ip", RateLimitService.client_ident(request), settings.OTP_RATE_LIMITS["verify_ip"]
+        )
+
+        otp = OTPCode.objects.filter(phone=phone).only("code_hash", "expires_at").first()
+        if otp is None:
+            return "No OTP found. Please request a new OTP."
+
+        if otp.expires_at <= timezone.now():
+            otp.delete()
+            return "OTP has expired. Please request a new one."
+
+        if not constant_time_compare(otp.code_hash, OTPService.hash_code(phone, code)):
+            # Conditional F() update so parallel guesses can't share one attempt
+            counted = OTPCode.objects.filter(
+                pk=otp.pk, attempts__lt=settings.OTP_MAX_ATTEMPTS - 1
+            ).update(attempts=F("attempts") + 1)
+            if not counted:
+                OTPCode.objects.filter(pk=otp.pk).delete()
+                return "Too many incorrect attempts. Please request a new OTP."
+            return "Invalid OTP."
+
+        # Only one request can consume the code
+        deleted, _ = OTPCode.objects.filter(pk=otp.pk).delete()
+        if not deleted:
+            return "No OTP found. Please request a new OTP."
+        return None
+
+    @staticmethod
+    def purge_expired():
+        deleted, _ = OTPCode.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
@@ -10,15 +10,14 @@ class RegisterAPIView(APIView):
     permission_classes = []
 
     def post(self, request):
-        serializer = RegisterSerializer(data=request.data)
+        serializer = RegisterSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        serializer.save()
 
         return Response(
             {
                 "message": "OTP sent to your phone number",
-                "otp": user.otp_token,  # In production, remove this and send via SMS
-                "phone": user.phone,
+                "phone": serializer.validated_data["phone"],
             },
             status=status.HTTP_201_CREATED,
         )
@@ -28,15 +27,14 @@ class LoginAPIView(APIView):
     permission_classes = []
 
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        serializer = LoginSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        serializer.save()
 
         return Response(
             {
                 "message": "OTP sent to your phone number",
-                "otp": user.otp_token,  # In production, remove this and send via SMS
-                "phone": user.phone,
+                "phone": serializer.validated_data["phone"],
             },
             status=status.HTTP_200_OK,
         )
@@ -46,13 +44,14 @@ class OTPVerificationAPIView(APIView):
     permission_classes = []
 
     def post(self, request):
-        serializer = OTPVerificationSerializer(data=request.data)
+        serializer = OTPVerificationSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        # Mark phone as verified
-        user.is_phone_verified = True
-        user.save()
+        # Mark phone as verified; only the first login writes the user row
+        if not user.is_phone_verified:
+            user.is_phone_verified = True
+            user.save(update_fields=["is_phone_verified"])
 
         # Generate JWT tokens
         refresh = RefreshToken.for_user(user)
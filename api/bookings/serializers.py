@@ -1,3 +1,4 @@
+from collections import Counter
 from rest_framework import serializers
 from django.db import transaction
 from django.db.models import Q
@@ -9,6 +10,25 @@ from apps.packages.models import HolidayPackage
 from apps.activities.models import Activity
 from apps.cabs.models import Cab, CabPricingOption
 from apps.houseboats.models import HouseBoat
+from api.cabs.services import CabFareService, CabScheduleService
+from api.coupons.services import CouponService
+from api.houseboats.services import HouseBoatRateService
+from api.properties.services import RoomRateService
+from apps.jobs.queue import JobQueue
+from apps.notifications.services import NotificationService
+from .services import PricingSnapshotService, PriceQuoteService
+
+def get_primary_image(images):
+    """
+    Returns the primary image (or the first one) from an images manager.
+    Reads from the prefetch cache when BookingDetailLoader has populated it.
+    """
+    images = list(images.all())
+    return next((img for img in images if img.is_primary), None) or (images[0] if images else None)
+
+def get_first_item(booking):
+    # items.first() would bypass the prefetched items, so read the cached list
+    return next(iter(booking.items.all()), None)
 
 class BookingItemInputSerializer(serializers.Serializer):
     room_type_id = serializers.IntegerField(required=False)
@@ -37,6 +57,7 @@ class BookingCreateSerializer(serializers.ModelSerializer):
     items = BookingItemInputSerializer(many=True, write_only=True)
     check_in = serializers.DateField(write_only=True)
     check_out = serializers.DateField(write_only=True)
+    quote_token = serializers.CharField(write_only=True, required=False, allow_blank=True)
     
     class Meta:
         model = Booking
@@ -52,7 +73,8 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             "check_in",
             "check_out",
             "is_insurance_opted",
-            "payment_option"
+            "payment_option",
+            "quote_token"
         ]
         read_only_fields = ["id", "total_amount", "amount_paid", "status", "created_at"]
 
@@ -136,13 +158,12 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                     if overlapping_bookings.exists():
                         raise serializers.ValidationError(f"Property '{property_obj.name}' is already booked for these dates.")
                 
-                # Pricing: Room Rate * Nights * Quantity
-                if room_option:
-                     price_per_night = room_option.discounted_price + room_option.gst_amount
-                else:
-                     price_per_night = room_type.total_payable_amount
+                # Pricing: Sum of Nightly Rates * Quantity
+                nightly, closed_nights = RoomRateService.stay_prices(room_type, room_option, check_in, check_out)
+                if closed_nights:
+                    raise serializers.ValidationError(f"'{room_type.name}' is not available on {closed_nights[0]:%d %b %Y}.")
                 
-                item_total = price_per_night * nights * quantity
+                item_total = sum(base + tax for base, tax in nightly) * quantity
                 total_price += item_total
 
         # PACKAGE BOOKING VALIDATION
@@ -225,7 +246,14 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 quantity = item["quantity"]
                 
                 # Pricing Logic
-                full_price = cab.base_price
+                quote = CabFareService.quote(cab, item.get("pickup_location"), item.get("drop_location"), item.get("trip_type"))
+                full_price = quote["discounted_fare"]
+
+                pickup_at = item.get("pickup_datetime")
+                if pickup_at:
+                    duration = CabScheduleService.trip_duration(quote["trip_km"])
+                    if CabScheduleService.free_units([cab], pickup_at, duration)[cab.pk] < quantity:
+                        raise serializers.ValidationError(f"'{cab.title}' is not available for a pickup at {pickup_at:%d %b %Y %H:%M}.")
                 
                 # Handle Payment Option
                 if payment_option == "part":
@@ -267,9 +295,10 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 item["houseboat_obj"] = houseboat
                 quantity = item["quantity"]
                 
-                # Pricing: (Discounted Price) * Quantity * Nights + 18% GST
-                pricing = houseboat.calculate_pricing()
-                price = pricing["discounted_price"]
+                # Pricing: (Nightly Discounted Prices) * Quantity + 18% GST
+                nightly, closed_nights = HouseBoatRateService.stay_prices(houseboat, check_in, check_out)
+                if closed_nights:
+                    raise serializers.ValidationError(f"'{houseboat.name}' is not available on {closed_nights[0]:%d %b %Y}.")
                 
                 # Check for Extra Guests
                 extra_guest_total = Decimal(0)
@@ -307,21 +336,47 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 if is_ac_opted:
                      ac_total = houseboat.full_time_ac_price
                 
-                # Convert float price to Decimal
-                price_decimal = serializers.DecimalField(max_digits=12, decimal_places=2).to_internal_value(str(price))
-                
-                # Total Per Night = Base Price + Extra Guests + AC
-                nightly_total = price_decimal + extra_guest_total + ac_total
-                
-                subtotal = nightly_total * quantity * nights
+                # Nightly Prices + (Extra Guests + AC) per night
+                subtotal = (sum(nightly) + (extra_guest_total + ac_total) * nights) * quantity
                 tax_amount = (subtotal * Decimal("0.18")).quantize(Decimal("0.01"))
                 item_total = subtotal + tax_amount
                 
                 total_price += item_total
 
         attrs["total_price"] = total_price
+
+        # A valid quote for this exact cart fixes the payable amounts from review time
+        quote = self.get_valid_quote(attrs)
+        if quote:
+            attrs["total_price"] = Decimal(quote["final_total"])
+            attrs["insurance_amount"] = Decimal(quote["insurance_fee"])
+            # The quoted total includes this coupon's discount, so it must be redeemed
+            attrs["quote_coupon"] = CouponService.get_active(quote["coupon_code"])
         return attrs
 
+    def get_valid_quote(self, attrs):
+        request = self.context.get("request")
+        token = attrs.get("quote_token")
+        if not token or not request:
+            return None
+
+        payload = PriceQuoteService.verify(token, request.user)
+        if not payload:
+            return None
+
+        booking_type = attrs.get("booking_type", "stay")
+        inputs_hash = PricingSnapshotService.inputs_hash(
+            booking_type,
+            PricingSnapshotService.expand_items(booking_type, attrs["items"]),
+            attrs["check_in"],
+            attrs["check_out"],
+            self.initial_data.get("coupon_code") or None,
+            attrs.get("is_insurance_opted", False),
+        )
+        if payload["inputs_hash"] != inputs_hash or not PriceQuoteService.is_current(payload):
+            return None
+        return payload
+
     def create(self, validated_data):
         items_data = validated_data.pop("items")
         booking_type = validated_data.get("booking_type", "stay")
@@ -330,6 +385,8 @@ class BookingCreateSerializer(serializers.ModelSerializer):
         check_in = validated_data.pop("check_in", None)
         check_out = validated_data.pop("check_out", None)
         property_id = validated_data.pop("property_id", None)
+        validated_data.pop("quote_token", None)
+        quote_coupon = validated_data.pop("quote_coupon", None)
         
         # Remove helper objects from validated_data
         property_obj = validated_data.pop("property_obj", None)
@@ -358,8 +415,13 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 amount_paid=amount_paid,
                 part_payment_amount=part_payment_amount,
                 status=status,
+                coupon_id=quote_coupon["id"] if quote_coupon else None,
                 **validated_data
             )
+
+            # Drafts redeem at confirm instead
+            if quote_coupon and status != "draft":
+                CouponService.redeem(quote_coupon["id"], booking.user, booking)
             
             for item in items_data:
                 common_data = {
@@ -418,6 +480,9 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                             full_time_ac_amount=houseboat.full_time_ac_price if item.get("is_full_time_ac_opted", False) else 0,
                             **common_data
                         )
+
+            # Side effects run in the job worker, and only if this booking commits
+            JobQueue.enqueue_on_commit("bookings.created", {"booking_id": booking.id}, priority=1)
         
         return booking
 
@@ -557,13 +622,13 @@ class BookingItemSerializer(serializers.ModelSerializer):
             # Property model has primary_image property
             image_obj = obj.property.primary_image
         elif obj.package:
-            image_obj = obj.package.images.filter(is_primary=True).first() or obj.package.images.first()
+            image_obj = get_primary_image(obj.package.images)
         elif obj.activity:
-            image_obj = obj.activity.images.filter(is_primary=True).first() or obj.activity.images.first()
+            image_obj = get_primary_image(obj.activity.images)
         elif obj.cab:
-            image_obj = obj.cab.images.filter(is_primary=True).first() or obj.cab.images.first()
+            image_obj = get_primary_image(obj.cab.images)
         elif obj.houseboat:
-            image_obj = obj.houseboat.images.filter(is_primary=True).first() or obj.houseboat.images.first()
+            image_obj = get_primary_image(obj.houseboat.images)
             
         if image_obj and image_obj.image:
             request = self.context.get("request")
@@ -595,7 +660,7 @@ class BookingListSerializer(serializers.ModelSerializer):
         ]
 
     def get_formatted_id(self, obj):
-        return f"#{obj.id}"
+        return obj.display_reference
 
 class BookingDetailSerializer(serializers.ModelSerializer):
     items = BookingItemSerializer(many=True, read_only=True)
@@ -635,11 +700,11 @@ class BookingDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_formatted_id(self, obj):
-        return f"#{obj.id}"
+        return obj.display_reference
 
     def get_cancellation_policy(self, obj):
         # Attempt to get policy from the first item (primary service)
-        first_item = obj.items.first()
+        first_item = get_first_item(obj)
         if first_item:
             if first_item.property:
                 return first_item.property.cancellation_policy
@@ -655,7 +720,7 @@ class BookingDetailSerializer(serializers.ModelSerializer):
 
     def get_rules(self, obj):
         # Attempt to get rules from the first item (primary service)
-        first_item = obj.items.first()
+        first_item = get_first_item(obj)
         if first_item:
             if first_item.property:
                 return first_item.property.rules
@@ -676,6 +741,7 @@ class BookingConfirmSerializer(serializers.ModelSerializer):
         queryset=Traveller.objects.all(),
         required=False
     )
+    quote_token = serializers.CharField(write_only=True, required=False, allow_blank=True)
     
     class Meta:
         model = Booking
@@ -684,6 +750,7 @@ class BookingConfirmSerializer(serializers.ModelSerializer):
             "special_requests", 
             "is_gst_required", "gst_number", "company_name", "company_address",
             "travellers", 
+            "quote_token",
             "status"
         ]
         read_only_fields = ["status"]
@@ -696,6 +763,7 @@ class BookingConfirmSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         travellers = validated_data.pop("travellers", [])
+        quote_token = validated_data.pop("quote_token", None)
         
         # Update standard fields
         for attr, value in validated_data.items():
@@ -713,6 +781,80 @@ class BookingConfirmSerializer(serializers.ModelSerializer):
                     is_primary=False # We rely on Booking contact info for primary contact
                 )
             
+            # Trust a valid quote from the review step; reprice only if the catalog moved
+            PriceQuoteService.settle(instance, quote_token, self.context["request"].user)
+
+            if instance.booking_type == "cab":
+                self.check_fleet(instance)
+
+            # Count the coupon against its usage limits; raises (and rolls back) when exhausted.
+            # A coupon that expired or was withdrawn since review was dropped by the reprice
+            if instance.coupon_id:
+                if (instance.pricing_breakdown or {}).get("coupon_applied"):
+                    CouponService.redeem(instance.coupon_id, instance.user, instance)
+                else:
+                    instance.coupon = None
+
             instance.status = 'confirmed' 
             instance.save()
+
+            # Outbox rows commit (or roll back) together with the confirmation
+            NotificationService.booking_confirmed(instance)
+            JobQueue.enqueue_on_commit("bookings.confirmed", {"booking_id": instance.id}, priority=5)
+            JobQueue.enqueue_on_commit("invoices.generate", {"booking_id": instance.id}, queue="invoices")
         return instance
+
+    @staticmethod
+    def check_fleet(booking):
+        """
+        Drafts hold no vehicles, so several drafts may have been reviewed
+        against the same last free one. Re-checks each trip of the booking
+        with its cab rows locked, so concurrent confirmations of a cab take
+        turns and only those that still fit the fleet go through.
+        """
+        trips = Counter(booking.items.filter(cab__isnull=False, pickup_datetime__isnull=False).values_list(
+            "cab_id", "pickup_datetime", "pickup_location", "drop_location", "trip_type"
+        ))
+        if not trips:
+            return
+        cabs = Cab.objects.select_for_update().order_by("pk").in_bulk({cab_id for cab_id, *_ in trips})
+        for (cab_id, pickup_at, pickup, drop, trip_type), quantity in trips.items():
+            cab = cabs[cab_id]
+            duration = CabScheduleService.route_duration(pickup, drop, trip_type)
+            if CabScheduleService.free_units([cab], pickup_at, duration)[cab.pk] < quantity:
+                raise serializers.ValidationError(f"'{cab.title}' is no longer available for a pickup at {pickup_at:%d %b %Y %H:%M}.")
+
+
+class BookingExportQuerySerializer(serializers.Serializer):
+    """Query parameters of the booking export (also used by the export_bookings command)."""
+    kind = serializers.ChoiceField(choices=["bookings", "items"], default="bookings")
+    # Not "format": DRF reserves that query parameter for renderer selection
+    output = serializers.ChoiceField(choices=["csv", "jsonl"], default="csv")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    booking_type = serializers.ChoiceField(choices=Booking.BOOKING_TYPE, required=False)
+    status = serializers.CharField(required=False, help_text="Comma-separated booking statuses")
+    property = serializers.IntegerField(required=False)
+
+    def validate_status(self, value):
+        statuses = [status.strip() for status in value.split(",") if status.strip()]
+        known = {choice for choice, _ in Booking.STATUS}
+        unknown = [status for status in statuses if status not in known]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown status: {', '.join(unknown)}")
+        return statuses
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        return attrs
+
+    def filters(self):
+        data = self.validated_data
+        return {
+            "date_from": data.get("date_from"),
+            "date_to": data.get("date_to"),
+            "booking_type": data.get("booking_type"),
+            "statuses": data.get("status"),
+            "property_id": data.get("property"),
+        }
@@ -1,12 +1,67 @@
+import csv
+import hashlib
+import json
+from datetime import datetime, time, timedelta
 from decimal import Decimal
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, Prefetch
 from django.utils import timezone
-from apps.bookings.models import BookingItem
-from apps.properties.models import Property, RoomType, RoomOption
+from rest_framework import status
+from rest_framework.response import Response
+from apps.bookings.models import Booking, BookingItem, IdempotencyKey
+from apps.properties.models import Property, RoomType, RoomOption, RoomRate
 from apps.packages.models import HolidayPackage
 from apps.activities.models import Activity
 from apps.cabs.models import Cab, CabPricingOption
-from apps.houseboats.models import HouseBoat
-from apps.coupons.models import Coupon
+from apps.houseboats.models import HouseBoat, HouseBoatRate
+from api.cabs.services import CabFareService
+from api.coupons.services import CouponService
+from api.houseboats.services import HouseBoatRateService
+from api.properties.services import RoomRateService
+
+def stable_hash(data):
+    """
+    SHA-256 of the canonical JSON form of data (sorted keys, Decimals/dates as strings).
+    """
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class BookingDetailLoader:
+    """
+    Loads bookings together with everything BookingItemSerializer touches.
+    Items are fetched once, then each item type (property, package, activity,
+    cab, houseboat) is resolved with a single prefetch carrying its own nested
+    images/amenities/features/inclusions, so rendering costs a fixed number of
+    queries regardless of how many items a booking has.
+    """
+
+    @staticmethod
+    def items_queryset():
+        return (
+            BookingItem.objects
+            .select_related("room_type")
+            .prefetch_related(
+                Prefetch("property", queryset=Property.objects.prefetch_related("images", "amenities")),
+                Prefetch("package", queryset=HolidayPackage.objects.prefetch_related("images", "features")),
+                Prefetch("activity", queryset=Activity.objects.prefetch_related("images")),
+                Prefetch("cab", queryset=Cab.objects.select_related("category").prefetch_related("images", "inclusions")),
+                Prefetch("houseboat", queryset=HouseBoat.objects.select_related("meal_plan").prefetch_related("images")),
+            )
+            .order_by("id")
+        )
+
+    @staticmethod
+    def load(queryset):
+        """
+        Attaches the per-type item prefetches to a Booking queryset.
+        """
+        return queryset.select_related("user").prefetch_related(
+            Prefetch("items", queryset=BookingDetailLoader.items_queryset())
+        )
+
 
 class BookingPricingService:
     @staticmethod
@@ -52,21 +107,19 @@ class BookingPricingService:
                 quantity = item.get("quantity", 1)
                 room_type = RoomType.objects.get(id=room_type_id)
                 
+                room_option = None
                 if room_option_id:
                     room_option = RoomOption.objects.get(id=room_option_id)
-                    price_per_night = room_option.discounted_price + room_option.gst_amount
-                    base_price_per_night = room_option.discounted_price
-                    tax_per_night = room_option.gst_amount
                     item_name = f"{room_type.name} - {room_option.name}"
                 else:
-                    price_per_night = room_type.total_payable_amount
-                    base_price_per_night = room_type.discounted_price
-                    tax_per_night = room_type.gst_amount
                     item_name = room_type.name
 
-                item_total_inc_tax = price_per_night * nights * quantity
-                item_total_base = base_price_per_night * nights * quantity
-                item_total_tax = tax_per_night * nights * quantity
+                # Nightly rates (seasons, per-date overrides) fall back to the base price
+                nightly, _ = RoomRateService.stay_prices(room_type, room_option, check_in, check_out)
+                item_total_base = sum(base for base, _ in nightly) * quantity
+                item_total_tax = sum(tax for _, tax in nightly) * quantity
+                item_total_inc_tax = item_total_base + item_total_tax
+                price_per_night = ((item_total_inc_tax / quantity) / nights).quantize(Decimal("0.01"))
                 
                 item_details = {
                     "name": item_name,
@@ -178,8 +231,10 @@ class BookingPricingService:
                 cab = Cab.objects.get(id=cab_id)
                 
                 # Pricing Logic
-                # Use base_price as the full payment amount for now (Airport Transfer/Flat Rate)
-                full_price = cab.base_price
+                # Distance-based fare for the trip; flat base_price when the places are unknown
+                quote = CabFareService.quote(cab, item.get("pickup_location"), item.get("drop_location"), item.get("trip_type"))
+                # The cab's discount applies, as on the search results
+                full_price = quote["discounted_fare"]
                 
                 # Check for pricing options (Part Payment vs Full Payment)
                 pricing_opts = CabPricingOption.objects.filter(cab=cab)
@@ -236,7 +291,9 @@ class BookingPricingService:
                     "quantity": quantity,
                     "pickup_datetime": item.get("pickup_datetime"),
                     "trip_type": item.get("trip_type"),
+                    "distance_km": quote["trip_km"],
                     "price_per_unit": full_price,
+                    "base_price_per_unit": quote["fare"],
                     "total": item_price + item_tax,
                     "image": BookingPricingService._get_image(cab, "cab"),
                     "payment_options": payment_options,
@@ -251,8 +308,8 @@ class BookingPricingService:
                 quantity = item.get("quantity", 1)
                 houseboat = HouseBoat.objects.get(id=houseboat_id)
                 
-                pricing = houseboat.calculate_pricing()
-                price_per_night = Decimal(str(pricing["discounted_price"]))
+                nightly, _ = HouseBoatRateService.stay_prices(houseboat, check_in, check_out)
+                price_per_night = (sum(nightly) / nights).quantize(Decimal("0.01"))
                 
                 # Check for Extra Guests
                 extra_guest_total = Decimal(0)
@@ -290,10 +347,8 @@ class BookingPricingService:
                 if is_ac_opted:
                      ac_total = houseboat.full_time_ac_price
 
-                # Total Per Night = Base Price + Extra Guests + AC
-                nightly_total = price_per_night + extra_guest_total + ac_total
-                
-                item_price = nightly_total * quantity * nights
+                # Nightly Prices + (Extra Guests + AC) per night
+                item_price = (sum(nightly) + (extra_guest_total + ac_total) * nights) * quantity
                 
                 # Apply 18% GST for houseboats
                 gst_rate = Decimal("0.18")
@@ -323,20 +378,17 @@ class BookingPricingService:
         
         gross_total = total_base_price + total_tax_amount
         
-        if coupon_code:
-            try:
-                coupon = Coupon.objects.get(code=coupon_code, valid_from__lte=timezone.now().date(), valid_to__gte=timezone.now().date())
-                coupon_discount = coupon.discount_amount
+        coupon = CouponService.get_active(coupon_code)
+        if coupon:
+            coupon_discount = coupon["discount_amount"]
+            
+            if coupon_discount > gross_total:
+                coupon_discount = gross_total
                 
-                if coupon_discount > gross_total:
-                    coupon_discount = gross_total
-                    
-                coupon_applied = {
-                    "code": coupon.code,
-                    "discount_amount": coupon_discount
-                }
-            except Coupon.DoesNotExist:
-                pass
+            coupon_applied = {
+                "code": coupon["code"],
+                "discount_amount": coupon_discount
+            }
 
         # Insurance Logic
         insurance_fee = Decimal(0)
@@ -354,3 +406,592 @@ class BookingPricingService:
             "coupon_applied": coupon_applied,
             "final_total": final_total
         }
+
+
+class PricingSnapshotService:
+    """
+    Persists the review-time pricing on the booking (pricing_breakdown) together
+    with a version hash of its inputs and the catalog rows it was priced from.
+    The review screen is polled during checkout, so GET serves the stored
+    snapshot and only re-runs BookingPricingService when the version changes.
+    """
+
+    @staticmethod
+    def items_from_booking(booking):
+        """
+        Rebuilds pricing-service inputs from the persisted BookingItem rows.
+        Each row is one unit, so quantity is always 1.
+        """
+        items_data = []
+        check_in = None
+        check_out = None
+
+        rows = booking.items.order_by("id").values(
+            "check_in", "check_out", "adults", "children",
+            "room_type_id", "room_option_id", "package_id", "activity_id", "cab_id", "houseboat_id",
+            "is_full_time_ac_opted", "pickup_location", "drop_location", "pickup_datetime", "trip_type",
+        )
+        for row in rows:
+            # Capture check_in/check_out from the first item (should be same for all in a booking)
+            if check_in is None:
+                check_in = row["check_in"]
+                check_out = row["check_out"]
+
+            item_dict = {
+                "quantity": 1,
+                "adults": row["adults"],
+                "children": row["children"]
+            }
+
+            if booking.booking_type == "stay" and row["room_type_id"]:
+                item_dict["room_type_id"] = row["room_type_id"]
+                if row["room_option_id"]:
+                    item_dict["room_option_id"] = row["room_option_id"]
+            elif booking.booking_type == "package" and row["package_id"]:
+                item_dict["package_id"] = row["package_id"]
+            elif booking.booking_type == "activity" and row["activity_id"]:
+                item_dict["activity_id"] = row["activity_id"]
+            elif booking.booking_type == "cab" and row["cab_id"]:
+                item_dict["cab_id"] = row["cab_id"]
+                item_dict["pickup_location"] = row["pickup_location"]
+                item_dict["drop_location"] = row["drop_location"]
+                item_dict["pickup_datetime"] = row["pickup_datetime"]
+                item_dict["trip_type"] = row["trip_type"]
+            elif booking.booking_type == "houseboat" and row["houseboat_id"]:
+                item_dict["houseboat_id"] = row["houseboat_id"]
+                item_dict["is_full_time_ac_opted"] = row["is_full_time_ac_opted"]
+
+            items_data.append(item_dict)
+
+        return items_data, check_in, check_out
+
+    @staticmethod
+    def expand_items(booking_type, items_data):
+        """
+        Expands request items (with quantity) into one entry per unit, in the
+        same shape items_from_booking() reads back from
+        BookingItem rows, so request carts can be compared with quoted carts.
+        """
+        rows = []
+        for item in items_data:
+            row = {
+                "quantity": 1,
+                "adults": item["adults"],
+                "children": item.get("children", 0)
+            }
+            if booking_type == "stay":
+                row["room_type_id"] = item.get("room_type_id")
+                if item.get("room_option_id"):
+                    row["room_option_id"] = item["room_option_id"]
+            elif booking_type == "package":
+                row["package_id"] = item.get("package_id")
+            elif booking_type == "activity":
+                row["activity_id"] = item.get("activity_id")
+            elif booking_type == "cab":
+                row["cab_id"] = item.get("cab_id")
+                row["pickup_location"] = item.get("pickup_location", "")
+                row["drop_location"] = item.get("drop_location", "")
+                row["pickup_datetime"] = item.get("pickup_datetime")
+                row["trip_type"] = item.get("trip_type", "")
+            elif booking_type == "houseboat":
+                row["houseboat_id"] = item.get("houseboat_id")
+                row["is_full_time_ac_opted"] = item.get("is_full_time_ac_opted", False)
+            rows.extend(dict(row) for _ in range(item.get("quantity", 1)))
+        return rows
+
+    @staticmethod
+    def _collect_ids(items_data, key):
+        return sorted({item[key] for item in items_data if item.get(key)})
+
+    @staticmethod
+    def catalog_version(booking_type, items_data, coupon_code=None):
+        """
+        Returns a hash of the updated_at stamps of every catalog row that feeds
+        the price of these items. Editing a price, discount or tax rate bumps a
+        stamp and therefore the version. Child row counts are included so that
+        deleting a pricing option is noticed as well.
+        """
+        stamps = []
+
+        if booking_type == "stay":
+            stamps.append(RoomType.objects.filter(id__in=PricingSnapshotService._collect_ids(items_data, "room_type_id")).aggregate(
+                room_type_updated_at=Max("updated_at"),
+                property_updated_at=Max("property__updated_at"),
+                discount_updated_at=Max("property__discount__updated_at"),
+            ))
+            # Option rates are rows of the room type too
+            stamps.append(RoomRate.objects.filter(room_type_id__in=PricingSnapshotService._collect_ids(items_data, "room_type_id")).aggregate(
+                rate_updated_at=Max("updated_at"),
+                rate_count=Count("id"),
+            ))
+            room_option_ids = PricingSnapshotService._collect_ids(items_data, "room_option_id")
+            if room_option_ids:
+                stamps.append(RoomOption.objects.filter(id__in=room_option_ids).aggregate(room_option_updated_at=Max("updated_at")))
+        elif booking_type == "package":
+            stamps.append(HolidayPackage.objects.filter(id__in=PricingSnapshotService._collect_ids(items_data, "package_id")).aggregate(
+                package_updated_at=Max("updated_at"),
+                discount_updated_at=Max("discount__updated_at"),
+            ))
+        elif booking_type == "activity":
+            stamps.append(Activity.objects.filter(id__in=PricingSnapshotService._collect_ids(items_data, "activity_id")).aggregate(
+                activity_updated_at=Max("updated_at"),
+                discount_updated_at=Max("discount__updated_at"),
+            ))
+        elif booking_type == "cab":
+            stamps.append(Cab.objects.filter(id__in=PricingSnapshotService._collect_ids(items_data, "cab_id")).aggregate(
+                cab_updated_at=Max("updated_at"),
+                discount_updated_at=Max("discount__updated_at"),
+                pricing_options_updated_at=Max("pricing_options__updated_at"),
+                pricing_option_count=Count("pricing_options"),
+            ))
+            # Fares follow the distances of these items' routes only; other routes being looked up must not matter
+            routes = sorted({(item.get("pickup_location") or "", item.get("drop_location") or "") for item in items_data})
+            stamps.append({"route_km": [
+                CabFareService.route_km(pickup, drop) if pickup and drop else None for pickup, drop in routes
+            ]})
+        elif booking_type == "houseboat":
+            stamps.append(HouseBoat.objects.filter(id__in=PricingSnapshotService._collect_ids(items_data, "houseboat_id")).aggregate(
+                houseboat_updated_at=Max("updated_at"),
+                discount_updated_at=Max("discount__updated_at"),
+                specification_updated_at=Max("specification__updated_at"),
+            ))
+            stamps.append(HouseBoatRate.objects.filter(houseboat_id__in=PricingSnapshotService._collect_ids(items_data, "houseboat_id")).aggregate(
+                rate_updated_at=Max("updated_at"),
+                rate_count=Count("id"),
+            ))
+
+        if coupon_code:
+            # From the coupon cache; an expired or withdrawn coupon changes the version too
+            coupon = CouponService.get_active(coupon_code)
+            stamps.append({"coupon_updated_at": coupon["updated_at"] if coupon else None})
+
+        return stable_hash(stamps)
+
+    @staticmethod
+    def inputs_hash(booking_type, items_data, check_in, check_out, coupon_code=None, is_insurance_opted=False):
+        return stable_hash({
+            "booking_type": booking_type,
+            "items": items_data,
+            "check_in": check_in,
+            "check_out": check_out,
+            "coupon_code": coupon_code,
+            "is_insurance_opted": is_insurance_opted,
+        })
+
+    @staticmethod
+    def cart_hash(user_id, attrs, coupon_code=None):
+        """
+        Hash of a normalized review cart (user, type, items, dates, coupon and
+        options) taken from validated BookingCreateSerializer data. Item order
+        and quantity-vs-repeated-item differences do not change the hash.
+        """
+        booking_type = attrs.get("booking_type", "stay")
+        items = PricingSnapshotService.expand_items(booking_type, attrs["items"])
+        items.sort(key=stable_hash)
+        return stable_hash({
+            "user_id": user_id,
+            "property_id": attrs.get("property_id"),
+            "payment_option": attrs.get("payment_option", "full"),
+            "inputs_hash": PricingSnapshotService.inputs_hash(
+                booking_type, items, attrs["check_in"], attrs["check_out"],
+                coupon_code or None, attrs.get("is_insurance_opted", False)
+            ),
+        })
+
+    @staticmethod
+    def describe(booking):
+        """
+        Collects the pricing inputs of a booking from its persisted rows, along
+        with the input hash, catalog version and combined snapshot version.
+        """
+        items_data, check_in, check_out = PricingSnapshotService.items_from_booking(booking)
+        coupon_code = booking.coupon.code if booking.coupon else None
+        inputs_hash = PricingSnapshotService.inputs_hash(
+            booking.booking_type, items_data, check_in, check_out, coupon_code, booking.is_insurance_opted
+        )
+        catalog_version = PricingSnapshotService.catalog_version(booking.booking_type, items_data, coupon_code)
+        return {
+            "items": items_data,
+            "check_in": check_in,
+            "check_out": check_out,
+            "coupon_code": coupon_code,
+            "inputs_hash": inputs_hash,
+            "catalog_version": catalog_version,
+            "version": stable_hash([inputs_hash, catalog_version]),
+        }
+
+    @staticmethod
+    def to_json(pricing_data):
+        """
+        Converts a BookingPricingService result into JSONField-safe data
+        (Decimals and datetimes become strings).
+        """
+        return json.loads(json.dumps(pricing_data, cls=DjangoJSONEncoder))
+
+    @staticmethod
+    def store(booking, pricing_data, version):
+        """
+        Saves pricing_data as the booking's snapshot, stamped with the given version.
+        """
+        booking.pricing_breakdown = PricingSnapshotService.to_json(pricing_data)
+        booking.pricing_version = version
+        booking.total_amount = pricing_data["final_total"]
+        booking.insurance_amount = pricing_data["insurance_fee"]
+        booking.save(update_fields=[
+            "pricing_breakdown", "pricing_version", "total_amount", "insurance_amount", "coupon", "updated_at"
+        ])
+        return booking.pricing_breakdown
+
+    @staticmethod
+    def get_pricing(booking):
+        """
+        Returns (pricing, state) for a booking, where state is describe(booking).
+        Serves the stored snapshot and reprices only when the booking inputs or
+        the catalog changed.
+        """
+        state = PricingSnapshotService.describe(booking)
+
+        if booking.pricing_breakdown and booking.pricing_version == state["version"]:
+            return booking.pricing_breakdown, state
+
+        pricing_data = BookingPricingService.calculate_pricing(
+            booking_type=booking.booking_type,
+            items_data=state["items"],
+            check_in=state["check_in"],
+            check_out=state["check_out"],
+            coupon_code=state["coupon_code"],
+            is_insurance_opted=booking.is_insurance_opted
+        )
+        pricing = PricingSnapshotService.store(booking, pricing_data, state["version"])
+        return pricing, state
+
+
+class PriceQuoteService:
+    """
+    Issues and verifies signed, expiring price quotes.
+
+    A quote is an HMAC-signed (django.core.signing) snapshot of a priced cart:
+    booking, user, item ids, dates, pax, totals and the catalog version it was
+    priced against. Confirm/create can trust a valid quote without re-running
+    BookingPricingService; only a changed catalog version forces a reprice.
+    """
+    SALT = "api.bookings.price-quote"
+
+    @staticmethod
+    def max_age():
+        return getattr(settings, "PRICE_QUOTE_MAX_AGE", 900)
+
+    @staticmethod
+    def issue(booking, pricing, state):
+        """
+        Returns a quote token for a priced booking.
+        `pricing` is the JSON snapshot and `state` comes from PricingSnapshotService.describe().
+        """
+        payload = {
+            "booking_id": booking.id,
+            "user_id": booking.user_id,
+            "booking_type": booking.booking_type,
+            "items": state["items"],
+            "check_in": state["check_in"],
+            "check_out": state["check_out"],
+            "coupon_code": state["coupon_code"],
+            "is_insurance_opted": booking.is_insurance_opted,
+            "inputs_hash": state["inputs_hash"],
+            "catalog_version": state["catalog_version"],
+            "final_total": pricing["final_total"],
+            "insurance_fee": pricing["insurance_fee"],
+        }
+        return signing.dumps(PricingSnapshotService.to_json(payload), salt=PriceQuoteService.SALT, compress=True)
+
+    @staticmethod
+    def verify(token, user):
+        """
+        Returns the quote payload if the token is authentic, unexpired and was
+        issued to this user; otherwise None.
+        """
+        if not token:
+            return None
+        try:
+            payload = signing.loads(token, salt=PriceQuoteService.SALT, max_age=PriceQuoteService.max_age())
+        except signing.BadSignature:
+            # SignatureExpired is a subclass of BadSignature
+            return None
+        if payload.get("user_id") != user.id:
+            return None
+        return payload
+
+    @staticmethod
+    def is_current(payload):
+        """
+        True when none of the catalog rows behind the quote changed since it was issued.
+        """
+        return payload["catalog_version"] == PricingSnapshotService.catalog_version(
+            payload["booking_type"], payload["items"], payload["coupon_code"]
+        )
+
+    @staticmethod
+    def settle(booking, token, user):
+        """
+        Fixes the payable total of a draft booking at confirm time.
+        A valid, current quote for this booking is trusted as-is; otherwise the
+        booking is repriced through its stored snapshot. Returns True when the
+        quote was honoured.
+        """
+        payload = PriceQuoteService.verify(token, user)
+        if payload and payload["booking_id"] == booking.id and PriceQuoteService.is_current(payload):
+            booking.total_amount = Decimal(payload["final_total"])
+            booking.insurance_amount = Decimal(payload["insurance_fee"])
+            return True
+
+        PricingSnapshotService.get_pricing(booking)
+        return False
+
+
+class IdempotencyService:
+    """
+    Honours the Idempotency-Key request header on booking writes.
+
+    The first request with a key runs normally and its response is stored in
+    IdempotencyKey; retries with the same key and payload replay that response
+    until the key expires (IDEMPOTENCY_KEY_TTL seconds). Reusing a key for a
+    different payload is rejected, as is a retry while the first is still running.
+    """
+    HEADER = "Idempotency-Key"
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, "IDEMPOTENCY_KEY_TTL", 86400)
+
+    @staticmethod
+    def run(request, scope, handler):
+        """
+        Runs handler() (which returns a DRF Response) at most once per key.
+        scope identifies the endpoint so one key cannot be replayed elsewhere.
+        """
+        key = request.headers.get(IdempotencyService.HEADER)
+        if not key or not request.user.is_authenticated:
+            return handler()
+        if len(key) > 255:
+            return Response(
+                {"error": f"{IdempotencyService.HEADER} must be at most 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        request_hash = stable_hash({"scope": scope, "data": request.data})
+        expires_at = now + timedelta(seconds=IdempotencyService.ttl())
+
+        record, created = IdempotencyKey.objects.get_or_create(
+            user=request.user,
+            key=key,
+            defaults={"request_hash": request_hash, "expires_at": expires_at}
+        )
+        if not created and record.expires_at <= now:
+            # Expired keys are recycled in place
+            record.request_hash = request_hash
+            record.expires_at = expires_at
+            record.response_status = None
+            record.response_body = None
+            record.save(update_fields=["request_hash", "expires_at", "response_status", "response_body", "updated_at"])
+            created = True
+
+        if not created:
+            if record.request_hash != request_hash:
+                return Response(
+                    {"error": f"{IdempotencyService.HEADER} was already used with a different request."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if record.response_status is None:
+                return Response(
+                    {"error": f"A request with this {IdempotencyService.HEADER} is still in progress."},
+                    status=status.HTTP_409_CONFLICT
+                )
+            return Response(record.response_body, status=record.response_status, headers={"Idempotent-Replayed": "true"})
+
+        try:
+            response = handler()
+        except Exception:
+            # Let the client retry with the same key
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            record.response_status = response.status_code
+            record.response_body = PricingSnapshotService.to_json(response.data)
+            record.save(update_fields=["response_status", "response_body", "updated_at"])
+        return response
+
+    @staticmethod
+    def purge_expired():
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+class BookingExportService:
+    """
+    Flat exports of bookings or booking items for finance and partners.
+
+    Rows are read with .values() and iterator(chunk_size), which uses a
+    server-side cursor on PostgreSQL, and are written out as they arrive, so
+    memory stays flat however many rows match. pricing_breakdown is flattened
+    into pricing.* columns; its per-item breakdown list stays a JSON cell.
+    """
+    KINDS = ("bookings", "items")
+    FORMATS = ("csv", "jsonl")
+
+    BOOKING_COLUMNS = {
+        "id": "id",
+        "reference": "reference",
+        "created_at": "created_at",
+        "booking_type": "booking_type",
+        "status": "status",
+        "refund_status": "refund_status",
+        "cancelled_at": "cancelled_at",
+        "user_id": "user_id",
+        "username": "user__username",
+        "full_name": "full_name",
+        "email": "email",
+        "phone": "phone",
+        "coupon": "coupon__code",
+        "payment_option": "payment_option",
+        "total_amount": "total_amount",
+        "amount_paid": "amount_paid",
+        "part_payment_amount": "part_payment_amount",
+        "insurance_amount": "insurance_amount",
+        "is_gst_required": "is_gst_required",
+        "gst_number": "gst_number",
+        "company_name": "company_name",
+    }
+    PRICING_COLUMNS = (
+        "pricing.base_total", "pricing.taxes", "pricing.coupon_discount", "pricing.insurance_fee",
+        "pricing.coupon_applied.code", "pricing.coupon_applied.discount_amount", "pricing.final_total",
+        "pricing.breakdown",
+    )
+    ITEM_COLUMNS = {
+        "id": "id",
+        "booking_id": "booking_id",
+        "booking_reference": "booking__reference",
+        "booking_type": "booking__booking_type",
+        "booking_status": "booking__status",
+        "booking_created_at": "booking__created_at",
+        "property_id": "property_id",
+        "property": "property__name",
+        "room_type": "room_type__name",
+        "room_option": "room_option__name",
+        "package": "package__title",
+        "activity": "activity__title",
+        "cab": "cab__title",
+        "houseboat": "houseboat__name",
+        "check_in": "check_in",
+        "check_out": "check_out",
+        "adults": "adults",
+        "children": "children",
+        "is_full_time_ac_opted": "is_full_time_ac_opted",
+        "full_time_ac_amount": "full_time_ac_amount",
+        "pickup_location": "pickup_location",
+        "drop_location": "drop_location",
+        "pickup_datetime": "pickup_datetime",
+        "trip_type": "trip_type",
+    }
+
+    @staticmethod
+    def queryset(kind, date_from=None, date_to=None, booking_type=None, statuses=None, property_id=None):
+        """
+        Bookings (or items of bookings) created in [date_from, date_to], both
+        dates inclusive, narrowed by booking type, statuses and property.
+        """
+        if kind == "items":
+            queryset, prefix = BookingItem.objects.all(), "booking__"
+        else:
+            queryset, prefix = Booking.objects.all(), ""
+        # Day bounds as datetimes keep created_at comparisons index-friendly
+        if date_from:
+            start = timezone.make_aware(datetime.combine(date_from, time.min))
+            queryset = queryset.filter(**{f"{prefix}created_at__gte": start})
+        if date_to:
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+            queryset = queryset.filter(**{f"{prefix}created_at__lt": end})
+        if booking_type:
+            queryset = queryset.filter(**{f"{prefix}booking_type": booking_type})
+        if statuses:
+            queryset = queryset.filter(**{f"{prefix}status__in": statuses})
+        if property_id:
+            if kind == "items":
+                queryset = queryset.filter(property_id=property_id)
+            else:
+                # A subquery rather than a join so a booking with several rooms is exported once
+                queryset = queryset.filter(
+                    pk__in=BookingItem.objects.filter(property_id=property_id).values("booking_id")
+                )
+        return queryset.order_by("pk")
+
+    @staticmethod
+    def columns(kind):
+        if kind == "items":
+            return list(BookingExportService.ITEM_COLUMNS)
+        return [*BookingExportService.BOOKING_COLUMNS, *BookingExportService.PRICING_COLUMNS]
+
+    @staticmethod
+    def flatten(data, prefix):
+        """{"coupon_applied": {"code": "X"}} -> {"<prefix>.coupon_applied.code": "X"}; lists are kept whole."""
+        flat = {}
+        for key, value in (data or {}).items():
+            name = f"{prefix}.{key}"
+            if isinstance(value, dict):
+                flat.update(BookingExportService.flatten(value, name))
+            else:
+                flat[name] = value
+        return flat
+
+    @staticmethod
+    def rows(kind, queryset, chunk_size=2000):
+        """Yields one flat dict per row, in primary-key order."""
+        mapping = BookingExportService.ITEM_COLUMNS if kind == "items" else BookingExportService.BOOKING_COLUMNS
+        lookups = list(mapping.values())
+        if kind != "items":
+            lookups.append("pricing_breakdown")
+        for values in queryset.values(*lookups).iterator(chunk_size=chunk_size):
+            row = {column: values[lookup] for column, lookup in mapping.items()}
+            if kind != "items":
+                row.update(BookingExportService.flatten(values["pricing_breakdown"], "pricing"))
+            yield row
+
+    @staticmethod
+    def csv_lines(kind, rows):
+        """Header plus one CSV line per row, as strings."""
+        columns = BookingExportService.columns(kind)
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([BookingExportService.csv_value(row.get(column)) for column in columns])
+
+    @staticmethod
+    def csv_value(value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, cls=DjangoJSONEncoder)
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def jsonl_lines(rows):
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+    @staticmethod
+    def stream(kind, fmt, queryset, chunk_size=2000):
+        rows = BookingExportService.rows(kind, queryset, chunk_size)
+        if fmt == "csv":
+            return BookingExportService.csv_lines(kind, rows)
+        return BookingExportService.jsonl_lines(rows)
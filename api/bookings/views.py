@@ -1,12 +1,16 @@
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from .serializers import BookingCreateSerializer, BookingListSerializer, BookingDetailSerializer, BookingConfirmSerializer
+from django.utils import timezone
+from .serializers import BookingCreateSerializer, BookingListSerializer, BookingDetailSerializer, BookingConfirmSerializer, BookingExportQuerySerializer
 from apps.bookings.models import Booking
-from apps.coupons.models import Coupon
-from .services import BookingPricingService
+from api.async_views import async_stream
+from api.coupons.services import CouponService
+from .services import BookingPricingService, BookingDetailLoader, PricingSnapshotService, PriceQuoteService, IdempotencyService, BookingExportService
 
 class BookingCreateAPIView(CreateAPIView):
     """
@@ -16,6 +20,12 @@ class BookingCreateAPIView(CreateAPIView):
     serializer_class = BookingCreateSerializer
     permission_classes = [IsAuthenticated]
 
+    def create(self, request, *args, **kwargs):
+        # Retries carrying the same Idempotency-Key replay the first response
+        return IdempotencyService.run(
+            request, "booking-create", lambda: super(BookingCreateAPIView, self).create(request, *args, **kwargs)
+        )
+
     def perform_create(self, serializer):
         # The create method in serializer uses self.context['request'].user
         serializer.save()
@@ -27,6 +37,9 @@ class BookingReviewAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        return IdempotencyService.run(request, "booking-review", lambda: self.create_review(request))
+
+    def create_review(self, request):
         # Use BookingCreateSerializer to validate and create draft booking
         serializer = BookingCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
@@ -36,102 +49,77 @@ class BookingReviewAPIView(APIView):
         check_out = serializer.validated_data.get("check_out")
         items_data = request.data.get("items")
         coupon_code = request.data.get("coupon_code")
+
+        # Retries, back-navigation and double taps resubmit the same cart: reuse its draft
+        cart_hash = PricingSnapshotService.cart_hash(request.user.id, serializer.validated_data, coupon_code)
+        draft = (
+            Booking.objects.select_related("coupon")
+            .filter(user=request.user, status="draft", cart_hash=cart_hash)
+            .order_by("-id")
+            .first()
+        )
+        if draft:
+            pricing, state = PricingSnapshotService.get_pricing(draft)
+            return self.review_response(draft, pricing, state)
         
         # Save as draft
-        booking = serializer.save(status='draft')
+        booking = serializer.save(status='draft', cart_hash=cart_hash)
+
+        # Coupons past their usage limits (global or for this user) are not applied
+        coupon = CouponService.validate(coupon_code, request.user)
         
         pricing_data = BookingPricingService.calculate_pricing(
             booking_type=booking.booking_type,
             items_data=items_data,
             check_in=check_in,
             check_out=check_out,
-            coupon_code=coupon_code,
+            coupon_code=coupon["code"] if coupon else None,
             is_insurance_opted=booking.is_insurance_opted
         )
         
-        # Update booking total amount with the final calculated total (including taxes/coupons)
-        booking.total_amount = pricing_data["final_total"]
-        booking.insurance_amount = pricing_data["insurance_fee"]
-        booking.save()
-        
-        # Prepare response (Only return booking_id as requested)
+        # Persist the applied coupon so the snapshot can be revalidated later
+        if pricing_data["coupon_applied"]:
+            booking.coupon_id = coupon["id"]
+
+        # Store the final calculated total (including taxes/coupons) as the pricing snapshot
+        state = PricingSnapshotService.describe(booking)
+        pricing = PricingSnapshotService.store(booking, pricing_data, state["version"])
+        return self.review_response(booking, pricing, state)
+
+    def review_response(self, booking, pricing, state):
+        # Prepare response (booking_id plus a signed quote to present at confirm)
         return Response({
             "booking_id": booking.id,
+            "quote_token": PriceQuoteService.issue(booking, pricing, state),
+            "quote_expires_in": PriceQuoteService.max_age(),
             "message": "Booking review created successfully."
         })
 
     def get(self, request, *args, **kwargs):
         """
         Retrieve review details for an existing draft booking using booking_id query param.
+        Served from the pricing snapshot stored at review time; repriced only when
+        the booking inputs or the underlying catalog prices have changed since.
         """
         booking_id = request.query_params.get("booking_id")
         if not booking_id:
             return Response({"error": "booking_id is required"}, status=400)
         
-        booking = get_object_or_404(Booking, id=booking_id, user=request.user)
+        booking = get_object_or_404(Booking.objects.select_related("coupon"), id=booking_id, user=request.user)
         
         # Ensure we only review draft bookings
         if booking.status != 'draft':
             return Response({"error": "Only draft bookings can be reviewed."}, status=400)
-            
-        # Reconstruct inputs for Pricing Service
-        items_data = []
-        check_in = None
-        check_out = None
-        
-        # Group similar items if needed, but for now we just list them
-        # Note: quantity is implicitly handled because multiple BookingItem rows exist for quantity > 1
-        # But BookingPricingService iterates and multiplies by quantity.
-        # So we should treat each BookingItem as quantity=1
-        
-        for item in booking.items.all():
-            # Capture check_in/check_out from the first item (should be same for all in a booking)
-            if check_in is None:
-                check_in = item.check_in
-                check_out = item.check_out
-            
-            item_dict = {
-                "quantity": 1,
-                "adults": item.adults,
-                "children": item.children
-            }
-            
-            if booking.booking_type == "stay" and item.room_type:
-                item_dict["room_type_id"] = item.room_type.id
-            elif booking.booking_type == "package" and item.package:
-                item_dict["package_id"] = item.package.id
-            elif booking.booking_type == "activity" and item.activity:
-                item_dict["activity_id"] = item.activity.id
-            elif booking.booking_type == "cab" and item.cab:
-                item_dict["cab_id"] = item.cab.id
-                item_dict["pickup_location"] = item.pickup_location
-                item_dict["drop_location"] = item.drop_location
-                item_dict["pickup_datetime"] = item.pickup_datetime
-                item_dict["trip_type"] = item.trip_type
-            elif booking.booking_type == "houseboat" and item.houseboat:
-                item_dict["houseboat_id"] = item.houseboat.id
-                
-            items_data.append(item_dict)
-            
-        # Retrieve applied coupon if stored
-        coupon_code = None 
-        if booking.coupon:
-            coupon_code = booking.coupon.code
-        
-        pricing_data = BookingPricingService.calculate_pricing(
-            booking_type=booking.booking_type,
-            items_data=items_data,
-            check_in=check_in,
-            check_out=check_out,
-            coupon_code=coupon_code,
-            is_insurance_opted=booking.is_insurance_opted
-        )
+
+        pricing_data, state = PricingSnapshotService.get_pricing(booking)
         
         # Prepare response
-        response_data = pricing_data
+        response_data = dict(pricing_data)
         response_data["booking_id"] = booking.id
-        response_data["check_in"] = check_in
-        response_data["check_out"] = check_out
+        response_data["check_in"] = state["check_in"]
+        response_data["check_out"] = state["check_out"]
+        response_data["quote_token"] = PriceQuoteService.issue(booking, pricing_data, state)
+        response_data["quote_expires_in"] = PriceQuoteService.max_age()
         
         return Response(response_data)
 
@@ -149,6 +137,12 @@ class BookingConfirmAPIView(UpdateAPIView):
         return Booking.objects.filter(user=self.request.user, status="draft")
 
     def update(self, request, *args, **kwargs):
+        # Retries carrying the same Idempotency-Key replay the first confirmation
+        return IdempotencyService.run(
+            request, f"booking-confirm:{kwargs.get('id')}", lambda: self.confirm(request, *args, **kwargs)
+        )
+
+    def confirm(self, request, *args, **kwargs):
         # We override update to provide a custom response
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data)
@@ -158,7 +152,8 @@ class BookingConfirmAPIView(UpdateAPIView):
         return Response({
             "message": "Booking confirmed successfully.", 
             "booking_id": instance.id,
-            "status": instance.status
+            "status": instance.status,
+            "total_amount": instance.total_amount
         })
 
 class BookingListAPIView(ListAPIView):
@@ -182,7 +177,7 @@ class BookingListAPIView(ListAPIView):
         elif status_param == "completed":
              queryset = queryset.filter(status="completed")
              
-        return queryset.order_by("-created_at")
+        return BookingDetailLoader.load(queryset).order_by("-created_at")
 
 class BookingDetailAPIView(RetrieveAPIView):
     """
@@ -194,4 +189,34 @@ class BookingDetailAPIView(RetrieveAPIView):
     lookup_field = "id"
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user)
+        return BookingDetailLoader.load(Booking.objects.filter(user=self.request.user))
+
+class BookingExportAPIView(APIView):
+    """
+    Streams bookings (kind=bookings) or booking items (kind=items) as CSV or
+    JSON lines (output=csv|jsonl) for finance. Filters: date_from/date_to (created date,
+    inclusive), booking_type, status (comma-separated) and property.
+    Staff only; rows are written while they are read, so large ranges neither
+    buffer in memory nor wait for the whole result before the first byte
+    (under ASGI the rows go out through async_stream for the same reason).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        params = BookingExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        kind = params.validated_data["kind"]
+        fmt = params.validated_data["output"]
+
+        queryset = BookingExportService.queryset(kind, **params.filters())
+        content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        content = BookingExportService.stream(kind, fmt, queryset)
+        if settings.ASYNC_READ_VIEWS:
+            # Under ASGI a sync generator would be read whole before the first byte
+            content = async_stream(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        filename = f"{kind}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        # Keep proxies from buffering the whole export before passing it on
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.utils import timezone
 from apps.cabs.models import Cab, CabCategory, CabPricingOption, CabImage, CabInclusion, CabPolicy
 
 class CabCategorySerializer(serializers.ModelSerializer):
@@ -98,3 +99,35 @@ class CabDetailSerializer(serializers.ModelSerializer):
             policies_dict[policy.title.lower().replace(" ", "_")] = policy.description
             
         return policies_dict
+
+
+class CabAvailabilityQuerySerializer(serializers.Serializer):
+    """Optional pickup time of cab searches; results are limited to cabs with a vehicle free for the trip."""
+    pickup_datetime = serializers.DateTimeField(required=False)
+
+    def validate_pickup_datetime(self, value):
+        if value < timezone.now():
+            raise serializers.ValidationError("pickup_datetime cannot be in the past.")
+        return value
+
+    @classmethod
+    def pickup_at(cls, query_params):
+        """The pickup time from query parameters (`pickup_datetime` or `pickup_at`), or None; blank counts as not given."""
+        value = query_params.get("pickup_datetime") or query_params.get("pickup_at")
+        params = cls(data={"pickup_datetime": value} if value else {})
+        params.is_valid(raise_exception=True)
+        return params.validated_data.get("pickup_datetime")
+
+
+class CabScheduleQuerySerializer(serializers.Serializer):
+    date = serializers.DateField(required=False, help_text="Day of the dispatch sheet; defaults to today")
+
+
+class CabTripSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    id = serializers.IntegerField()
+    pickup_location = serializers.CharField()
+    drop_location = serializers.CharField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    unit = serializers.IntegerField(allow_null=True, help_text="Vehicle number (1..fleet_size); null when the fleet is overbooked")
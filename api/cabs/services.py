@@ -0,0 +1,294 @@
+import hashlib
+import heapq
+import math
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.bookings.models import BookingItem
+from apps.cabs.models import CabBooking, Place, RouteDistance
+from apps.common.rates import HELD_STATUSES
+
+EARTH_RADIUS_KM = 6371.0088
+
+VERSION_KEY = "cabs:routes:version"
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def haversine_km(origin, destination):
+    """Great-circle distance in km between two objects with latitude/longitude."""
+    lat1, lon1, lat2, lon2 = map(
+        math.radians, (float(origin.latitude), float(origin.longitude), float(destination.latitude), float(destination.longitude))
+    )
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def is_round_trip(trip_type):
+    return (trip_type or "").lower().replace(" ", "").replace("-", "").replace("_", "") == "roundtrip"
+
+
+class CabFareService:
+    """
+    Distance-based cab fares.
+
+    Pickup and drop texts are resolved against the Place gazetteer, and the
+    road distance between two places comes from RouteDistance, estimated on
+    first use as the straight-line distance times CAB_ROAD_CIRCUITY unless
+    set by hand. Resolved text pairs are kept in the shared cache; saving a
+    place or route bumps a version (see apps/cabs/signals.py) so stale
+    entries are never read.
+
+    The fare of a trip of `km` kilometres (twice the distance for a round trip):
+    base_price covers included_kms, each extra km costs extra_km_fare, and the
+    trip never costs less than km * price_per_km. A trip longer than
+    included_kms is an outstation trip and also pays the driver allowance
+    once per day it takes: one day per started CAB_KMS_PER_DAY of the whole
+    trip, not just of the distance beyond included_kms. with_fares()
+    computes this as SQL over a whole queryset of cabs, so a search prices
+    every candidate in the query that lists them.
+    """
+
+    @staticmethod
+    def invalidate():
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+    @staticmethod
+    def resolve(text):
+        """The active Place a free-text location names, by name or alias, or None; 'City, State' falls back to 'City'."""
+        terms = []
+        for term in ((text or "").strip(), (text or "").split(",")[0].strip()):
+            if term and term.lower() not in terms:
+                terms.append(term.lower())
+        for term in terms:
+            places = Place.objects.filter(Q(name__iexact=term) | Q(aliases__icontains=term), is_active=True)
+            for place in sorted(places, key=lambda place: place.name.lower() != term):
+                if place.name.lower() == term or term in (alias.strip().lower() for alias in place.aliases.split(",")):
+                    return place
+        return None
+
+    @staticmethod
+    def distance_km(origin, destination):
+        """One-way road distance between two places, estimating and storing it the first time the pair is asked for."""
+        if origin.pk == destination.pk:
+            return Decimal("0.0")
+        first, second = sorted((origin, destination), key=lambda place: place.pk)
+        route = RouteDistance.objects.filter(origin=first, destination=second).values_list("distance_km", flat=True).first()
+        if route is None:
+            estimate = Decimal(str(round(haversine_km(first, second) * settings.CAB_ROAD_CIRCUITY, 1)))
+            route = RouteDistance.objects.get_or_create(
+                origin=first, destination=second, defaults={"distance_km": estimate, "source": RouteDistance.ESTIMATE}
+            )[0].distance_km
+        return route
+
+    @staticmethod
+    def route_km(pickup, drop):
+        """One-way distance between two free-text locations, or None when either is not in the gazetteer."""
+        texts = f"{(pickup or '').strip().lower()}|{(drop or '').strip().lower()}"
+        key = f"cabs:route:{cache.get(VERSION_KEY)}:{hashlib.sha256(texts.encode()).hexdigest()}"
+        cached = cache.get(key)
+        if cached is not None:
+            return None if cached == "" else Decimal(cached)
+        origin, destination = CabFareService.resolve(pickup), CabFareService.resolve(drop)
+        distance = CabFareService.distance_km(origin, destination) if origin and destination else None
+        # Unknown routes are cached too, as "", so misses don't hit the gazetteer on every search
+        cache.set(key, "" if distance is None else str(distance), settings.CAB_ROUTE_CACHE_TTL)
+        return distance
+
+    @staticmethod
+    def trip_km(distance, trip_type=None):
+        return distance * 2 if is_round_trip(trip_type) else distance
+
+    @staticmethod
+    def with_fares(queryset, km):
+        """
+        Annotates every cab of the queryset with `fare` (before discount and
+        tax) and `discounted_fare` for a trip of `km` kilometres, in SQL.
+        """
+        km = Decimal(km)
+        # Days on the road, counted over the whole trip
+        days = max(1, math.ceil(km / settings.CAB_KMS_PER_DAY))
+        excess = Greatest(Value(km) - F("included_kms"), Value(Decimal("0")), output_field=MONEY)
+        distance_fare = Greatest(
+            ExpressionWrapper(F("base_price") + excess * F("extra_km_fare"), output_field=MONEY),
+            ExpressionWrapper(Value(km) * F("price_per_km"), output_field=MONEY),
+            output_field=MONEY,
+        )
+        allowance = Case(
+            When(included_kms__lt=km, then=Coalesce(F("driver_allowance"), Value(Decimal("0"))) * Value(days)),
+            default=Value(Decimal("0")),
+            output_field=MONEY,
+        )
+        queryset = queryset.annotate(fare=ExpressionWrapper(distance_fare + allowance, output_field=MONEY))
+        discount = Case(
+            When(discount__is_active=True, discount__discount_type="percentage", then=F("fare") * F("discount__value") / Value(Decimal("100"))),
+            When(discount__is_active=True, then=F("discount__value")),
+            default=Value(Decimal("0")),
+            output_field=MONEY,
+        )
+        return queryset.annotate(
+            discounted_fare=Greatest(ExpressionWrapper(F("fare") - discount, output_field=MONEY), Value(Decimal("0")), output_field=MONEY)
+        )
+
+    @staticmethod
+    def quote(cab, pickup, drop, trip_type=None):
+        """
+        {"distance_km", "trip_km", "fare", "discounted_fare"} for one cab and
+        trip, before tax: the same figures search lists and sorts by, so the
+        discounted fare is what a booking charges. Trips whose places aren't
+        in the gazetteer keep the flat base price, with no distance.
+        """
+        distance = CabFareService.route_km(pickup, drop) if pickup and drop else None
+        if distance is None:
+            return {"distance_km": None, "trip_km": None, "fare": cab.base_price, "discounted_fare": cab.base_price}
+        km = CabFareService.trip_km(distance, trip_type)
+        fare, discounted_fare = CabFareService.with_fares(type(cab).objects.filter(pk=cab.pk), km).values_list(
+            "fare", "discounted_fare"
+        ).get()
+        return {
+            "distance_km": distance,
+            "trip_km": km,
+            "fare": Decimal(fare).quantize(Decimal("0.01")),
+            "discounted_fare": Decimal(discounted_fare).quantize(Decimal("0.01")),
+        }
+
+
+class IntervalIndex:
+    """
+    Busy intervals of one cab, sorted by start, answering how many vehicles
+    are busy at most within a time window. Only intervals starting less than
+    the longest interval before the window can reach into it, so a lookup
+    bisects the starts and sweeps just the overlapping intervals.
+    """
+
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals)
+        self.starts = [start for start, _ in self.intervals]
+        self.longest = max((end - start for start, end in self.intervals), default=timedelta(0))
+
+    def overlapping(self, start, end):
+        low = bisect_left(self.starts, start - self.longest)
+        high = bisect_left(self.starts, end)
+        return [interval for interval in self.intervals[low:high] if interval[1] > start]
+
+    def busy(self, start, end, limit=None):
+        """Most vehicles busy at once between start and end; counting stops once it reaches `limit`."""
+        overlapping = self.overlapping(start, end)
+        changes = sorted([(max(interval_start, start), 1) for interval_start, _ in overlapping] + [(interval_end, -1) for _, interval_end in overlapping])
+        busy = most = 0
+        for _, change in changes:
+            busy += change
+            most = max(most, busy)
+            if limit is not None and most >= limit:
+                break
+        return most
+
+
+class CabScheduleService:
+    """
+    Cab availability by pickup time. Every held booking of a cab (BookingItem
+    with a pickup time, or CabBooking) keeps one of its fleet_size vehicles
+    busy from pickup for the trip's duration: the drive at
+    CAB_AVERAGE_SPEED_KMPH plus CAB_TURNAROUND_MINUTES, or
+    CAB_DEFAULT_TRIP_HOURS when the route isn't known.
+    """
+
+    @staticmethod
+    def trip_duration(trip_km=None):
+        if trip_km is None:
+            hours = settings.CAB_DEFAULT_TRIP_HOURS
+        else:
+            hours = float(trip_km) / settings.CAB_AVERAGE_SPEED_KMPH + settings.CAB_TURNAROUND_MINUTES / 60
+        return timedelta(hours=min(hours, settings.CAB_MAX_TRIP_HOURS))
+
+    @staticmethod
+    def route_duration(pickup, drop, trip_type=None):
+        """trip_duration() of a booked trip, from its places (the default length when they are unknown)."""
+        distance = CabFareService.route_km(pickup, drop) if pickup and drop else None
+        return CabScheduleService.trip_duration(None if distance is None else CabFareService.trip_km(distance, trip_type))
+
+    @staticmethod
+    def trips(cab_ids, start, end):
+        """
+        {cab id: [trip dict]} for the held trips of these cabs that are under
+        way at some point between start and end; each trip has "start", "end",
+        "kind" ("booking_item" or "cab_booking"), "id" and the places. Two
+        queries, plus one route lookup per distinct pickup/drop/trip type.
+        """
+        earliest = start - timedelta(hours=settings.CAB_MAX_TRIP_HOURS)
+        trips = defaultdict(list)
+        items = BookingItem.objects.filter(
+            cab_id__in=cab_ids, booking__status__in=HELD_STATUSES, pickup_datetime__gte=earliest, pickup_datetime__lt=end
+        ).values_list("id", "cab_id", "pickup_datetime", "pickup_location", "drop_location", "trip_type")
+        # Trips mostly repeat a few routes, so each is resolved once, not once per booking
+        durations = {}
+        for pk, cab_id, pickup_at, pickup, drop, trip_type in items:
+            route = (pickup, drop, trip_type)
+            if route not in durations:
+                durations[route] = CabScheduleService.route_duration(*route)
+            trips[cab_id].append({
+                "kind": "booking_item", "id": pk, "pickup_location": pickup, "drop_location": drop,
+                "start": pickup_at, "end": pickup_at + durations[route],
+            })
+        cab_bookings = CabBooking.objects.filter(
+            cab_id__in=cab_ids, status__in=HELD_STATUSES, pickup_datetime__gte=earliest, pickup_datetime__lt=end
+        ).values_list("id", "cab_id", "pickup_datetime", "pickup_location", "drop_location", "total_distance_km")
+        for pk, cab_id, pickup_at, pickup, drop, trip_km in cab_bookings:
+            trips[cab_id].append({
+                "kind": "cab_booking", "id": pk, "pickup_location": pickup, "drop_location": drop,
+                "start": pickup_at, "end": pickup_at + CabScheduleService.trip_duration(trip_km),
+            })
+        return {
+            cab_id: [trip for trip in cab_trips if trip["end"] > start]
+            for cab_id, cab_trips in trips.items()
+        }
+
+    @staticmethod
+    def free_units(cabs, pickup_at, duration):
+        """
+        {cab id: vehicles free for the whole trip from pickup_at for
+        `duration`} for every cab, built from one read of all their trips.
+        """
+        end = pickup_at + duration
+        trips = CabScheduleService.trips([cab.pk for cab in cabs], pickup_at, end)
+        free = {}
+        for cab in cabs:
+            index = IntervalIndex([(trip["start"], trip["end"]) for trip in trips.get(cab.pk, [])])
+            free[cab.pk] = max(cab.fleet_size - index.busy(pickup_at, end, limit=cab.fleet_size), 0)
+        return free
+
+    @staticmethod
+    def assign(trips, units):
+        """
+        Greedy interval scheduling: gives each trip (dicts with "start" and
+        "end"), earliest pickup first, the vehicle (1..units) that became free
+        earliest, or None when all `units` are still out. Returns the trips
+        with "unit" set; uses the fewest vehicles any assignment could.
+        """
+        free_at = []  # heap of (free from, unit)
+        next_unit = 1
+        for trip in sorted(trips, key=lambda trip: (trip["start"], trip["end"])):
+            if free_at and free_at[0][0] <= trip["start"]:
+                _, unit = heapq.heappop(free_at)
+            elif next_unit <= units:
+                unit, next_unit = next_unit, next_unit + 1
+            else:
+                trip["unit"] = None
+                continue
+            trip["unit"] = unit
+            heapq.heappush(free_at, (trip["end"], unit))
+        return sorted(trips, key=lambda trip: (trip["start"], trip["end"]))
+
+    @staticmethod
+    def schedule(cab, start, end):
+        """Dispatch sheet: the cab's trips under way between start and end, each with its vehicle number."""
+        trips = CabScheduleService.trips([cab.pk], start, end).get(cab.pk, [])
+        return CabScheduleService.assign(trips, cab.fleet_size)
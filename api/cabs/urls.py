@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import CabDetailAPIView
+from api.async_views import read_view
+from .views import CabDetailAPIView, CabScheduleAPIView
 
 urlpatterns = [
-    path("<int:pk>/", CabDetailAPIView.as_view(), name="cab-detail"),
+    path("<int:pk>/", read_view(CabDetailAPIView), name="cab-detail"),
+    path("<int:pk>/schedule/", CabScheduleAPIView.as_view(), name="cab-schedule"),
 ]
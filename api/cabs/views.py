@@ -1,7 +1,13 @@
-from rest_framework.generics import RetrieveAPIView
-from rest_framework.permissions import AllowAny
+from datetime import datetime, time, timedelta
+
+from rest_framework.generics import RetrieveAPIView, get_object_or_404
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.utils import timezone
 from apps.cabs.models import Cab
-from .serializers import CabDetailSerializer
+from .serializers import CabDetailSerializer, CabScheduleQuerySerializer, CabTripSerializer
+from .services import CabScheduleService
 
 class CabDetailAPIView(RetrieveAPIView):
     """
@@ -32,3 +38,27 @@ class CabDetailAPIView(RetrieveAPIView):
             "pickup_datetime": self.request.query_params.get("pickup_at", "2023-03-23T10:00:00")
         })
         return context
+
+
+class CabScheduleAPIView(APIView):
+    """
+    Dispatch sheet for one cab and day: the held trips under way that day,
+    each given a vehicle number by greedy interval scheduling over the
+    cab's fleet_size vehicles (null when more trips overlap than there are
+    vehicles). Staff only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        params = CabScheduleQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        cab = get_object_or_404(Cab, pk=pk)
+        day = params.validated_data.get("date") or timezone.localdate()
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        trips = CabScheduleService.schedule(cab, start, start + timedelta(days=1))
+        return Response({
+            "cab_id": cab.pk,
+            "date": day,
+            "fleet_size": cab.fleet_size,
+            "results": CabTripSerializer(trips, many=True).data,
+        })
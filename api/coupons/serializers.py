@@ -2,6 +2,10 @@ from rest_framework import serializers
 from apps.coupons.models import Coupon
 
 class CouponSerializer(serializers.ModelSerializer):
+    # Filled from CouponService.validate_coupons() for the requesting user
+    is_applicable = serializers.BooleanField(read_only=True)
+    reason = serializers.CharField(read_only=True, allow_null=True)
+
     class Meta:
         model = Coupon
-        fields = ["id", "code", "discount_amount", "valid_from", "valid_to"]
+        fields = ["id", "code", "discount_amount", "valid_from", "valid_to", "is_applicable", "reason"]
@@ -0,0 +1,152 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.coupons.models import Coupon, CouponUsage, CouponUserCounter
+
+# Per-process copy of the coupons that are active now or later
+_active = {"by_code": None, "version": None, "loaded_at": 0.0}
+
+VERSION_KEY = "coupons:version"
+
+
+class CouponService:
+    """
+    Coupon engine.
+
+    Coupon definitions are served from a per-process cache keyed by code. Saving
+    or deleting a Coupon bumps a version in the shared cache (see
+    apps/coupons/signals.py) and every process reloads on its next lookup;
+    COUPON_CACHE_TTL bounds staleness if the shared cache is per process.
+
+    Usage limits are enforced with conditional F() updates on Coupon.times_used
+    and CouponUserCounter, never by counting CouponUsage rows.
+    """
+
+    @staticmethod
+    def invalidate():
+        _active["by_code"] = None
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+    @staticmethod
+    def active_coupons():
+        """Returns {code: coupon dict} for coupons that are enabled and not yet expired."""
+        version = cache.get(VERSION_KEY)
+        expired = time.monotonic() - _active["loaded_at"] > settings.COUPON_CACHE_TTL
+        if _active["by_code"] is None or _active["version"] != version or expired:
+            rows = Coupon.objects.filter(is_active=True, valid_to__gte=timezone.now().date()).values(
+                "id", "code", "discount_amount", "valid_from", "valid_to",
+                "usage_limit", "per_user_limit", "updated_at",
+            )
+            _active.update(
+                by_code={row["code"]: row for row in rows},
+                version=version,
+                loaded_at=time.monotonic(),
+            )
+        return _active["by_code"]
+
+    @staticmethod
+    def get_active(code, today=None):
+        """The coupon dict for a code if it can be applied today, else None."""
+        if not code:
+            return None
+        today = today or timezone.now().date()
+        coupon = CouponService.active_coupons().get(code)
+        if coupon is None or not (coupon["valid_from"] <= today <= coupon["valid_to"]):
+            return None
+        return coupon
+
+    @staticmethod
+    def current_coupons():
+        """Coupons valid today, newest first (the coupon list screen)."""
+        today = timezone.now().date()
+        coupons = [
+            coupon for coupon in CouponService.active_coupons().values()
+            if coupon["valid_from"] <= today <= coupon["valid_to"]
+        ]
+        return sorted(coupons, key=lambda coupon: coupon["id"], reverse=True)
+
+    @staticmethod
+    def validate_coupons(codes, user=None):
+        """
+        Checks several codes at once for a user.
+        Returns {code: {"valid": bool, "reason": str or None, "coupon": dict or None}}
+        using at most two queries (global and per-user counters) for the whole batch.
+        """
+        results = {}
+        candidates = {}
+        for code in codes:
+            coupon = CouponService.get_active(code)
+            if coupon is None:
+                results[code] = {"valid": False, "reason": "Coupon is invalid or has expired.", "coupon": None}
+            else:
+                candidates[code] = coupon
+
+        limited_ids = [c["id"] for c in candidates.values() if c["usage_limit"] is not None]
+        used = dict(Coupon.objects.filter(id__in=limited_ids).values_list("id", "times_used")) if limited_ids else {}
+
+        per_user_ids = [c["id"] for c in candidates.values() if c["per_user_limit"] is not None]
+        used_by_user = {}
+        if per_user_ids and user is not None and user.is_authenticated:
+            used_by_user = dict(
+                CouponUserCounter.objects.filter(user=user, coupon_id__in=per_user_ids)
+                .values_list("coupon_id", "times_used")
+            )
+
+        for code, coupon in candidates.items():
+            reason = None
+            if coupon["usage_limit"] is not None and used.get(coupon["id"], 0) >= coupon["usage_limit"]:
+                reason = "Coupon usage limit has been reached."
+            elif coupon["per_user_limit"] is not None and used_by_user.get(coupon["id"], 0) >= coupon["per_user_limit"]:
+                reason = "You have already used this coupon the maximum number of times."
+            results[code] = {"valid": reason is None, "reason": reason, "coupon": coupon}
+        return results
+
+    @staticmethod
+    def validate(code, user=None):
+        """Single-code validate_coupons(); returns the coupon dict or None."""
+        if not code:
+            return None
+        result = CouponService.validate_coupons([code], user)[code]
+        return result["coupon"] if result["valid"] else None
+
+    @staticmethod
+    def redeem(coupon_id, user, booking):
+        """
+        Counts one redemption of a coupon for a booking.
+        Raises ValidationError (rolling back the caller's transaction) when a
+        usage limit is already reached. Redeeming twice for one booking is a no-op.
+        """
+        if CouponUsage.objects.filter(coupon_id=coupon_id, booking=booking).exists():
+            return
+        try:
+            with transaction.atomic():
+                # The usage row goes in first: the unique (coupon, booking) constraint
+                # stops a concurrent redemption of the same booking before any counter moves
+                CouponUsage.objects.create(coupon_id=coupon_id, booking=booking, user=user)
+
+                coupon = Coupon.objects.only("usage_limit", "per_user_limit").get(pk=coupon_id)
+
+                # Conditional increments: the row only moves while under the limit
+                counters = Coupon.objects.filter(pk=coupon_id)
+                if coupon.usage_limit is not None:
+                    counters = counters.filter(times_used__lt=coupon.usage_limit)
+                if not counters.update(times_used=F("times_used") + 1):
+                    raise serializers.ValidationError({"coupon_code": "Coupon usage limit has been reached."})
+
+                if coupon.per_user_limit is not None:
+                    counter, _ = CouponUserCounter.objects.get_or_create(coupon_id=coupon_id, user=user)
+                    if not CouponUserCounter.objects.filter(
+                        pk=counter.pk, times_used__lt=coupon.per_user_limit
+                    ).update(times_used=F("times_used") + 1):
+                        raise serializers.ValidationError(
+                            {"coupon_code": "You have already used this coupon the maximum number of times."}
+                        )
+        except IntegrityError:
+            # Another confirm of this booking redeemed it first; its counts stand
+            return
@@ -1,13 +1,22 @@
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
-from apps.coupons.models import Coupon
+from rest_framework.response import Response
 from .serializers import CouponSerializer
+from .services import CouponService
 
 class CouponListAPIView(ListAPIView):
+    """
+    Coupons valid today, served from the coupon cache, each flagged with whether
+    the requesting user can still apply it.
+    """
     serializer_class = CouponSerializer
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        today = timezone.now().date()
-        return Coupon.objects.filter(valid_from__lte=today, valid_to__gte=today)
+    def list(self, request, *args, **kwargs):
+        coupons = CouponService.current_coupons()
+        results = CouponService.validate_coupons([coupon["code"] for coupon in coupons], request.user)
+        data = [
+            {**coupon, "is_applicable": results[coupon["code"]]["valid"], "reason": results[coupon["code"]]["reason"]}
+            for coupon in coupons
+        ]
+        return Response(self.get_serializer(data, many=True).data)
@@ -1,7 +1,8 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import FoodDestinationListView, FoodDestinationDetailView
 
 urlpatterns = [
-    path("", FoodDestinationListView.as_view(), name="food-destination-list"),
-    path("<slug:slug>/", FoodDestinationDetailView.as_view(), name="food-destination-detail"),
+    path("", read_view(FoodDestinationListView), name="food-destination-list"),
+    path("<slug:slug>/", read_view(FoodDestinationDetailView), name="food-destination-detail"),
 ]
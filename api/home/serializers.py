@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.utils import timezone
 from apps.properties.models import Property
 from apps.packages.models import HolidayPackage
 from apps.houseboats.models import HouseBoat
@@ -236,10 +237,11 @@ class SearchHotelSerializer(serializers.ModelSerializer):
     price_from = serializers.SerializerMethodField()
     primary_image = serializers.SerializerMethodField()
     rating = serializers.DecimalField(source="review_rating", max_digits=3, decimal_places=1)
+    rooms_left = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
-        fields = ["id", "name", "location", "price_from", "rating", "primary_image", "property_type"]
+        fields = ["id", "name", "location", "price_from", "rating", "primary_image", "property_type", "rooms_left"]
 
     def get_location(self, obj):
         return f"{obj.city}, {obj.state}"
@@ -259,6 +261,10 @@ class SearchHotelSerializer(serializers.ModelSerializer):
             return image_obj.image.url
         return None
 
+    def get_rooms_left(self, obj):
+        """Rooms free for the whole stay, when the search has stay dates."""
+        return getattr(obj, "rooms_left", None)
+
 class SearchPackageSerializer(serializers.ModelSerializer):
     """
     Serializer for Holiday Package search results.
@@ -337,10 +343,26 @@ class SearchCabSerializer(serializers.ModelSerializer):
     Serializer for Cab search results.
     """
     primary_image = serializers.SerializerMethodField()
+    fare = serializers.SerializerMethodField()
+    discounted_fare = serializers.SerializerMethodField()
+    units_left = serializers.SerializerMethodField()
 
     class Meta:
         model = Cab
-        fields = ["id", "title", "capacity", "base_price", "fuel_type", "primary_image"]
+        fields = ["id", "title", "capacity", "base_price", "fare", "discounted_fare", "units_left", "fuel_type", "primary_image"]
+
+    def get_fare(self, obj):
+        """Trip fare before tax, annotated by the view when pickup and drop are known."""
+        fare = getattr(obj, "fare", None)
+        return None if fare is None else Decimal(fare).quantize(Decimal("0.01"))
+
+    def get_discounted_fare(self, obj):
+        fare = getattr(obj, "discounted_fare", None)
+        return None if fare is None else Decimal(fare).quantize(Decimal("0.01"))
+
+    def get_units_left(self, obj):
+        """Vehicles free for the trip, when the search has a pickup time."""
+        return getattr(obj, "units_left", None)
 
     def get_primary_image(self, obj):
         image_obj = obj.images.filter(is_primary=True).first() or obj.images.first()
@@ -350,3 +372,29 @@ class SearchCabSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(image_obj.image.url)
             return image_obj.image.url
         return None
+
+
+class FlexibleSearchQuerySerializer(serializers.Serializer):
+    """Flexible-date parameters of hotel/homestay search (used when `nights` is given)."""
+    MAX_WINDOW = 90
+
+    # Flexible dates scan every room of every match, so the search must be scoped
+    destination = serializers.CharField()
+    nights = serializers.IntegerField(min_value=1, max_value=30)
+    date_from = serializers.DateField(required=False, help_text="First possible check-in; defaults to today")
+    window = serializers.IntegerField(required=False, default=30, min_value=1, max_value=MAX_WINDOW, help_text="Number of possible check-in dates")
+    limit = serializers.IntegerField(required=False, default=3, min_value=1, max_value=10, help_text="Cheapest dates returned per property")
+
+    def validate_date_from(self, value):
+        if value < timezone.localdate():
+            raise serializers.ValidationError("date_from cannot be in the past.")
+        return value
+
+
+class FlexibleStaySerializer(serializers.Serializer):
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    discounted_price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    room_type_id = serializers.IntegerField()
+    room_option_id = serializers.IntegerField(allow_null=True)
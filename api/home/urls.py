@@ -1,4 +1,5 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import (
     PopularHotelsAPIView, 
     PopularHomestaysAPIView, 
@@ -9,10 +10,10 @@ from .views import (
 )
 
 urlpatterns = [
-    path("search/", GlobalSearchAPIView.as_view(), name="global-search"),
-    path("popular-hotels/", PopularHotelsAPIView.as_view(), name="popular-hotels"),
-    path("popular-homestays/", PopularHomestaysAPIView.as_view(), name="popular-homestays"),
-    path("popular-holiday-packages/", PopularHolidayPackagesAPIView.as_view(), name="popular-holiday-packages"),
-    path("popular-houseboats/", PopularHouseboatsAPIView.as_view(), name="popular-houseboats"),
-    path("popular-activities/", PopularActivitiesAPIView.as_view(), name="popular-activities"),
+    path("search/", read_view(GlobalSearchAPIView), name="global-search"),
+    path("popular-hotels/", read_view(PopularHotelsAPIView), name="popular-hotels"),
+    path("popular-homestays/", read_view(PopularHomestaysAPIView), name="popular-homestays"),
+    path("popular-holiday-packages/", read_view(PopularHolidayPackagesAPIView), name="popular-holiday-packages"),
+    path("popular-houseboats/", read_view(PopularHouseboatsAPIView), name="popular-houseboats"),
+    path("popular-activities/", read_view(PopularActivitiesAPIView), name="popular-activities"),
 ]
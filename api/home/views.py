@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db.models import Q
+from django.utils import timezone
 from apps.properties.models import Property
 from apps.packages.models import HolidayPackage
 from apps.houseboats.models import HouseBoat
@@ -16,15 +17,25 @@ from .serializers import (
     SearchPackageSerializer,
     SearchHouseboatSerializer,
     SearchActivitySerializer,
-    SearchCabSerializer
+    SearchCabSerializer,
+    FlexibleSearchQuerySerializer,
+    FlexibleStaySerializer,
 )
+from api.cabs.serializers import CabAvailabilityQuerySerializer
+from api.cabs.services import CabFareService, CabScheduleService
+from api.houseboats.services import HouseBoatRateService
+from api.properties.serializers import StayQuerySerializer
+from api.properties.services import RoomRateService
 
 class GlobalSearchAPIView(APIView):
     """
     Unified Search API that routes internally based on search 'type'.
     Supports: hotel, homestay, package, houseboat, activity, cab.
+    Hotel and homestay searches switch to flexible dates when `nights` is given;
+    with `check_in`/`check_out`, stay searches only return what is free for the stay.
     """
     permission_classes = [permissions.AllowAny]
+    check_in = check_out = None
 
     def get(self, request, *args, **kwargs):
         search_type = request.query_params.get("type")
@@ -44,6 +55,7 @@ class GlobalSearchAPIView(APIView):
                     {"error": "Check-out date must be after check-in date."}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            self.check_in, self.check_out = StayQuerySerializer.stay(request.query_params)
 
         if search_type == "hotel":
             return self.search_hotels(request)
@@ -79,12 +91,18 @@ class GlobalSearchAPIView(APIView):
         if guests:
             queryset = queryset.filter(room_types__max_guests__gte=guests).distinct()
         
-        queryset = queryset.prefetch_related("room_types", "images").order_by("-review_rating")
-        serializer = SearchHotelSerializer(queryset, many=True, context={"request": request})
+        if request.query_params.get("nights"):
+            return self.flexible_search(request, queryset, "hotel", guests)
+
+        queryset, units_left = self.exclude_sold_out(queryset, guests)
+        properties = list(queryset.prefetch_related("room_types", "images").order_by("-review_rating"))
+        if self.check_in:
+            RoomRateService.annotate_rooms_left(properties, units_left, int(guests) if guests else None)
+        serializer = SearchHotelSerializer(properties, many=True, context={"request": request})
         return Response({
             "type": "hotel",
             "results": serializer.data,
-            "meta": {"total": queryset.count()}
+            "meta": {"total": len(properties)}
         })
 
     def search_homestays(self, request):
@@ -102,12 +120,55 @@ class GlobalSearchAPIView(APIView):
         if guests:
             queryset = queryset.filter(room_types__max_guests__gte=guests).distinct()
         
-        queryset = queryset.prefetch_related("room_types", "images").order_by("-review_rating")
-        serializer = SearchHotelSerializer(queryset, many=True, context={"request": request})
+        if request.query_params.get("nights"):
+            return self.flexible_search(request, queryset, "homestay", guests)
+
+        queryset, units_left = self.exclude_sold_out(queryset, guests)
+        properties = list(queryset.prefetch_related("room_types", "images").order_by("-review_rating"))
+        if self.check_in:
+            RoomRateService.annotate_rooms_left(properties, units_left, int(guests) if guests else None)
+        serializer = SearchHotelSerializer(properties, many=True, context={"request": request})
         return Response({
             "type": "homestay",
             "results": serializer.data,
-            "meta": {"total": queryset.count()}
+            "meta": {"total": len(properties)}
+        })
+
+    def exclude_sold_out(self, queryset, guests=None):
+        """Drops properties with no fitting room free for the whole stay; returns (queryset, units_left)."""
+        if not self.check_in:
+            return queryset, {}
+        units_left = RoomRateService.units_left(queryset, self.check_in, self.check_out, int(guests) if guests else None)
+        return queryset.exclude(pk__in=[pk for pk, left in units_left.items() if not left]), units_left
+
+    def flexible_search(self, request, queryset, search_type, guests=None):
+        """
+        Flexible dates: given `nights` (and optionally `date_from`, `window`,
+        `limit`), returns the properties that have a stay of that length
+        starting within the window, cheapest first, each with its cheapest
+        start dates.
+        """
+        params = FlexibleSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        date_from = data.get("date_from") or timezone.localdate()
+
+        properties = list(queryset.select_related("discount").prefetch_related("room_types__options", "images"))
+        stays = RoomRateService.cheapest_stays(
+            properties, date_from, data["window"], data["nights"], guests=int(guests) if guests else None, limit=data["limit"]
+        )
+        properties = sorted(
+            (property_obj for property_obj in properties if stays.get(property_obj.pk)),
+            key=lambda property_obj: stays[property_obj.pk][0]["discounted_price"],
+        )
+
+        results = SearchHotelSerializer(properties, many=True, context={"request": request}).data
+        for result, property_obj in zip(results, properties):
+            result["cheapest_stays"] = FlexibleStaySerializer(stays[property_obj.pk], many=True).data
+        return Response({
+            "type": search_type,
+            "results": results,
+            "meta": {"total": len(properties), "nights": data["nights"], "date_from": date_from, "window": data["window"]}
         })
 
     def search_packages(self, request):
@@ -165,6 +226,8 @@ class GlobalSearchAPIView(APIView):
                 Q(specification__cruise_type__icontains=houseboat_type) | 
                 Q(specification__ac_type__icontains=houseboat_type)
             )
+        if self.check_in:
+            queryset = queryset.exclude(pk__in=HouseBoatRateService.unavailable(queryset, self.check_in, self.check_out))
             
         queryset = queryset.select_related("specification", "discount").prefetch_related("images").order_by("-rating")
         serializer = SearchHouseboatSerializer(queryset, many=True, context={"request": request})
@@ -217,12 +280,32 @@ class GlobalSearchAPIView(APIView):
         # trip_type currently just passes through or could filter by capabilities if model supported it
         # For now, we assume all cabs can do all trip types or it's handled at booking
             
-        queryset = queryset.select_related("category").prefetch_related("images").order_by("base_price")
-        serializer = SearchCabSerializer(queryset, many=True, context={"request": request})
+        queryset = queryset.select_related("category").prefetch_related("images")
+
+        # Known pickup and drop: every cab is priced for the trip in the same query, cheapest first
+        distance = CabFareService.route_km(pickup, drop) if pickup and drop else None
+        trip_km = None
+        if distance is not None:
+            trip_km = CabFareService.trip_km(distance, trip_type)
+            queryset = CabFareService.with_fares(queryset, trip_km).order_by("discounted_fare", "fare")
+        else:
+            queryset = queryset.order_by("base_price")
+
+        cabs = list(queryset)
+
+        # Pickup time given: only cabs with a vehicle free for the whole trip
+        pickup_at = CabAvailabilityQuerySerializer.pickup_at(request.query_params)
+        if pickup_at:
+            free = CabScheduleService.free_units(cabs, pickup_at, CabScheduleService.trip_duration(trip_km))
+            cabs = [cab for cab in cabs if free[cab.pk]]
+            for cab in cabs:
+                cab.units_left = free[cab.pk]
+
+        serializer = SearchCabSerializer(cabs, many=True, context={"request": request})
         return Response({
             "type": "cab",
             "results": serializer.data,
-            "meta": {"total": queryset.count()}
+            "meta": {"total": len(cabs), "distance_km": distance, "trip_km": trip_km}
         })
 
 class PopularHotelsAPIView(generics.ListAPIView):
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from apps.bookings.models import BookingItem
+from apps.common.rates import HELD_STATUSES, occupancy_line, price_line, stay_nights
+from apps.houseboats.models import HouseBoatRate
+
+RATE_FIELDS = ("date", "price", "is_closed", "source")
+
+
+class HouseBoatRateService:
+    """
+    Nightly houseboat prices from HouseBoatRate (see apps/common/rates.py).
+    A houseboat is a single unit: one held booking takes the boat for the night.
+    """
+
+    @staticmethod
+    def rates(houseboat, start, end):
+        """Rate rows of the houseboat from start up to, not including, end."""
+        return HouseBoatRate.objects.filter(houseboat=houseboat, date__gte=start, date__lt=end).values(*RATE_FIELDS)
+
+    @staticmethod
+    def stay_prices(houseboat, check_in, check_out):
+        """Returns ([discounted price per night], [closed nights]) for a stay."""
+        nights = stay_nights(check_in, check_out)
+        rows = HouseBoatRateService.rates(houseboat, nights[0], nights[-1] + timedelta(days=1))
+        prices, closed = price_line(rows, nights[0], len(nights), houseboat.base_price_per_night)
+        discounted = [
+            Decimal(str(houseboat.calculate_pricing(price)["discounted_price"])).quantize(Decimal("0.01")) for price in prices
+        ]
+        return discounted, [night for night, is_closed in zip(nights, closed) if is_closed]
+
+    @staticmethod
+    def calendar(houseboat, start, days):
+        """Nightly price for each of `days` nights from `start`, where the boat is free and open for sale."""
+        end = start + timedelta(days=days)
+        prices, closed = price_line(HouseBoatRateService.rates(houseboat, start, end), start, days, houseboat.base_price_per_night)
+        held = BookingItem.objects.filter(
+            houseboat=houseboat, booking__status__in=HELD_STATUSES, check_in__lt=end, check_out__gt=start
+        ).values_list("check_in", "check_out")
+        occupied = occupancy_line(held, start, days)
+
+        results = []
+        for offset, (price, is_closed, units) in enumerate(zip(prices, closed, occupied)):
+            available = not is_closed and units == 0
+            results.append({
+                "date": start + timedelta(days=offset),
+                "available": available,
+                "price": price if available else None,
+                "discounted_price": Decimal(str(houseboat.calculate_pricing(price)["discounted_price"])) if available else None,
+            })
+        return results
+
+    @staticmethod
+    def unavailable(houseboats, check_in, check_out):
+        """Ids of the houseboats of the `houseboats` queryset that are booked or closed on any night of the stay, in one query."""
+        nights = stay_nights(check_in, check_out)
+        start, end = nights[0], nights[-1] + timedelta(days=1)
+        held = BookingItem.objects.filter(
+            houseboat__in=houseboats, booking__status__in=HELD_STATUSES, check_in__lt=end, check_out__gt=start
+        ).values_list("houseboat_id").order_by()
+        closed = HouseBoatRate.objects.filter(
+            houseboat__in=houseboats, is_closed=True, date__gte=start, date__lt=end
+        ).values_list("houseboat_id").order_by()
+        return {houseboat_id for (houseboat_id,) in held.union(closed)}
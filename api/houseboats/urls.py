@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import HouseboatDetailAPIView
+from api.async_views import read_view
+from .views import HouseboatDetailAPIView, HouseboatCalendarAPIView
 
 urlpatterns = [
-    path("<int:pk>/", HouseboatDetailAPIView.as_view(), name="houseboat-detail"),
+    path("<int:pk>/", read_view(HouseboatDetailAPIView), name="houseboat-detail"),
+    path("<int:pk>/calendar/", read_view(HouseboatCalendarAPIView), name="houseboat-calendar"),
 ]
@@ -1,8 +1,13 @@
-from rest_framework.generics import RetrieveAPIView
+from rest_framework.generics import RetrieveAPIView, get_object_or_404
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.db.models import Prefetch, Min
+from django.utils import timezone
 from apps.houseboats.models import HouseBoat, HouseBoatImage, HouseBoatInclusion
+from api.properties.serializers import CalendarQuerySerializer, CalendarDaySerializer
 from .serializers import HouseBoatDetailSerializer
+from .services import HouseBoatRateService
 
 class HouseboatDetailAPIView(RetrieveAPIView):
     """
@@ -39,3 +44,23 @@ class HouseboatDetailAPIView(RetrieveAPIView):
 
 
         return context
+
+
+class HouseboatCalendarAPIView(APIView):
+    """
+    Nightly price (before tax) for each of the next `days` nights from
+    `start` (default today), for the date picker. Booked or closed nights
+    come back with available=false and no price.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk):
+        params = CalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        houseboat = get_object_or_404(HouseBoat.objects.select_related("discount"), pk=pk, is_active=True)
+        start = params.validated_data.get("start") or timezone.localdate()
+        days = HouseBoatRateService.calendar(houseboat, start, params.validated_data["days"])
+        return Response({
+            "houseboat_id": houseboat.pk,
+            "results": CalendarDaySerializer(days, many=True).data,
+        })
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.common.sequences import SequenceService
+from apps.invoices.models import Invoice
+from apps.invoices.pdf import render_invoice_pdf
+
+# Bump when the PDF layout changes so every invoice re-renders on regeneration
+RENDERER_VERSION = "1"
+
+# Services Accounting Codes printed per booking type
+SAC_CODES = {
+    "stay": "996311",
+    "houseboat": "996311",
+    "package": "998552",
+    "activity": "998552",
+    "cab": "996601",
+}
+
+INVOICEABLE_STATUSES = ("confirmed", "completed")
+
+_render_pool = {"executor": None}
+
+
+def money(value):
+    return f"{Decimal(str(value or 0)):.2f}"
+
+
+class InvoiceService:
+    """
+    GST invoices for confirmed bookings.
+
+    Invoice data is built from the booking's pricing snapshot in the calling
+    process; the CPU-bound PDF rendering runs in a process pool
+    (INVOICE_RENDER_PROCESSES) and the result is saved to INVOICE_FILE_STORAGE.
+    An invoice whose data hash is unchanged is not rendered again.
+    """
+
+    @staticmethod
+    def series(moment):
+        # One consecutive series per Indian financial year (April to March): "TB/26-27"
+        moment = timezone.localtime(moment)
+        start = moment.year if moment.month >= 4 else moment.year - 1
+        return f"{settings.INVOICE_NUMBER_PREFIX}/{start % 100:02d}-{(start + 1) % 100:02d}"
+
+    @staticmethod
+    def ensure(booking):
+        """
+        The booking's invoice row, created as pending on first use. The number
+        is taken from the gap-free series in the same short transaction as the
+        row, so a failed insert gives its number back.
+        """
+        invoice = Invoice.objects.filter(booking=booking).first()
+        if invoice is not None:
+            return invoice
+        issued_at = timezone.now()
+        series = InvoiceService.series(issued_at)
+        try:
+            with transaction.atomic():
+                # GST caps invoice numbers at 16 characters: TB/26-27/000123
+                number = SequenceService.next_gap_free(f"invoice:{series}")
+                return Invoice.objects.create(booking=booking, number=f"{series}/{number:06d}", issued_at=issued_at)
+        except IntegrityError:
+            # Created concurrently by another worker
+            return Invoice.objects.get(booking=booking)
+
+    @staticmethod
+    def build_data(invoice, booking):
+        """Plain, picklable invoice content for render_invoice_pdf()."""
+        pricing = booking.pricing_breakdown or {}
+        seller = settings.INVOICE_SELLER
+        buyer_gstin = booking.gst_number.strip().upper() if booking.is_gst_required else ""
+        seller_state = seller["state_code"]
+        buyer_state = buyer_gstin[:2] if buyer_gstin else seller_state
+
+        lines = []
+        for item in pricing.get("breakdown", []):
+            quantity = item.get("quantity") or (item.get("adults", 0) + item.get("children", 0)) or 1
+            lines.append({
+                "description": item.get("name", ""),
+                "detail": " - ".join(part for part in (item.get("sub_name"), item.get("location")) if part),
+                "quantity": str(quantity),
+                "amount": money(item.get("total")),
+            })
+        if not lines:
+            # Bookings confirmed before pricing snapshots existed
+            lines.append({
+                "description": booking.get_booking_type_display(), "detail": "", "quantity": "1",
+                "amount": money(booking.total_amount),
+            })
+
+        gst = Decimal(str(pricing.get("taxes", 0)))
+        totals = [("Taxable value", money(pricing.get("base_total", booking.total_amount - gst)))]
+        if buyer_state == seller_state:
+            half = (gst / 2).quantize(Decimal("0.01"))
+            totals += [("CGST", money(half)), ("SGST", money(gst - half))]
+        else:
+            totals.append(("IGST", money(gst)))
+        discount = Decimal(str(pricing.get("coupon_discount", 0)))
+        if discount:
+            totals.append(("Coupon discount", money(-discount)))
+        insurance = Decimal(str(pricing.get("insurance_fee", 0)))
+        if insurance:
+            totals.append(("Travel insurance", money(insurance)))
+        totals.append(("Total", money(pricing.get("final_total", booking.total_amount))))
+
+        return {
+            "seller": seller,
+            "buyer": {
+                "name": booking.company_name if buyer_gstin and booking.company_name else booking.full_name,
+                "address": booking.company_address if buyer_gstin else "",
+                "gstin": buyer_gstin,
+            },
+            "number": invoice.number,
+            "date": timezone.localtime(invoice.issued_at).strftime("%d %b %Y"),
+            "booking_reference": booking.display_reference,
+            "place_of_supply": f"State code {buyer_state}",
+            "sac": SAC_CODES.get(booking.booking_type, ""),
+            "lines": lines,
+            "totals": totals,
+            "amount_paid": money(booking.amount_paid),
+        }
+
+    @staticmethod
+    def content_hash(data):
+        payload = json.dumps(data, sort_keys=True) + RENDERER_VERSION
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def render_pool():
+        """This process's renderer pool, or None to render inline."""
+        if settings.INVOICE_RENDER_PROCESSES <= 0:
+            return None
+        if _render_pool["executor"] is None:
+            # spawn: children never inherit the parent's DB sockets or threads
+            _render_pool["executor"] = ProcessPoolExecutor(
+                max_workers=settings.INVOICE_RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _render_pool["executor"]
+
+    @staticmethod
+    def render(invoices, executor=None, force=False):
+        """
+        Renders and stores the given invoices (their bookings should be
+        select_related). Yields (invoice, outcome) in order, where outcome is
+        "rendered", "unchanged" or "failed".
+        """
+        pending = []
+        for invoice in invoices:
+            data = InvoiceService.build_data(invoice, invoice.booking)
+            digest = InvoiceService.content_hash(data)
+            if not force and invoice.status == Invoice.READY and invoice.content_hash == digest and invoice.file:
+                pending.append((invoice, digest, None))
+                continue
+            future = executor.submit(render_invoice_pdf, data) if executor else None
+            pending.append((invoice, digest, future or data))
+
+        for invoice, digest, job in pending:
+            if job is None:
+                yield invoice, "unchanged"
+                continue
+            try:
+                pdf = job.result() if executor else render_invoice_pdf(job)
+                InvoiceService.store(invoice, pdf, digest)
+            except Exception as exc:
+                invoice.status = Invoice.FAILED
+                invoice.last_error = f"{type(exc).__name__}: {exc}"
+                invoice.save(update_fields=["status", "last_error", "updated_at"])
+                yield invoice, "failed"
+                continue
+            yield invoice, "rendered"
+
+    @staticmethod
+    def store(invoice, pdf, digest):
+        if invoice.file:
+            invoice.file.delete(save=False)
+        invoice.file.save(f"{invoice.number.replace('/', '-')}.pdf", ContentFile(pdf), save=False)
+        invoice.status = Invoice.READY
+        invoice.content_hash = digest
+        invoice.size = len(pdf)
+        invoice.rendered_at = timezone.now()
+        invoice.last_error = ""
+        invoice.save(update_fields=["file", "status", "content_hash", "size", "rendered_at", "last_error", "updated_at"])
+
+    @staticmethod
+    def generate(booking_id, force=False):
+        """Creates (if needed) and renders the invoice of a confirmed booking."""
+        booking = Booking.objects.filter(pk=booking_id, status__in=INVOICEABLE_STATUSES).first()
+        if booking is None:
+            return None
+        invoice = InvoiceService.ensure(booking)
+        invoice.booking = booking
+        for invoice, outcome in InvoiceService.render([invoice], InvoiceService.render_pool(), force):
+            if outcome == "failed":
+                # Let the job queue retry with backoff
+                raise RuntimeError(f"Rendering invoice {invoice.number} failed: {invoice.last_error}")
+        return invoice
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import InvoiceDownloadAPIView
+
+urlpatterns = [
+    path("<int:booking_id>/", InvoiceDownloadAPIView.as_view(), name="invoice-download"),
+]
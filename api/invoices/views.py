@@ -0,0 +1,51 @@
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.bookings.models import Booking
+from apps.invoices.models import Invoice
+from apps.jobs.queue import JobQueue
+from .services import INVOICEABLE_STATUSES, InvoiceService
+
+
+class InvoiceDownloadAPIView(APIView):
+    """
+    GST invoice PDF of one of the user's confirmed bookings.
+    Serves the stored copy with an ETag (304 on If-None-Match); while the
+    invoice is still being rendered it answers 202 and the client retries.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, booking_id):
+        booking = get_object_or_404(Booking.objects.only("id", "status"), id=booking_id, user=request.user)
+        if booking.status not in INVOICEABLE_STATUSES:
+            return Response(
+                {"detail": "An invoice is issued once the booking is confirmed."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        invoice = Invoice.objects.filter(booking=booking).first()
+        if invoice is None:
+            invoice = InvoiceService.ensure(booking)
+            JobQueue.enqueue("invoices.generate", {"booking_id": booking.id}, queue="invoices", priority=5)
+        if invoice.status != Invoice.READY:
+            return Response(
+                {"status": invoice.status, "number": invoice.number, "detail": "The invoice is being generated."},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        etag = f'"{invoice.content_hash}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = FileResponse(
+                invoice.file.open("rb"),
+                as_attachment=True,
+                filename=f"{invoice.number.replace('/', '-')}.pdf",
+                content_type="application/pdf",
+            )
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -23,12 +23,13 @@ class HotelListingSerializer(serializers.ModelSerializer):
     primary_image = serializers.SerializerMethodField()
     cta_label = serializers.SerializerMethodField()
     rating = serializers.DecimalField(source="review_rating", max_digits=3, decimal_places=1, read_only=True)
+    rooms_left = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
         fields = [
             "id", "name", "location", "rating", "price_from", 
-            "primary_image", "property_type", "cta_label"
+            "primary_image", "property_type", "cta_label", "rooms_left"
         ]
 
     def get_location(self, obj):
@@ -44,6 +45,10 @@ class HotelListingSerializer(serializers.ModelSerializer):
     def get_cta_label(self, obj):
         return "Book Now"
 
+    def get_rooms_left(self, obj):
+        # Set by the View when stay dates are given ("only 2 left")
+        return getattr(obj, "rooms_left", None)
+
 class PackageListingSerializer(serializers.ModelSerializer):
     location = serializers.CharField(source="primary_location")
     price_from = serializers.DecimalField(source="base_price", max_digits=12, decimal_places=2)
@@ -1,4 +1,5 @@
 from django.urls import path
+from api.async_views import read_view
 from .views.hotels import HotelListingAPIView
 from .views.homestays import HomestayListingAPIView
 from .views.packages import PackageListingAPIView
@@ -7,10 +8,10 @@ from .views.activities import ActivityListingAPIView
 from .views.cabs import CabListingAPIView
 
 urlpatterns = [
-    path("hotels/", HotelListingAPIView.as_view(), name="listing-hotels"),
-    path("homestays/", HomestayListingAPIView.as_view(), name="listing-homestays"),
-    path("packages/", PackageListingAPIView.as_view(), name="listing-packages"),
-    path("houseboats/", HouseboatListingAPIView.as_view(), name="listing-houseboats"),
-    path("activities/", ActivityListingAPIView.as_view(), name="listing-activities"),
-    path("cabs/", CabListingAPIView.as_view(), name="listing-cabs"),
+    path("hotels/", read_view(HotelListingAPIView), name="listing-hotels"),
+    path("homestays/", read_view(HomestayListingAPIView), name="listing-homestays"),
+    path("packages/", read_view(PackageListingAPIView), name="listing-packages"),
+    path("houseboats/", read_view(HouseboatListingAPIView), name="listing-houseboats"),
+    path("activities/", read_view(ActivityListingAPIView), name="listing-activities"),
+    path("cabs/", read_view(CabListingAPIView), name="listing-cabs"),
 ]
@@ -2,6 +2,8 @@ from rest_framework import generics, permissions
 from django.db.models import Min, Q, Count
 from apps.properties.models import Property, Amenity
 from ..serializers import HotelListingSerializer
+from api.properties.serializers import StayQuerySerializer
+from api.properties.services import RoomRateService
 from ..filters import ListingPagination, get_price_range, unique_by_id
 
 class HomestayListingAPIView(generics.ListAPIView):
@@ -67,6 +69,14 @@ class HomestayListingAPIView(generics.ListAPIView):
         if amenities:
             queryset = queryset.filter(amenities__id__in=amenities).distinct()
 
+        # Stay dates: drop properties with no fitting room free for the whole stay
+        self.guests = int(guests) if guests else None
+        self.check_in, self.check_out = StayQuerySerializer.stay(self.request.query_params)
+        self.units_left = {}
+        if self.check_in:
+            self.units_left = RoomRateService.units_left(queryset, self.check_in, self.check_out, self.guests)
+            queryset = queryset.exclude(pk__in=[pk for pk, left in self.units_left.items() if not left])
+
         # Sorting
         sort_by = self.request.query_params.get("sort_by", "rating")
         if sort_by == "price_asc":
@@ -109,6 +119,8 @@ class HomestayListingAPIView(generics.ListAPIView):
 
         page = self.paginate_queryset(queryset)
         if page is not None:
+            if self.check_in:
+                RoomRateService.annotate_rooms_left(page, self.units_left, self.guests)
             serializer = self.get_serializer(page, many=True)
             return self.paginator.get_paginated_response(serializer.data, extra_data={
                 "filters": {
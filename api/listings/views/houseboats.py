@@ -1,5 +1,8 @@
 from rest_framework import generics, permissions
+from django.db.models import Q
 from apps.houseboats.models import HouseBoat
+from api.houseboats.services import HouseBoatRateService
+from api.properties.serializers import StayQuerySerializer
 from ..serializers import HouseboatListingSerializer
 from ..filters import ListingPagination, get_price_range, unique_list
 
@@ -38,6 +41,11 @@ class HouseboatListingAPIView(generics.ListAPIView):
                 Q(specification__ac_type__icontains=houseboat_type)
             )
 
+        # Stay dates: drop boats booked or closed on any night of the stay
+        check_in, check_out = StayQuerySerializer.stay(self.request.query_params)
+        if check_in:
+            queryset = queryset.exclude(pk__in=HouseBoatRateService.unavailable(queryset, check_in, check_out))
+
         sort_by = self.request.query_params.get("sort_by", "rating")
         if sort_by == "price_asc":
             queryset = queryset.order_by("base_price_per_night")
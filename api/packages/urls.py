@@ -1,7 +1,8 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import HolidayPackageDetailAPIView, PackagePricingAPIView
 
 urlpatterns = [
-    path("<int:pk>/", HolidayPackageDetailAPIView.as_view(), name="package-detail"),
-    path("<int:pk>/price/", PackagePricingAPIView.as_view(), name="package-price"),
+    path("<int:pk>/", read_view(HolidayPackageDetailAPIView), name="package-detail"),
+    path("<int:pk>/price/", read_view(PackagePricingAPIView), name="package-price"),
 ]
@@ -1,6 +1,7 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import FamousPlaceListAPIView
 
 urlpatterns = [
-    path("famous-places/", FamousPlaceListAPIView.as_view(), name="famous-places-list"),
+    path("famous-places/", read_view(FamousPlaceListAPIView), name="famous-places-list"),
 ]
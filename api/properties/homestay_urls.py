@@ -1,10 +1,13 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import (
     HomestayDetailAPIView,
     HomestayRoomAvailabilityAPIView,
+    HomestayCalendarAPIView,
 )
 
 urlpatterns = [
-    path("<int:pk>/", HomestayDetailAPIView.as_view(), name="homestay-detail"),
-    path("<int:pk>/rooms/", HomestayRoomAvailabilityAPIView.as_view(), name="homestay-rooms"),
+    path("<int:pk>/", read_view(HomestayDetailAPIView), name="homestay-detail"),
+    path("<int:pk>/rooms/", read_view(HomestayRoomAvailabilityAPIView), name="homestay-rooms"),
+    path("<int:pk>/calendar/", read_view(HomestayCalendarAPIView), name="homestay-calendar"),
 ]
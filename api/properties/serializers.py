@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.utils import timezone
 from apps.properties.models import Property, RoomType, PropertyImage, Amenity, Discount, RoomOption, FamousPlace
 from django.db.models import Min
 
@@ -369,3 +370,51 @@ class FamousPlaceSerializer(serializers.ModelSerializer):
             "entry_fee",
             "timings",
         ]
+
+
+class CalendarQuerySerializer(serializers.Serializer):
+    """Query parameters of the price calendars (properties and houseboats)."""
+    MAX_DAYS = 180
+
+    start = serializers.DateField(required=False, help_text="First night; defaults to today")
+    days = serializers.IntegerField(required=False, default=30, min_value=1, max_value=MAX_DAYS)
+
+    def validate_start(self, value):
+        if value < timezone.localdate():
+            raise serializers.ValidationError("start cannot be in the past.")
+        return value
+
+
+class StayQuerySerializer(serializers.Serializer):
+    """Optional stay dates of listings and search; results are limited to what is free for the whole stay."""
+    MAX_NIGHTS = 90
+
+    check_in = serializers.DateField(required=False)
+    check_out = serializers.DateField(required=False)
+
+    def validate(self, data):
+        check_in, check_out = data.get("check_in"), data.get("check_out")
+        if bool(check_in) != bool(check_out):
+            raise serializers.ValidationError("check_in and check_out must be given together.")
+        if check_in:
+            if check_in < timezone.localdate():
+                raise serializers.ValidationError({"check_in": "check_in cannot be in the past."})
+            if check_out <= check_in:
+                raise serializers.ValidationError({"check_out": "Check-out date must be after check-in date."})
+            if (check_out - check_in).days > self.MAX_NIGHTS:
+                raise serializers.ValidationError({"check_out": f"Stays are limited to {self.MAX_NIGHTS} nights."})
+        return data
+
+    @classmethod
+    def stay(cls, query_params):
+        """(check_in, check_out) from query parameters, or (None, None) when not given; blank values count as not given."""
+        params = cls(data={key: query_params[key] for key in ("check_in", "check_out") if query_params.get(key)})
+        params.is_valid(raise_exception=True)
+        return params.validated_data.get("check_in"), params.validated_data.get("check_out")
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    available = serializers.BooleanField()
+    price = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
+    discounted_price = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
@@ -0,0 +1,277 @@
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from apps.bookings.models import BookingItem
+from apps.common.rates import HELD_STATUSES, occupancy_line, price_line, stay_nights, window_sums
+from apps.properties.models import RoomRate, RoomType
+
+RATE_FIELDS = ("room_type_id", "room_option_id", "date", "price", "is_closed", "source")
+
+
+class RoomRateService:
+    """
+    Nightly room prices from RoomRate (see apps/common/rates.py): what a stay
+    costs night by night, the lowest bookable price per night for a
+    property's calendar, and the cheapest stays across a date window.
+    """
+
+    @staticmethod
+    def rates(room_type_ids, start, end):
+        """Rate rows of these room types (and their options) from start up to, not including, end."""
+        return RoomRate.objects.filter(
+            room_type_id__in=room_type_ids, date__gte=start, date__lt=end
+        ).values(*RATE_FIELDS)
+
+    @staticmethod
+    def stay_prices(room_type, room_option, check_in, check_out):
+        """
+        Returns ([(discounted price, GST), ...] per night for one unit, [closed nights]).
+        A room type's closed nights close its options too.
+        """
+        nights = stay_nights(check_in, check_out)
+        rows = list(RoomRateService.rates([room_type.pk], nights[0], nights[-1] + timedelta(days=1)))
+        option_id = room_option.pk if room_option else None
+        base_price = room_option.base_price if room_option else room_type.base_price
+
+        prices, closed = price_line([row for row in rows if row["room_option_id"] == option_id], nights[0], len(nights), base_price)
+        if room_option:
+            _, room_closed = price_line([row for row in rows if row["room_option_id"] is None], nights[0], len(nights), base_price)
+            closed = [own or room for own, room in zip(closed, room_closed)]
+
+        property_obj = room_type.property
+        amounts = []
+        for price in prices:
+            discounted = max(Decimal("0.00"), price - property_obj.discount_for(price))
+            amounts.append((discounted, property_obj.gst_for(discounted)))
+        return amounts, [night for night, is_closed in zip(nights, closed) if is_closed]
+
+    @staticmethod
+    def price_lines(room_types, start, days):
+        """
+        Yields (room type, option or None, prices) for every bookable product
+        of these room types, which must be all the room types of their
+        properties (any number of properties), where prices holds the
+        base price of each of `days` nights from `start`, or None for nights
+        the product can't be booked. Reads rates and held bookings of all the
+        room types in two queries.
+
+        A night is bookable for a room type when it isn't closed and a unit is
+        free; an entire-place booking takes every room of its property, and
+        the entire place needs the property to be empty.
+        """
+        end = start + timedelta(days=days)
+        room_type_ids = [room_type.pk for room_type in room_types]
+
+        rates = defaultdict(list)
+        for row in RoomRateService.rates(room_type_ids, start, end):
+            rates[(row["room_type_id"], row["room_option_id"])].append(row)
+
+        stays = defaultdict(list)
+        held = BookingItem.objects.filter(
+            room_type_id__in=room_type_ids, booking__status__in=HELD_STATUSES, check_in__lt=end, check_out__gt=start
+        ).values_list("room_type_id", "check_in", "check_out")
+        for room_type_id, check_in, check_out in held:
+            stays[room_type_id].append((check_in, check_out))
+
+        by_property = defaultdict(list)
+        for room_type in room_types:
+            by_property[room_type.property_id].append(room_type)
+
+        for property_room_types in by_property.values():
+            free_units = RoomRateService.free_units(property_room_types, stays, start, days)
+            for room_type in property_room_types:
+                room_prices, room_closed = price_line(rates[(room_type.pk, None)], start, days, room_type.base_price)
+                free = [units > 0 and not is_closed for units, is_closed in zip(free_units[room_type.pk], room_closed)]
+
+                yield room_type, None, [price if is_free else None for price, is_free in zip(room_prices, free)]
+                for option in room_type.options.all():
+                    option_prices, option_closed = price_line(rates[(room_type.pk, option.pk)], start, days, option.base_price)
+                    yield room_type, option, [
+                        price if is_free and not is_closed else None
+                        for price, is_closed, is_free in zip(option_prices, option_closed, free)
+                    ]
+
+    @staticmethod
+    def free_units(room_types, stays, start, days):
+        """
+        {room type id: [free units on each of `days` nights from start]} for
+        all the room types of one property, from {room type id: [(check_in,
+        check_out), ...]} of its held bookings. An entire-place booking takes
+        every room, and the entire place (one unit) needs the property empty.
+        """
+        property_occupied = occupancy_line([stay for room_type in room_types for stay in stays[room_type.pk]], start, days)
+        entire_place_occupied = occupancy_line(
+            [stay for room_type in room_types if room_type.is_entire_place for stay in stays[room_type.pk]], start, days
+        )
+        free = {}
+        for room_type in room_types:
+            if room_type.is_entire_place:
+                free[room_type.pk] = [int(occupied == 0) for occupied in property_occupied]
+            else:
+                occupied = occupancy_line(stays[room_type.pk], start, days)
+                free[room_type.pk] = [
+                    0 if whole else max(room_type.total_units - units, 0)
+                    for units, whole in zip(occupied, entire_place_occupied)
+                ]
+        return free
+
+    @staticmethod
+    def calendar(property_obj, start, days):
+        """Lowest bookable nightly price at the property for each of `days` nights from `start`."""
+        room_types = list(property_obj.room_types.prefetch_related("options"))
+        lowest = [None] * days
+        for _, _, prices in RoomRateService.price_lines(room_types, start, days):
+            lowest = [
+                price if price is not None and (current is None or price < current) else current
+                for current, price in zip(lowest, prices)
+            ]
+
+        results = []
+        for offset, price in enumerate(lowest):
+            day = {"date": start + timedelta(days=offset), "available": price is not None, "price": price, "discounted_price": None}
+            if price is not None:
+                day["discounted_price"] = max(Decimal("0.00"), price - property_obj.discount_for(price))
+            results.append(day)
+        return results
+
+    @staticmethod
+    def cheapest_stays(properties, start, window, nights, guests=None, limit=3):
+        """
+        Flexible-date search: for stays of `nights` nights starting on any of
+        the `window` days from `start`, returns {property id: [stay, ...]} with
+        up to `limit` cheapest start dates per property (one room, after the
+        property discount, before tax). Every product's nightly prices are read
+        once and summed with a sliding window, so the cost doesn't grow with
+        the number of candidate dates.
+        """
+        properties = {property_obj.pk: property_obj for property_obj in properties}
+        # Callers usually have the room types (and options) prefetched already
+        room_types = [room_type for property_obj in properties.values() for room_type in property_obj.room_types.all()]
+
+        # Per property and start date: lowest discounted total (in paise) and the product giving it
+        lowest, chosen, discounted_paise = {}, {}, defaultdict(dict)
+        for room_type, option, prices in RoomRateService.price_lines(room_types, start, window + nights - 1):
+            if guests and room_type.max_guests < guests:
+                continue
+            property_obj = properties[room_type.property_id]
+            # Nights mostly share a handful of prices, so each is discounted once; integer
+            # paise keep the window sums and comparisons cheap
+            cache = discounted_paise[property_obj.pk]
+            distinct = set(prices)
+            for price in distinct:
+                if price is not None and price not in cache:
+                    cache[price] = int(max(Decimal("0.00"), price - property_obj.discount_for(price)) * 100)
+            if len(distinct) == 1 and None not in distinct:
+                # Same price and free every night (no rates, no bookings): every stay costs the same
+                sums = [cache[prices[0]] * nights] * window
+            else:
+                sums = window_sums([None if price is None else cache[price] for price in prices], nights)
+
+            best = lowest.setdefault(property_obj.pk, [None] * window)
+            best_product = chosen.setdefault(property_obj.pk, [None] * window)
+            for offset in [
+                offset for offset, (total, current) in enumerate(zip(sums, best))
+                if total is not None and (current is None or total < current)
+            ]:
+                best[offset] = sums[offset]
+                best_product[offset] = (room_type, option, prices)
+
+        results = {}
+        for property_id, best in lowest.items():
+            offsets = heapq.nsmallest(
+                limit, (offset for offset, total in enumerate(best) if total is not None), key=lambda offset: (best[offset], offset)
+            )
+            if not offsets:
+                continue
+            stays = []
+            for offset in offsets:
+                room_type, option, prices = chosen[property_id][offset]
+                stays.append({
+                    "check_in": start + timedelta(days=offset),
+                    "check_out": start + timedelta(days=offset + nights),
+                    "price": sum(prices[offset:offset + nights]),
+                    "discounted_price": Decimal(best[offset]) / 100,
+                    "room_type_id": room_type.pk,
+                    "room_option_id": option.pk if option else None,
+                })
+            results[property_id] = stays
+        return results
+
+    @staticmethod
+    def units_left(properties, check_in, check_out, guests=None):
+        """
+        Stay-date availability for listings: {property id: rooms left} for the
+        properties of the `properties` queryset that have a held booking or a
+        closed night during the stay; the others have every room free (see
+        rooms_left). 0 means sold out. Runs four queries whatever the number of
+        candidates: which of them are touched (one union query), then room
+        types, held bookings and closures of only those.
+        """
+        nights = stay_nights(check_in, check_out)
+        start, days = nights[0], len(nights)
+        end = start + timedelta(days=days)
+
+        held = BookingItem.objects.filter(
+            room_type__property__in=properties, booking__status__in=HELD_STATUSES, check_in__lt=end, check_out__gt=start
+        ).values_list("room_type__property_id").order_by()
+        closed = RoomRate.objects.filter(
+            room_type__property__in=properties, room_option__isnull=True, is_closed=True, date__gte=start, date__lt=end
+        ).values_list("room_type__property_id").order_by()
+        touched = {property_id for (property_id,) in held.union(closed)}
+        if not touched:
+            return {}
+
+        room_types = list(RoomType.objects.filter(property_id__in=touched))
+        room_type_ids = [room_type.pk for room_type in room_types]
+        stays = defaultdict(list)
+        for room_type_id, stay_in, stay_out in BookingItem.objects.filter(
+            room_type_id__in=room_type_ids, booking__status__in=HELD_STATUSES, check_in__lt=end, check_out__gt=start
+        ).values_list("room_type_id", "check_in", "check_out"):
+            stays[room_type_id].append((stay_in, stay_out))
+        closed_room_types = set(
+            RoomRate.objects.filter(
+                room_type_id__in=room_type_ids, room_option__isnull=True, is_closed=True, date__gte=start, date__lt=end
+            ).values_list("room_type_id", flat=True)
+        )
+
+        by_property = defaultdict(list)
+        for room_type in room_types:
+            by_property[room_type.property_id].append(room_type)
+        left = {}
+        for property_id, property_room_types in by_property.items():
+            free_units = RoomRateService.free_units(property_room_types, stays, start, days)
+            remaining = {
+                room_type.pk: 0 if room_type.pk in closed_room_types else min(free_units[room_type.pk])
+                for room_type in property_room_types
+            }
+            left[property_id] = RoomRateService.rooms_left(property_room_types, guests, remaining)
+        return left
+
+    @staticmethod
+    def rooms_left(room_types, guests=None, remaining=None):
+        """
+        Rooms a property can still sell for the stay: the free units of its
+        room types that fit `guests`, from {room type id: units} (all units when
+        absent). An entire place re-sells the same rooms, so it only counts,
+        as one, when no room is left on its own.
+        """
+        remaining = remaining or {}
+        fitting = [room_type for room_type in room_types if not guests or room_type.max_guests >= guests]
+        rooms = sum(
+            remaining.get(room_type.pk, room_type.total_units) for room_type in fitting if not room_type.is_entire_place
+        )
+        if rooms:
+            return rooms
+        return int(any(remaining.get(room_type.pk, 1) > 0 for room_type in fitting if room_type.is_entire_place))
+
+    @staticmethod
+    def annotate_rooms_left(properties, units_left, guests=None):
+        """Sets rooms_left on each property (a page of results) from units_left(), using their prefetched room types."""
+        for property_obj in properties:
+            if property_obj.pk in units_left:
+                property_obj.rooms_left = units_left[property_obj.pk]
+            else:
+                property_obj.rooms_left = RoomRateService.rooms_left(property_obj.room_types.all(), guests)
+        return properties
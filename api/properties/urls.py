@@ -1,10 +1,13 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import (
     HotelDetailAPIView,
     HotelRoomAvailabilityAPIView,
+    HotelCalendarAPIView,
 )
 
 urlpatterns = [
-    path("<int:pk>/", HotelDetailAPIView.as_view(), name="hotel-detail"),
-    path("<int:pk>/rooms/", HotelRoomAvailabilityAPIView.as_view(), name="hotel-rooms"),
+    path("<int:pk>/", read_view(HotelDetailAPIView), name="hotel-detail"),
+    path("<int:pk>/rooms/", read_view(HotelRoomAvailabilityAPIView), name="hotel-rooms"),
+    path("<int:pk>/calendar/", read_view(HotelCalendarAPIView), name="hotel-calendar"),
 ]
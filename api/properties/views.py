@@ -1,7 +1,9 @@
-from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.generics import ListAPIView, RetrieveAPIView, get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+from django.utils import timezone
 from django.utils.dateparse import parse_date
 
 from django.db.models import Min, Prefetch, Q
@@ -12,7 +14,10 @@ from .serializers import (
     HomestayDetailSerializer,
     HomestayRoomAvailabilitySerializer,
     FamousPlaceSerializer,
+    CalendarQuerySerializer,
+    CalendarDaySerializer,
 )
+from .services import RoomRateService
 
 
 class HotelDetailAPIView(RetrieveAPIView):
@@ -240,3 +245,34 @@ class HomestayRoomAvailabilityAPIView(ListAPIView):
             }
         )
         return Response(serializer.data)
+
+
+class PropertyCalendarAPIView(APIView):
+    """
+    Lowest bookable nightly price (before tax) for each of the next `days`
+    nights from `start` (default today), for the date picker. Nights with no
+    free, open room come back with available=false and no price.
+    """
+    permission_classes = [AllowAny]
+    property_types = ()
+
+    def get(self, request, pk):
+        params = CalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        property_obj = get_object_or_404(
+            Property.objects.select_related("discount"), pk=pk, is_active=True, property_type__in=self.property_types
+        )
+        start = params.validated_data.get("start") or timezone.localdate()
+        days = RoomRateService.calendar(property_obj, start, params.validated_data["days"])
+        return Response({
+            "property_id": property_obj.pk,
+            "results": CalendarDaySerializer(days, many=True).data,
+        })
+
+
+class HotelCalendarAPIView(PropertyCalendarAPIView):
+    property_types = ("hotel", "resort")
+
+
+class HomestayCalendarAPIView(PropertyCalendarAPIView):
+    property_types = ("homestay", "villa")
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from apps.reports.models import DailyRollup
+
+
+class DailyRollupQuerySerializer(serializers.Serializer):
+    """Query parameters of the daily rollup report."""
+    dimension = serializers.ChoiceField(choices=DailyRollup.DIMENSION_CHOICES)
+    object_id = serializers.CharField(required=False, help_text="Comma-separated object ids")
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    # Keeps a single request to roughly a year of rows per object
+    MAX_DAYS = 366
+
+    def validate_object_id(self, value):
+        try:
+            return [int(pk) for pk in value.split(",") if pk.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Expected comma-separated integers.")
+
+    def validate(self, attrs):
+        span = (attrs["date_to"] - attrs["date_from"]).days
+        if span < 0:
+            raise serializers.ValidationError({"date_to": "date_to must not be before date_from."})
+        if span >= self.MAX_DAYS:
+            raise serializers.ValidationError({"date_to": f"At most {self.MAX_DAYS} days per request."})
+        return attrs
+
+
+class DailyRollupSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    object_id = serializers.IntegerField()
+    bookings = serializers.IntegerField()
+    units = serializers.IntegerField()
+    room_nights = serializers.IntegerField()
+    units_available = serializers.IntegerField(allow_null=True)
+    occupancy = serializers.FloatField(allow_null=True)
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    taxes = serializers.DecimalField(max_digits=14, decimal_places=2)
+    coupon_discount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    cancellations = serializers.IntegerField()
+    cancelled_revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -0,0 +1,271 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.properties.models import RoomType
+from apps.reports.models import BookingRollupState, DailyRollup
+
+# Bookings whose sales count in the rollups
+COUNTED_STATUSES = ("confirmed", "completed")
+TRACKED_STATUSES = COUNTED_STATUSES + ("cancelled",)
+
+COUNT_METRICS = ("bookings", "units", "room_nights", "cancellations")
+AMOUNT_METRICS = ("revenue", "taxes", "coupon_discount", "cancelled_revenue")
+
+# BookingItem foreign key -> rollup dimension
+ITEM_DIMENSIONS = (
+    ("property_id", DailyRollup.PROPERTY),
+    ("room_type_id", DailyRollup.ROOM_TYPE),
+    ("houseboat_id", DailyRollup.HOUSEBOAT),
+    ("package_id", DailyRollup.PACKAGE),
+    ("activity_id", DailyRollup.ACTIVITY),
+    ("cab_id", DailyRollup.CAB),
+)
+ITEM_FIELDS = ("id", "booking_id", "check_in", "check_out", *(field for field, _ in ITEM_DIMENSIONS))
+BOOKING_FIELDS = ("id", "status", "created_at", "cancelled_at", "updated_at", "total_amount", "pricing_breakdown")
+
+
+def split(amount, weights):
+    """amount in shares proportional to `weights`, rounded to paise; the last share absorbs the rounding."""
+    total = sum(weights)
+    if not total:
+        weights, total = [1] * len(weights), len(weights)
+    shares = [(amount * weight / total).quantize(Decimal("0.01")) for weight in weights[:-1]]
+    return shares + [amount - sum(shares)]
+
+
+def item_weights(pricing, count):
+    """
+    Per-unit weights for a booking's items (in id order) from the pricing
+    snapshot: each breakdown line covers `quantity` consecutive item rows and
+    its `total` is shared equally between them. Equal weights when the
+    snapshot does not line up with the rows (older bookings, no snapshot).
+    """
+    weights = []
+    for line in pricing.get("breakdown") or []:
+        quantity = line.get("quantity") or 1
+        weights += [Decimal(str(line.get("total") or 0)) / quantity] * quantity
+    return weights if len(weights) == count else [1] * count
+
+
+class RollupService:
+    """
+    Maintains DailyRollup from bookings.
+
+    Each tracked booking has a contribution: the figures it adds to each
+    (day, dimension, object) key. The contribution last applied is kept in
+    BookingRollupState; refresh() recomputes it and applies only the
+    difference, so it is cheap, idempotent and safe to run on every status
+    change. rebuild() recomputes everything from the booking tables.
+
+    Booking amounts come from the pricing snapshot and are split over the
+    booking's items (each item row is one booked unit) in proportion to the
+    snapshot's per-line totals.
+    """
+
+    @staticmethod
+    def contribution(booking, items):
+        """{(date, dimension, object_id): {metric: value}} for one booking and its item dicts."""
+        totals = defaultdict(lambda: defaultdict(int))
+        if booking.status not in TRACKED_STATUSES or not items:
+            return totals
+
+        pricing = booking.pricing_breakdown or {}
+        revenue = Decimal(str(pricing.get("final_total") or booking.total_amount or 0))
+        weights = item_weights(pricing, len(items))
+        shares = {
+            "revenue": split(revenue, weights),
+            "taxes": split(Decimal(str(pricing.get("taxes") or 0)), weights),
+            "coupon_discount": split(Decimal(str(pricing.get("coupon_discount") or 0)), weights),
+        }
+
+        if booking.status == "cancelled":
+            day = timezone.localdate(booking.cancelled_at or booking.updated_at)
+            for index, item in enumerate(items):
+                for key in RollupService.item_keys(item):
+                    totals[(day, *key)]["cancelled_revenue"] += shares["revenue"][index]
+            for key in {key for item in items for key in RollupService.item_keys(item)}:
+                totals[(day, *key)]["cancellations"] += 1
+            return totals
+
+        day = timezone.localdate(booking.created_at)
+        for index, item in enumerate(items):
+            keys = RollupService.item_keys(item)
+            for key in keys:
+                entry = totals[(day, *key)]
+                entry["units"] += 1
+                for metric, values in shares.items():
+                    entry[metric] += values[index]
+            if item["check_in"] and item["check_out"]:
+                night = item["check_in"]
+                while night < item["check_out"]:
+                    for key in keys:
+                        totals[(night, *key)]["room_nights"] += 1
+                    night += timedelta(days=1)
+        for key in {key for item in items for key in RollupService.item_keys(item)}:
+            totals[(day, *key)]["bookings"] += 1
+        return totals
+
+    @staticmethod
+    def item_keys(item):
+        return [(dimension, item[field]) for field, dimension in ITEM_DIMENSIONS if item[field]]
+
+    @staticmethod
+    def encode(totals):
+        return [
+            [day.isoformat(), dimension, object_id, {metric: str(value) for metric, value in metrics.items() if value}]
+            for (day, dimension, object_id), metrics in sorted(totals.items())
+        ]
+
+    @staticmethod
+    def decode(entries):
+        totals = defaultdict(lambda: defaultdict(int))
+        for day, dimension, object_id, metrics in entries or []:
+            for metric, value in metrics.items():
+                totals[(date.fromisoformat(day), dimension, object_id)][metric] = (
+                    int(value) if metric in COUNT_METRICS else Decimal(value)
+                )
+        return totals
+
+    @staticmethod
+    def refresh(booking_id):
+        """Brings the rollups in line with the booking's current state."""
+        with transaction.atomic():
+            booking = Booking.objects.filter(pk=booking_id).only(*BOOKING_FIELDS).first()
+            if booking is None:
+                return
+            state, _ = BookingRollupState.objects.get_or_create(booking_id=booking_id)
+            # Serializes refreshes of the same booking
+            state = BookingRollupState.objects.select_for_update().get(pk=state.pk)
+
+            items = list(booking.items.order_by("id").values(*ITEM_FIELDS))
+            current = RollupService.contribution(booking, items)
+            previous = RollupService.decode(state.contribution)
+
+            delta = defaultdict(dict)
+            for key in set(current) | set(previous):
+                for metric in set(current.get(key, {})) | set(previous.get(key, {})):
+                    change = current.get(key, {}).get(metric, 0) - previous.get(key, {}).get(metric, 0)
+                    if change:
+                        delta[key][metric] = change
+            if delta:
+                RollupService.apply(delta)
+            state.contribution = RollupService.encode(current)
+            state.save(update_fields=["contribution", "updated_at"])
+
+    @staticmethod
+    def apply(delta):
+        """Adds {(date, dimension, object_id): {metric: change}} to the rollup rows, creating missing ones."""
+        keys = list(delta)
+        match = Q()
+        for day, dimension, object_id in keys:
+            match |= Q(date=day, dimension=dimension, object_id=object_id)
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(date=day, dimension=dimension, object_id=object_id) for day, dimension, object_id in keys],
+            ignore_conflicts=True,
+        )
+        rows = list(DailyRollup.objects.select_for_update().filter(match))
+        capacity = RollupService.capacity(rows)
+        for row in rows:
+            for metric, change in delta[(row.date, row.dimension, row.object_id)].items():
+                setattr(row, metric, getattr(row, metric) + change)
+            row.units_available = capacity.get((row.dimension, row.object_id), row.units_available)
+        DailyRollup.objects.bulk_update(rows, [*COUNT_METRICS, *AMOUNT_METRICS, "units_available", "updated_at"])
+
+    @staticmethod
+    def capacity(rows):
+        """{(dimension, object_id): sellable units} for the room types and properties among rows."""
+        room_type_ids = {row.object_id for row in rows if row.dimension == DailyRollup.ROOM_TYPE}
+        property_ids = {row.object_id for row in rows if row.dimension == DailyRollup.PROPERTY}
+        capacity = {}
+        if room_type_ids:
+            for pk, units in RoomType.objects.filter(pk__in=room_type_ids).values_list("pk", "total_units"):
+                capacity[(DailyRollup.ROOM_TYPE, pk)] = units
+        if property_ids:
+            # Entire-place room types re-sell the same rooms, so they add no capacity
+            per_property = (
+                RoomType.objects.filter(property_id__in=property_ids, is_entire_place=False)
+                .values("property_id").annotate(units=Sum("total_units"))
+            )
+            for row in per_property:
+                capacity[(DailyRollup.PROPERTY, row["property_id"])] = row["units"]
+        return capacity
+
+    @staticmethod
+    def rebuild(chunk_size=2000, report=None):
+        """
+        Recomputes every rollup and contribution from the booking tables in one
+        transaction. Returns (bookings read, rollup rows written).
+        """
+        with transaction.atomic():
+            DailyRollup.objects.all().delete()
+            BookingRollupState.objects.all().delete()
+
+            totals = defaultdict(lambda: defaultdict(int))
+            bookings = Booking.objects.filter(status__in=TRACKED_STATUSES).only(*BOOKING_FIELDS).order_by("pk")
+            states, count = [], 0
+            for chunk in RollupService.chunks(bookings, chunk_size):
+                items = defaultdict(list)
+                rows = chunk[0].items.model.objects.filter(booking_id__in=[b.pk for b in chunk]).order_by("id")
+                for item in rows.values(*ITEM_FIELDS):
+                    items[item["booking_id"]].append(item)
+                for booking in chunk:
+                    contribution = RollupService.contribution(booking, items[booking.pk])
+                    for key, metrics in contribution.items():
+                        for metric, value in metrics.items():
+                            totals[key][metric] += value
+                    states.append(BookingRollupState(booking=booking, contribution=RollupService.encode(contribution)))
+                BookingRollupState.objects.bulk_create(states, batch_size=chunk_size)
+                count += len(chunk)
+                states = []
+                if report:
+                    report(count)
+
+            rollups = [
+                DailyRollup(date=day, dimension=dimension, object_id=object_id, **metrics)
+                for (day, dimension, object_id), metrics in totals.items()
+            ]
+            capacity = RollupService.capacity(rollups)
+            for rollup in rollups:
+                rollup.units_available = capacity.get((rollup.dimension, rollup.object_id))
+            DailyRollup.objects.bulk_create(rollups, batch_size=chunk_size)
+        return count, len(rollups)
+
+    @staticmethod
+    def chunks(queryset, size):
+        chunk = []
+        for obj in queryset.iterator(chunk_size=size):
+            chunk.append(obj)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def report(dimension, object_ids=None, date_from=None, date_to=None):
+        """
+        Rollup rows for a dimension between two dates (inclusive), oldest first,
+        with occupancy added, plus totals over the range.
+        """
+        rows = DailyRollup.objects.filter(dimension=dimension)
+        if object_ids:
+            rows = rows.filter(object_id__in=object_ids)
+        if date_from:
+            rows = rows.filter(date__gte=date_from)
+        if date_to:
+            rows = rows.filter(date__lte=date_to)
+        fields = ("date", "object_id", *COUNT_METRICS, "units_available", *AMOUNT_METRICS)
+        days = []
+        for row in rows.order_by("date", "object_id").values(*fields):
+            available = row["units_available"]
+            row["occupancy"] = round(row["room_nights"] / available, 4) if available else None
+            days.append(row)
+        summary = rows.aggregate(**{metric: Sum(metric) for metric in (*COUNT_METRICS, *AMOUNT_METRICS)})
+        summary = {metric: value or 0 for metric, value in summary.items()}
+        return days, summary
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import DailyRollupAPIView
+
+urlpatterns = [
+    path("daily/", DailyRollupAPIView.as_view(), name="reports-daily"),
+]
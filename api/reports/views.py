@@ -0,0 +1,33 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .serializers import DailyRollupQuerySerializer, DailyRollupSerializer
+from .services import RollupService
+
+
+class DailyRollupAPIView(APIView):
+    """
+    Daily bookings, room-nights, revenue, taxes, coupon discounts,
+    cancellations and occupancy for one dimension (property, room_type,
+    houseboat, package, activity or cab) between date_from and date_to,
+    optionally limited to object_id (comma-separated). Reads the precomputed
+    rollups, so the cost depends on the range asked for, not on booking volume.
+    Staff only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        params = DailyRollupQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        days, totals = RollupService.report(
+            data["dimension"], data.get("object_id"), data["date_from"], data["date_to"]
+        )
+        return Response({
+            "dimension": data["dimension"],
+            "date_from": data["date_from"],
+            "date_to": data["date_to"],
+            "totals": totals,
+            "results": DailyRollupSerializer(days, many=True).data,
+        })
@@ -1,6 +1,7 @@
 from django.urls import path
+from api.async_views import read_view
 from .views import FAQListAPIView
 
 urlpatterns = [
-    path("faqs/", FAQListAPIView.as_view(), name="faq-list"),
+    path("faqs/", read_view(FAQListAPIView), name="faq-list"),
 ]
@@ -16,5 +16,8 @@ urlpatterns = [
     path("support/", include("api.support.urls")),
     path("dining/", include("api.dining.urls")),
     path("travellers/", include("api.travellers.urls")),
+    path("wallet/", include("api.wallet.urls")),
+    path("invoices/", include("api.invoices.urls")),
+    path("reports/", include("api.reports.urls")),
 ]
 
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from apps.wallet.models import WalletTransaction
+
+
+class WalletTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WalletTransaction
+        fields = ["id", "transaction_type", "amount", "balance_after", "reference", "description", "created_at"]
+
+
+class StatementQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start_date") and attrs.get("end_date") and attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError("start_date must be on or before end_date.")
+        return attrs
@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Max, Q, Sum
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.wallet.models import Wallet, WalletTransaction, WalletBalanceSnapshot
+
+
+class WalletService:
+    """
+    Ledger service for user wallets.
+
+    Every movement is an append-only WalletTransaction written in the same
+    database transaction as a single conditional UPDATE of Wallet.balance, so
+    concurrent debits can never overdraw a wallet and the ledger always adds
+    up to the balance. Each entry records balance_after, and
+    WalletBalanceSnapshot rows let reconciliation start from the latest
+    snapshot instead of the first entry.
+    """
+
+    @staticmethod
+    def get_wallet(user):
+        wallet, _ = Wallet.objects.get_or_create(user=user)
+        return wallet
+
+    @staticmethod
+    def credit(user, amount, reference="", description=""):
+        return WalletService.post(user, WalletTransaction.CREDIT, amount, reference, description)
+
+    @staticmethod
+    def debit(user, amount, reference="", description=""):
+        return WalletService.post(user, WalletTransaction.DEBIT, amount, reference, description)
+
+    @staticmethod
+    def post(user, transaction_type, amount, reference="", description=""):
+        """
+        Moves the balance and appends the ledger entry atomically.
+        Raises ValidationError when a debit exceeds the available balance.
+        """
+        amount = Decimal(amount)
+        if amount <= 0:
+            raise ValueError("Wallet amounts must be positive.")
+
+        wallet = WalletService.get_wallet(user)
+        wallets = Wallet.objects.filter(pk=wallet.pk)
+        with transaction.atomic():
+            if transaction_type == WalletTransaction.DEBIT:
+                # UPDATE ... SET balance = balance - x WHERE balance >= x
+                moved = wallets.filter(balance__gte=amount).update(
+                    balance=F("balance") - amount, updated_at=timezone.now()
+                )
+                if not moved:
+                    raise serializers.ValidationError({"wallet": "Insufficient wallet balance."})
+            else:
+                wallets.update(balance=F("balance") + amount, updated_at=timezone.now())
+
+            # The UPDATE holds the row lock until commit, so this reads our own result
+            balance = wallets.values_list("balance", flat=True).get()
+            return WalletTransaction.objects.create(
+                wallet=wallet,
+                transaction_type=transaction_type,
+                amount=amount,
+                balance_after=balance,
+                reference=reference,
+                description=description,
+            )
+
+    @staticmethod
+    def balance_before(wallet, moment):
+        """Balance just before `moment`, read from the last ledger entry before it."""
+        balance = (
+            wallet.transactions.filter(created_at__lt=moment)
+            .order_by("-created_at", "-id")
+            .values_list("balance_after", flat=True)
+            .first()
+        )
+        return balance if balance is not None else Decimal(0)
+
+    @staticmethod
+    def reconcile(wallet_id):
+        """
+        Replays the ledger from the latest snapshot and compares it with the
+        wallet balance. Locks the wallet row so no posting lands in between.
+        Returns a dict with the expected and actual balance and new-entry totals.
+        """
+        with transaction.atomic():
+            wallet = Wallet.objects.select_for_update().get(pk=wallet_id)
+            snapshot = wallet.snapshots.order_by("-last_transaction_id").first()
+            opening = snapshot.balance if snapshot else Decimal(0)
+            after_id = snapshot.last_transaction_id if snapshot else 0
+
+            totals = wallet.transactions.filter(id__gt=after_id).aggregate(
+                credits=Sum("amount", filter=Q(transaction_type=WalletTransaction.CREDIT)),
+                debits=Sum("amount", filter=Q(transaction_type=WalletTransaction.DEBIT)),
+                last_id=Max("id"),
+            )
+            credits = totals["credits"] or Decimal(0)
+            debits = totals["debits"] or Decimal(0)
+            expected = opening + credits - debits
+            return {
+                "wallet": wallet,
+                "expected": expected,
+                "balance": wallet.balance,
+                "ok": expected == wallet.balance,
+                "credits": credits,
+                "debits": debits,
+                "last_transaction_id": totals["last_id"],
+            }
+
+    @staticmethod
+    def take_snapshot(wallet_id):
+        """
+        Reconciles the wallet and, if it balances and has new entries, records a
+        snapshot at its last entry. Returns the reconcile() result.
+        """
+        with transaction.atomic():
+            result = WalletService.reconcile(wallet_id)
+            if result["ok"] and result["last_transaction_id"]:
+                WalletBalanceSnapshot.objects.create(
+                    wallet=result["wallet"],
+                    last_transaction_id=result["last_transaction_id"],
+                    balance=result["expected"],
+                    credits_total=result["credits"],
+                    debits_total=result["debits"],
+                )
+            return result
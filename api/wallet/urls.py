@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import WalletStatementAPIView
+
+urlpatterns = [
+    path("statement/", WalletStatementAPIView.as_view(), name="wallet-statement"),
+]
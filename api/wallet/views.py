@@ -0,0 +1,65 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .serializers import WalletTransactionSerializer, StatementQuerySerializer
+from .services import WalletService
+
+
+class StatementPagination(CursorPagination):
+    # Keyset pagination: deep pages cost the same as the first
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def get_paginated_response(self, data, extra_data=None):
+        return Response({
+            **(extra_data or {}),
+            "results": data,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        })
+
+
+class WalletStatementAPIView(ListAPIView):
+    """
+    Paginated wallet statement for the authenticated user, newest first.
+    Optional start_date / end_date (YYYY-MM-DD) limit the period; opening and
+    closing balances come from the ledger's running balance_after.
+    """
+    serializer_class = WalletTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = StatementPagination
+
+    def list(self, request, *args, **kwargs):
+        query = StatementQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start_date = query.validated_data.get("start_date")
+        end_date = query.validated_data.get("end_date")
+
+        wallet = WalletService.get_wallet(request.user)
+        queryset = wallet.transactions.all()
+        start = end = None
+        if start_date:
+            start = timezone.make_aware(datetime.combine(start_date, time.min))
+            queryset = queryset.filter(created_at__gte=start)
+        if end_date:
+            end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+            queryset = queryset.filter(created_at__lt=end)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data, {
+            "balance": wallet.balance,
+            "opening_balance": WalletService.balance_before(wallet, start) if start else Decimal(0),
+            "closing_balance": WalletService.balance_before(wallet, end) if end else wallet.balance,
+        })
+
+    def get_paginated_response(self, data, extra_data=None):
+        return self.paginator.get_paginated_response(data, extra_data)
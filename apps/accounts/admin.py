@@ -1,24 +1,28 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, OTPCode
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(PerformanceModelAdmin, BaseUserAdmin):
     list_display = ('username', 'email', 'phone', 'first_name', 'last_name', 'is_phone_verified', 'is_staff', 'is_active', 'date_joined')
-    list_filter = ('is_staff', 'is_active', 'is_superuser', 'is_phone_verified', 'date_joined', 'otp_created_at')
-    search_fields = ('username', 'email', 'phone', 'first_name', 'last_name', 'otp_token')
+    list_filter = ('is_staff', 'is_active', 'is_superuser', 'is_phone_verified', 'date_joined')
+    search_fields = ('username', 'email', 'phone', 'first_name', 'last_name')
     ordering = ('-date_joined',)
-    readonly_fields = ('otp_token', 'otp_created_at', 'date_joined', 'last_login')
+    readonly_fields = ('date_joined', 'last_login')
     
     fieldsets = BaseUserAdmin.fieldsets + (
-        ('Additional Info', {'fields': ('phone',)}),
-        ('OTP Verification', {
-            'fields': ('otp_token', 'otp_created_at', 'is_phone_verified'),
-            'classes': ('collapse',)
-        }),
+        ('Additional Info', {'fields': ('phone', 'is_phone_verified')}),
     )
     
     add_fieldsets = BaseUserAdmin.add_fieldsets + (
         ('Additional Info', {'fields': ('phone',)}),
     )
+
+
+@admin.register(OTPCode)
+class OTPCodeAdmin(PerformanceModelAdmin):
+    list_display = ('phone', 'attempts', 'expires_at', 'created_at')
+    search_fields = ('phone',)
+    readonly_fields = ('phone', 'code_hash', 'attempts', 'expires_at', 'created_at', 'updated_at')
@@ -0,0 +1,77 @@
+"""
+JWT authentication with a cached user lookup.
+
+simplejwt's JWTAuthentication loads the User row on every authenticated
+request. CachedJWTAuthentication resolves the user id from the validated token
+and serves the record from a two-tier cache: a tiny per-process dict
+(AUTH_USER_CACHE_LOCAL_TTL) in front of the shared Django cache
+(AUTH_USER_CACHE_TTL). Both tiers are cleared when the User is saved or deleted
+(see apps/accounts/signals.py); other processes drop their local copy when the
+short local TTL runs out.
+"""
+import copy
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# user_id -> (expires_at, user), per process
+_local_users = {}
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
+
+def _cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    _local_users.pop(str(user_id), None)
+    cache.delete(_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that avoids a User query per request."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = self.get_cached_user(user_id)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+    def get_cached_user(self, user_id):
+        key = str(user_id)
+        now = time.monotonic()
+
+        entry = _local_users.get(key)
+        if entry is not None and entry[0] > now:
+            # Views may modify request.user, so never hand out the shared instance
+            return copy.copy(entry[1])
+
+        user = cache.get(_cache_key(user_id))
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            cache.set(_cache_key(user_id), user, settings.AUTH_USER_CACHE_TTL)
+
+        if len(_local_users) >= LOCAL_CACHE_MAX_ENTRIES:
+            _local_users.clear()
+        _local_users[key] = (now + settings.AUTH_USER_CACHE_LOCAL_TTL, user)
+        return copy.copy(user)
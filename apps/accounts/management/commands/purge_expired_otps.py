@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from api.auth.services import OTPService
+
+class Command(BaseCommand):
+    help = 'Delete expired OTP codes'
+
+    def handle(self, *args, **kwargs):
+        deleted = OTPService.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTP codes'))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_is_phone_verified_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OTPCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('phone', models.CharField(help_text='Phone number the OTP was sent to', max_length=15, unique=True)),
+                ('code_hash', models.CharField(help_text='HMAC-SHA256 of the OTP; the code itself is never stored', max_length=64)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Wrong codes entered for this OTP')),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='When the OTP stops being accepted')),
+            ],
+            options={
+                'verbose_name': 'OTP Code',
+                'verbose_name_plural': 'OTP Codes',
+            },
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_created_at',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_token',
+        ),
+    ]
@@ -1,10 +1,28 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from apps.common.models import TimeStampedModel
+
 
 class User(AbstractUser):
     phone = models.CharField(max_length=15, unique=True, help_text="User's unique phone number")
 
-    otp_token = models.CharField(max_length=10, null=True, blank=True, help_text="One Time Password token for verification")
-    otp_created_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp when the OTP was created")
     is_phone_verified = models.BooleanField(default=False, help_text="Designates whether the user's phone number is verified")
+
+
+class OTPCode(TimeStampedModel):
+    """
+    The pending login/registration OTP for a phone number, kept off the User
+    row so OTP requests and verification never lock accounts_user.
+    """
+    phone = models.CharField(max_length=15, unique=True, help_text="Phone number the OTP was sent to")
+    code_hash = models.CharField(max_length=64, help_text="HMAC-SHA256 of the OTP; the code itself is never stored")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Wrong codes entered for this OTP")
+    expires_at = models.DateTimeField(db_index=True, help_text="When the OTP stops being accepted")
+
+    class Meta:
+        verbose_name = "OTP Code"
+        verbose_name_plural = "OTP Codes"
+
+    def __str__(self):
+        return f"OTP for {self.phone}"
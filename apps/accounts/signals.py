@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Drops the cached copy used by CachedJWTAuthentication so the next request
+    sees the saved (or deleted) user.
+    """
+    invalidate_cached_user(instance.pk)
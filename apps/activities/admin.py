@@ -1,27 +1,18 @@
 from django.contrib import admin
-from django.utils.html import format_html
 from .models import (
     Activity, ActivityImage, ActivityFeature, ActivityHighlight,
     ActivityItinerary, ActivityPolicy, ActivityInclusion, ActivityType
 )
+from apps.common.admin_mixins import ImagePreviewMixin, PerformanceModelAdmin
 
 @admin.register(ActivityType)
-class ActivityTypeAdmin(admin.ModelAdmin):
+class ActivityTypeAdmin(PerformanceModelAdmin):
     list_display = ("name",)
     search_fields = ("name",)
 
-class ActivityImageInline(admin.TabularInline):
+class ActivityImageInline(ImagePreviewMixin, admin.TabularInline):
     model = ActivityImage
     extra = 1
-    readonly_fields = ("image_preview",)
-
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
 class ActivityFeatureInline(admin.TabularInline):
     model = ActivityFeature
@@ -45,7 +36,7 @@ class ActivityPolicyInline(admin.StackedInline):
     verbose_name_plural = "Activity Policies"
 
 @admin.register(Activity)
-class ActivityAdmin(admin.ModelAdmin):
+class ActivityAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = ("title", "location", "duration_days", "difficulty", "base_price", "is_active", "created_at")
     list_filter = ("is_active", "difficulty", "duration_days", "location", "types")
@@ -82,7 +73,7 @@ class ActivityAdmin(admin.ModelAdmin):
     )
 
 @admin.register(ActivityItinerary)
-class ActivityItineraryAdmin(admin.ModelAdmin):
+class ActivityItineraryAdmin(PerformanceModelAdmin):
     list_display = ("activity", "day_number", "title")
     list_filter = ("day_number", "activity__location")
     search_fields = ("title", "description", "activity__title")
@@ -1,8 +1,9 @@
 from django.contrib import admin
 from .models import Booking, BookingItem, BookingTraveller
+from apps.common.admin_mixins import AutocompleteMixin, PerformanceModelAdmin
 
 
-class BookingItemInline(admin.TabularInline):
+class BookingItemInline(AutocompleteMixin, admin.TabularInline):
     model = BookingItem
     extra = 0
     fields = ('property', 'room_type', 'package', 'activity', 'cab', 'check_in', 'check_out', 'adults', 'children')
@@ -16,19 +17,19 @@ class BookingTravellerInline(admin.TabularInline):
 
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'booking_type', 'status', 'total_amount', 'amount_paid', 'created_at')
+class BookingAdmin(PerformanceModelAdmin):
+    list_display = ('id', 'reference', 'user', 'booking_type', 'status', 'total_amount', 'amount_paid', 'created_at')
     list_filter = ('booking_type', 'status', 'created_at', 'updated_at')
-    search_fields = ('id', 'user__username', 'user__email', 'user__phone')
+    search_fields = ('id', 'reference', 'user__username', 'user__email', 'user__phone')
     raw_id_fields = ('user',)
     inlines = [BookingItemInline, BookingTravellerInline]
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('reference', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Booking Information', {
-            'fields': ('user', 'booking_type', 'status')
+            'fields': ('reference', 'user', 'booking_type', 'status')
         }),
         ('Payment Information', {
             'fields': ('total_amount', 'amount_paid')
@@ -41,7 +42,7 @@ class BookingAdmin(admin.ModelAdmin):
 
 
 @admin.register(BookingItem)
-class BookingItemAdmin(admin.ModelAdmin):
+class BookingItemAdmin(PerformanceModelAdmin):
     list_display = ('id', 'booking', 'property', 'room_type', 'package', 'activity', 'cab', 'check_in', 'check_out', 'adults', 'children')
     list_filter = ('check_in', 'check_out', 'adults', 'children', 'created_at')
     search_fields = ('booking__id', 'property__name', 'package__title', 'activity__title')
@@ -51,7 +52,7 @@ class BookingItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(BookingTraveller)
-class BookingTravellerAdmin(admin.ModelAdmin):
+class BookingTravellerAdmin(PerformanceModelAdmin):
     list_display = ('booking', 'traveller', 'is_primary')
     list_filter = ('is_primary',)
     search_fields = ('booking__id', 'traveller__first_name', 'traveller__last_name', 'traveller__email')
@@ -5,3 +5,6 @@ class BookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bookings'
 
+
+    def ready(self):
+        import apps.bookings.signals
@@ -0,0 +1,40 @@
+"""
+Background side effects of booking writes, enqueued by the booking serializers
+once their transaction commits and run by manage.py run_jobs.
+"""
+import logging
+
+from apps.bookings.models import Booking
+from apps.jobs.queue import job
+
+logger = logging.getLogger(__name__)
+
+
+def load_booking(booking_id):
+    # The booking can be gone by the time a delayed retry runs
+    return Booking.objects.filter(pk=booking_id).only(
+        "id", "user_id", "booking_type", "status", "total_amount", "amount_paid", "coupon_id"
+    ).first()
+
+
+@job("bookings.created")
+def booking_created(booking_id):
+    booking = load_booking(booking_id)
+    if booking is None:
+        return
+    logger.info(
+        "booking.created id=%s user=%s type=%s status=%s total=%s",
+        booking.id, booking.user_id, booking.booking_type, booking.status, booking.total_amount,
+    )
+
+
+@job("bookings.confirmed")
+def booking_confirmed(booking_id):
+    booking = load_booking(booking_id)
+    if booking is None:
+        return
+    logger.info(
+        "booking.confirmed id=%s user=%s type=%s total=%s paid=%s coupon=%s",
+        booking.id, booking.user_id, booking.booking_type, booking.total_amount,
+        booking.amount_paid, booking.coupon_id,
+    )
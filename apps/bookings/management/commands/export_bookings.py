@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from api.bookings.serializers import BookingExportQuerySerializer
+from api.bookings.services import BookingExportService
+
+
+class Command(BaseCommand):
+    help = 'Export bookings or booking items as CSV or JSON lines (same filters as /api/bookings/export/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=BookingExportService.KINDS, default='bookings', help='One row per booking or per booking item')
+        parser.add_argument('--format', choices=BookingExportService.FORMATS, default='csv', help='Output format')
+        parser.add_argument('--from', dest='date_from', help='First created date, YYYY-MM-DD')
+        parser.add_argument('--to', dest='date_to', help='Last created date, YYYY-MM-DD (inclusive)')
+        parser.add_argument('--type', dest='booking_type', help='Booking type')
+        parser.add_argument('--status', help='Comma-separated booking statuses')
+        parser.add_argument('--property', type=int, help='Only bookings with an item at this property id')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per round trip')
+
+    def handle(self, *args, **options):
+        query = {
+            key: options[key] for key in ('kind', 'date_from', 'date_to', 'booking_type', 'status', 'property')
+            if options[key] is not None
+        }
+        query['output'] = options['format']
+        params = BookingExportQuerySerializer(data=query)
+        if not params.is_valid():
+            raise CommandError('; '.join(f"{field}: {' '.join(errors)}" for field, errors in params.errors.items()))
+
+        kind = params.validated_data['kind']
+        queryset = BookingExportService.queryset(kind, **params.filters())
+        out = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        count = 0
+        try:
+            for line in BookingExportService.stream(kind, options['format'], queryset, options['chunk_size']):
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        rows = count - 1 if options['format'] == 'csv' else count
+        (self.stdout if options['output'] else self.stderr).write(self.style.SUCCESS(f'Exported {rows} rows'))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from api.bookings.services import IdempotencyService
+
+class Command(BaseCommand):
+    help = 'Delete expired booking Idempotency-Key records'
+
+    def handle(self, *args, **kwargs):
+        deleted = IdempotencyService.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_booking_part_payment_amount_booking_payment_option_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='pricing_version',
+            field=models.CharField(blank=True, help_text='Hash of the pricing inputs and catalog stamps the pricing snapshot was computed from', max_length=64),
+        ),
+    ]
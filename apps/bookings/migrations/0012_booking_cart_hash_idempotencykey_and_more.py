@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookings', '0011_booking_pricing_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='cart_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='Hash of the normalized cart (user, type, items, dates, coupon) a draft was created from', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('key', models.CharField(help_text='Client supplied Idempotency-Key header value', max_length=255)),
+                ('request_hash', models.CharField(help_text='Hash of the endpoint and payload the key was first used with', max_length=64)),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, help_text='HTTP status of the stored response (empty while in progress)', null=True)),
+                ('response_body', models.JSONField(blank=True, help_text='Stored response body', null=True)),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='Time after which the key can be reused')),
+                ('user', models.ForeignKey(help_text='User who sent the request', on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='unique_idempotency_key_per_user'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Crockford's base 32, copied from apps.common.sequences as of this migration
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def encode(value, width=6):
+    digits = ""
+    while value:
+        value, remainder = divmod(value, 32)
+        digits = ALPHABET[remainder] + digits
+    return digits.rjust(width, "0")
+
+
+def assign_references(apps, schema_editor):
+    # Existing bookings get the first references, in booking order
+    Booking = apps.get_model('bookings', 'Booking')
+    Sequence = apps.get_model('common', 'Sequence')
+    value = 1
+    batch = []
+    for booking in Booking.objects.order_by('id').only('id').iterator(chunk_size=1000):
+        booking.reference = f"{settings.BOOKING_REFERENCE_PREFIX}{encode(value)}"
+        batch.append(booking)
+        value += 1
+        if len(batch) == 1000:
+            Booking.objects.bulk_update(batch, ['reference'])
+            batch = []
+    Booking.objects.bulk_update(batch, ['reference'])
+    Sequence.objects.update_or_create(name='booking-reference', defaults={'next_value': value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_booking_cart_hash_idempotencykey_and_more'),
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='reference',
+            field=models.CharField(blank=True, editable=False, help_text='Human-readable booking reference shown to customers, e.g. TB0001F3', max_length=20, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_references, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from apps.common.models import TimeStampedModel
+from apps.common.sequences import SequenceService
 
 
 class Booking(TimeStampedModel):
@@ -27,6 +28,7 @@ class Booking(TimeStampedModel):
     ]
 
     user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, help_text="User who made the booking")
+    reference = models.CharField(max_length=20, unique=True, null=True, blank=True, editable=False, help_text="Human-readable booking reference shown to customers, e.g. TB0001F3")
     coupon = models.ForeignKey(
         "coupons.Coupon", 
         on_delete=models.SET_NULL, 
@@ -46,6 +48,8 @@ class Booking(TimeStampedModel):
     
     # Financial Breakdown
     pricing_breakdown = models.JSONField(default=dict, blank=True, help_text="JSON snapshot of pricing details (base, tax, discount, fees)")
+    pricing_version = models.CharField(max_length=64, blank=True, help_text="Hash of the pricing inputs and catalog stamps the pricing snapshot was computed from")
+    cart_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text="Hash of the normalized cart (user, type, items, dates, coupon) a draft was created from")
 
     # Contact Details
     title = models.CharField(max_length=10, blank=True, help_text="Title of the contact person")
@@ -75,8 +79,17 @@ class Booking(TimeStampedModel):
     payment_option = models.CharField(max_length=10, choices=PAYMENT_OPTION_CHOICES, default="full", help_text="Selected payment option")
     part_payment_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text="Amount to be paid now if part payment is selected")
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.reference:
+            self.reference = SequenceService.booking_reference()
+        super().save(*args, **kwargs)
+
+    @property
+    def display_reference(self):
+        return self.reference or f"#{self.id}"
+
     def __str__(self):
-        return f"Booking #{self.id} - {self.user.username} ({self.booking_type}) - {self.status}"
+        return f"Booking {self.display_reference} - {self.user.username} ({self.booking_type}) - {self.status}"
 
 
 class BookingItem(TimeStampedModel):
@@ -134,3 +147,24 @@ class BookingTraveller(models.Model):
     def __str__(self):
         primary_text = " (Primary)" if self.is_primary else ""
         return f"{self.traveller.first_name} {self.traveller.last_name} - Booking #{self.booking.id}{primary_text}"
+
+
+class IdempotencyKey(TimeStampedModel):
+    """
+    Stores the outcome of a booking write keyed by the client's Idempotency-Key
+    header, so retried requests replay the first response instead of writing again.
+    """
+    user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, related_name="idempotency_keys", help_text="User who sent the request")
+    key = models.CharField(max_length=255, help_text="Client supplied Idempotency-Key header value")
+    request_hash = models.CharField(max_length=64, help_text="Hash of the endpoint and payload the key was first used with")
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True, help_text="HTTP status of the stored response (empty while in progress)")
+    response_body = models.JSONField(null=True, blank=True, help_text="Stored response body")
+    expires_at = models.DateTimeField(db_index=True, help_text="Time after which the key can be reused")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key_per_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.user_id})"
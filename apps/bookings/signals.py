@@ -0,0 +1,24 @@
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+from .models import Booking
+from apps.notifications.services import NotificationService
+
+
+@receiver(pre_save, sender=Booking)
+def detect_cancellation(sender, instance, **kwargs):
+    """
+    Flags a save that moves an existing booking into 'cancelled'. The previous
+    status is only looked up for saves that cancel, so other saves cost nothing.
+    """
+    instance._cancelled_now = False
+    if instance.status == "cancelled" and instance.pk:
+        previous = Booking.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+        instance._cancelled_now = previous is not None and previous != "cancelled"
+
+
+@receiver(post_save, sender=Booking)
+def notify_cancellation(sender, instance, created, **kwargs):
+    """Queues the cancellation SMS/email in the same transaction as the save."""
+    if getattr(instance, "_cancelled_now", False):
+        instance._cancelled_now = False
+        NotificationService.booking_cancelled(instance)
@@ -1,36 +1,27 @@
 from django.contrib import admin
-from django.utils.html import format_html
 from .models import (
     CabCategory, Cab, CabImage, CabInclusion, 
-    CabPolicy, CabPricingOption, CabBooking, CabTransferType
+    CabPolicy, CabPricingOption, CabBooking, CabTransferType, Place, RouteDistance
 )
+from apps.common.admin_mixins import ImagePreviewMixin, PerformanceModelAdmin
 
 
 @admin.register(CabCategory)
-class CabCategoryAdmin(admin.ModelAdmin):
+class CabCategoryAdmin(PerformanceModelAdmin):
     list_display = ("name", "is_active", "created_at")
     list_filter = ("is_active",)
     search_fields = ("name",)
 
 
 @admin.register(CabTransferType)
-class CabTransferTypeAdmin(admin.ModelAdmin):
+class CabTransferTypeAdmin(PerformanceModelAdmin):
     list_display = ("name",)
     search_fields = ("name",)
 
 
-class CabImageInline(admin.TabularInline):
+class CabImageInline(ImagePreviewMixin, admin.TabularInline):
     model = CabImage
     extra = 1
-    readonly_fields = ("image_preview",)
-
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
 
 class CabInclusionInline(admin.TabularInline):
@@ -49,7 +40,7 @@ class CabPricingOptionInline(admin.TabularInline):
 
 
 @admin.register(Cab)
-class CabAdmin(admin.ModelAdmin):
+class CabAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = (
         "title", 
@@ -58,6 +49,7 @@ class CabAdmin(admin.ModelAdmin):
         "fuel_type", 
         "is_ac", 
         "base_price", 
+        "fleet_size",
         "is_active"
     )
     list_filter = ("category", "fuel_type", "is_ac", "is_active", "transfer_types")
@@ -69,10 +61,11 @@ class CabAdmin(admin.ModelAdmin):
         CabPolicyInline, 
         CabPricingOptionInline
     ]
+    prepopulated_fields = {"slug": ("title", "location")}
     
     fieldsets = (
         ("Basic Info", {
-            "fields": ("title", "category", "location", "transfer_types", "capacity", "luggage_capacity", "is_active")
+            "fields": ("title", "slug", "category", "location", "transfer_types", "capacity", "luggage_capacity", "is_active")
         }),
         ("Technical Specs", {
             "fields": ("fuel_type", "is_ac")
@@ -88,6 +81,9 @@ class CabAdmin(admin.ModelAdmin):
                 "free_waiting_time_minutes"
             )
         }),
+        ("Fleet", {
+            "fields": ("fleet_size",)
+        }),
         ("Policies", {
             "fields": ("cancellation_policy",)
         }),
@@ -95,7 +91,7 @@ class CabAdmin(admin.ModelAdmin):
 
 
 @admin.register(CabBooking)
-class CabBookingAdmin(admin.ModelAdmin):
+class CabBookingAdmin(PerformanceModelAdmin):
     list_display = (
         "id", 
         "cab", 
@@ -109,3 +105,24 @@ class CabBookingAdmin(admin.ModelAdmin):
     search_fields = ("pickup_location", "drop_location", "cab__title")
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "pickup_datetime"
+
+
+@admin.register(Place)
+class PlaceAdmin(PerformanceModelAdmin):
+    list_display = ("name", "state", "latitude", "longitude", "is_active")
+    list_filter = ("is_active", "state")
+    search_fields = ("name", "aliases")
+
+
+@admin.register(RouteDistance)
+class RouteDistanceAdmin(PerformanceModelAdmin):
+    list_display = ("origin", "destination", "distance_km", "source", "updated_at")
+    list_filter = ("source",)
+    search_fields = ("origin__name", "destination__name")
+    autocomplete_fields = ("origin", "destination")
+    readonly_fields = ("source",)
+
+    def save_model(self, request, obj, form, change):
+        # A distance entered here overrides the estimate for good
+        obj.source = RouteDistance.MANUAL
+        super().save_model(request, obj, form, change)
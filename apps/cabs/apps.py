@@ -5,3 +5,5 @@ class CabsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cabs'
 
+    def ready(self):
+        import apps.cabs.signals
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cabs', '0005_cabtransfertype_cab_transfer_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Place',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('name', models.CharField(help_text="Place name as customers type it (e.g. 'Kochi Airport')", max_length=255, unique=True)),
+                ('aliases', models.CharField(blank=True, help_text="Other names for the place, comma separated (e.g. 'COK, Nedumbassery')", max_length=500)),
+                ('state', models.CharField(blank=True, help_text='State the place is in', max_length=100)),
+                ('latitude', models.DecimalField(decimal_places=6, help_text='Latitude in decimal degrees', max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, help_text='Longitude in decimal degrees', max_digits=9)),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether the place is used to resolve locations')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RouteDistance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('distance_km', models.DecimalField(decimal_places=1, help_text='One-way road distance in km', max_digits=8)),
+                ('source', models.CharField(choices=[('estimate', 'Estimate'), ('manual', 'Manual')], default='estimate', help_text='Estimated from coordinates or entered by hand', max_length=10)),
+                ('destination', models.ForeignKey(help_text='Place with the higher id', on_delete=django.db.models.deletion.CASCADE, related_name='routes_to', to='cabs.place')),
+                ('origin', models.ForeignKey(help_text='Place with the lower id', on_delete=django.db.models.deletion.CASCADE, related_name='routes_from', to='cabs.place')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='routedistance',
+            constraint=models.UniqueConstraint(fields=('origin', 'destination'), name='unique_route_distance'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cabs', '0006_place_routedistance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cab',
+            name='fleet_size',
+            field=models.PositiveIntegerField(default=1, help_text='Number of vehicles of this cab that can be on trips at the same time'),
+        ),
+    ]
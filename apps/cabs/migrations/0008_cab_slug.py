@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:12
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_slugs(apps, schema_editor):
+    """Gives every existing cab a unique slug from its title and location, in id order."""
+    Cab = apps.get_model("cabs", "Cab")
+    taken = set()
+    for row in Cab.objects.order_by("id").iterator():
+        base = slugify(f"{row.title} {row.location or ''}")[:249].strip("-") or "cab"
+        slug, number = base, 2
+        while slug in taken:
+            slug, number = f"{base}-{number}", number + 1
+        taken.add(slug)
+        Cab.objects.filter(pk=row.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cabs', '0007_cab_fleet_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cab',
+            name='slug',
+            field=models.SlugField(blank=True, default='', help_text='Unique slug for the cab, generated from title and location when left blank', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='cab',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Unique slug for the cab, generated from title and location when left blank', max_length=255, unique=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from apps.common.models import TimeStampedModel
+from apps.common.utils import unique_slug
 
 
 class CabCategory(TimeStampedModel):
@@ -62,6 +63,9 @@ class Cab(TimeStampedModel):
         max_length=255, 
         help_text="e.g. Sedan | Dzire, Etios or Similar"
     )
+    slug = models.SlugField(
+        max_length=255, unique=True, blank=True, help_text="Unique slug for the cab, generated from title and location when left blank"
+    )
     
     # Kept from original model
     location = models.CharField(max_length=255, null=True, blank=True, help_text="Location where the cab is based (e.g. Sulthan Bathery)")
@@ -94,12 +98,18 @@ class Cab(TimeStampedModel):
         max_digits=10, decimal_places=2, null=True, blank=True, help_text="Driver allowance per day"
     )
     free_waiting_time_minutes = models.PositiveIntegerField(default=45, help_text="Free waiting time in minutes")
+    fleet_size = models.PositiveIntegerField(default=1, help_text="Number of vehicles of this cab that can be on trips at the same time")
     
     is_active = models.BooleanField(default=True, help_text="Designates whether the cab is active")
 
     class Meta:
         ordering = ["-created_at"]
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(self, f"{self.title} {self.location or ''}")
+        super().save(*args, **kwargs)
+
     def __str__(self):
         category_name = self.category.name if self.category else "No Category"
         return f"{self.title} ({category_name})"
@@ -197,3 +207,59 @@ class CabBooking(TimeStampedModel):
 
     def __str__(self):
         return f"Booking #{self.id} - {self.cab.title}"
+
+
+class Place(TimeStampedModel):
+    """
+    Gazetteer of pickup/drop places: the free-text locations of cab searches
+    and bookings are resolved to coordinates here to work out trip distances.
+    """
+    name = models.CharField(max_length=255, unique=True, help_text="Place name as customers type it (e.g. 'Kochi Airport')")
+    aliases = models.CharField(
+        max_length=500, blank=True, help_text="Other names for the place, comma separated (e.g. 'COK, Nedumbassery')"
+    )
+    state = models.CharField(max_length=100, blank=True, help_text="State the place is in")
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, help_text="Latitude in decimal degrees")
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, help_text="Longitude in decimal degrees")
+    is_active = models.BooleanField(default=True, help_text="Designates whether the place is used to resolve locations")
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"{self.name}, {self.state}" if self.state else self.name
+
+
+class RouteDistance(TimeStampedModel):
+    """
+    Road distance between two places, stored once per pair (origin has the
+    lower id). Estimated rows are filled in on first use from the
+    straight-line distance; manual rows are entered in the admin and win.
+    """
+    ESTIMATE = "estimate"
+    MANUAL = "manual"
+    SOURCE_CHOICES = [
+        (ESTIMATE, "Estimate"),
+        (MANUAL, "Manual"),
+    ]
+
+    origin = models.ForeignKey(Place, on_delete=models.CASCADE, related_name="routes_from", help_text="Place with the lower id")
+    destination = models.ForeignKey(Place, on_delete=models.CASCADE, related_name="routes_to", help_text="Place with the higher id")
+    distance_km = models.DecimalField(max_digits=8, decimal_places=1, help_text="One-way road distance in km")
+    source = models.CharField(
+        max_length=10, choices=SOURCE_CHOICES, default=ESTIMATE, help_text="Estimated from coordinates or entered by hand"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["origin", "destination"], name="unique_route_distance"),
+        ]
+
+    def __str__(self):
+        return f"{self.origin.name} - {self.destination.name}: {self.distance_km} km"
+
+    def save(self, *args, **kwargs):
+        # One row per pair, whichever way round it was entered
+        if self.origin_id and self.destination_id and self.origin_id > self.destination_id:
+            self.origin_id, self.destination_id = self.destination_id, self.origin_id
+        super().save(*args, **kwargs)
@@ -0,0 +1,26 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cabs.services import CabFareService
+from .models import Place, RouteDistance
+
+
+@receiver(post_save, sender=Place)
+def place_saved(sender, instance, **kwargs):
+    # The place may have moved: its estimated routes are worked out again on next use
+    RouteDistance.objects.filter(Q(origin=instance) | Q(destination=instance), source=RouteDistance.ESTIMATE).delete()
+    CabFareService.invalidate()
+
+
+@receiver(post_save, sender=RouteDistance)
+def route_saved(sender, instance, **kwargs):
+    # New estimates are what the cache is missing anyway; only hand-set distances change answers
+    if instance.source == RouteDistance.MANUAL:
+        CabFareService.invalidate()
+
+
+@receiver(post_delete, sender=Place)
+@receiver(post_delete, sender=RouteDistance)
+def route_deleted(sender, **kwargs):
+    CabFareService.invalidate()
@@ -1,4 +1,24 @@
 from django.contrib import admin
+from .models import BackfillCheckpoint, Sequence
 
-# Register your models here.
 
+@admin.register(Sequence)
+class SequenceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'next_value', 'updated_at')
+    search_fields = ('name',)
+    ordering = ('name',)
+    # Values are only moved by SequenceService; editing them could reuse numbers
+    readonly_fields = ('name', 'next_value', 'created_at', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(BackfillCheckpoint)
+class BackfillCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('name', 'last_pk', 'processed', 'written', 'started_at', 'finished_at')
+    search_fields = ('name',)
+    readonly_fields = ('name', 'last_pk', 'processed', 'written', 'started_at', 'finished_at', 'created_at', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,138 @@
+"""
+Admin building blocks for large tables.
+
+PerformanceModelAdmin is a drop-in ModelAdmin that
+  - joins every foreign key a changelist row renders (list_display columns and
+    what their __str__ reads) instead of one query per row and column,
+  - shows an estimated total for big unfiltered changelists instead of COUNT(*),
+  - renders foreign keys to big tables as autocomplete widgets.
+Inlines get the same widgets from AutocompleteMixin and lazy previews from
+ImagePreviewMixin.
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+# Related rows each model's __str__ reads, so changelists can join them too
+STR_SELECT_RELATED = {
+    "bookings.Booking": ("user",),
+    "bookings.BookingTraveller": ("traveller", "booking"),
+    "properties.RoomType": ("property",),
+    "properties.RoomOption": ("room_type",),
+    "travellers.Traveller": ("user",),
+    "wallet.Wallet": ("user",),
+    "wallet.WalletTransaction": ("wallet",),
+    "cabs.Cab": ("category",),
+    "cabs.CabBooking": ("cab",),
+    "coupons.CouponUserCounter": ("coupon",),
+    "packages.PackageItinerary": ("package",),
+    "packages.PackageTransfer": ("package",),
+    "activities.ActivityItinerary": ("activity",),
+    "payments.Payment": ("booking",),
+    "support.SupportRequest": ("booking",),
+    "support.SupportTimeline": ("support_request",),
+}
+
+# Foreign keys to these are searched instead of listed in a <select>
+AUTOCOMPLETE_MODELS = ("properties.Property", "properties.RoomType", "accounts.User", "bookings.Booking")
+
+
+def str_select_related(model, prefix="", depth=0):
+    """select_related paths needed to render str() of a model, following nested __str__ reads."""
+    paths = []
+    for name in STR_SELECT_RELATED.get(model._meta.label, ()):
+        paths.append(f"{prefix}{name}")
+        if depth < 2:
+            target = model._meta.get_field(name).related_model
+            paths += str_select_related(target, f"{prefix}{name}__", depth + 1)
+    return paths
+
+
+def estimated_row_count(model, using):
+    """The planner's row estimate for a table (PostgreSQL), or None if unknown."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    # -1 until the table has been vacuumed or analyzed
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the table estimate as the total for unfiltered changelists of big
+    tables; filtered lists (search, list_filter) still count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class AutocompleteMixin:
+    """Autocomplete widgets for foreign keys to AUTOCOMPLETE_MODELS (unless raw_id_fields has them)."""
+
+    def get_autocomplete_fields(self, request):
+        fields = list(super().get_autocomplete_fields(request))
+        for field in self.model._meta.get_fields():
+            if not (field.many_to_one or field.many_to_many) or not field.concrete:
+                continue
+            if field.name in fields or field.name in self.raw_id_fields:
+                continue
+            related_admin = self.admin_site._registry.get(field.related_model)
+            # The autocomplete view searches with the related admin's search_fields
+            if field.related_model._meta.label in AUTOCOMPLETE_MODELS and related_admin and related_admin.search_fields:
+                fields.append(field.name)
+        return fields
+
+
+class PerformanceModelAdmin(AutocompleteMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # The "N total" link would run an exact COUNT(*) of the whole table on every filtered page
+    show_full_result_count = False
+
+    def get_list_select_related(self, request):
+        if self.list_select_related is not False:
+            return self.list_select_related
+        paths = []
+        for name in self.get_list_display(request):
+            if name == "__str__":
+                paths += str_select_related(self.model)
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and (field.many_to_one or field.one_to_one):
+                paths.append(name)
+                paths += str_select_related(field.related_model, f"{name}__")
+        return list(dict.fromkeys(paths))
+
+
+class ImagePreviewMixin:
+    """Read-only image_preview column for image inlines, loaded only when scrolled into view."""
+    readonly_fields = ("image_preview",)
+    preview_field = "image"
+    preview_width = 100
+
+    def image_preview(self, obj):
+        image = getattr(obj, self.preview_field, None)
+        if image:
+            try:
+                return format_html(
+                    '<img src="{}" width="{}" loading="lazy" decoding="async" />', image.url, self.preview_width
+                )
+            except Exception:
+                return "No image"
+        return "No image"
@@ -0,0 +1,108 @@
+"""
+Resumable backfills for data migrations.
+
+A backfill is a management command that subclasses BackfillCommand and
+declares the rows to walk and what to do with each batch:
+
+    class Command(BackfillCommand):
+        help = 'Give every room type a default option'
+
+        def get_queryset(self):
+            return RoomType.objects.filter(options__isnull=True)
+
+        def process_batch(self, rows):
+            return len(RoomOption.objects.bulk_create([...]))
+
+The source is read in primary-key order with keyset paging (pk > last seen,
+LIMIT batch size), never OFFSET, so each batch costs the same however far the
+run has got. Every batch is written in its own transaction together with the
+BackfillCheckpoint row, so an interrupted run resumes after the last committed
+batch, and re-running a finished backfill only visits rows added since.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.models import BackfillCheckpoint
+
+
+class BackfillCommand(BaseCommand):
+    batch_size = 500
+
+    def get_queryset(self):
+        """Source rows; filtering out rows that are already done keeps re-runs cheap."""
+        raise NotImplementedError
+
+    def process_batch(self, rows):
+        """Writes one batch (a list of source rows) and returns the number of rows written."""
+        raise NotImplementedError
+
+    @property
+    def backfill_name(self):
+        return self.__module__.rsplit(".", 1)[-1]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=self.batch_size, help='Source rows per batch and transaction')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches, to spare the database')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches (resume later)')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start from the first row')
+
+    def handle(self, *args, **options):
+        checkpoint, _ = BackfillCheckpoint.objects.get_or_create(name=self.backfill_name)
+        if options['restart']:
+            checkpoint.last_pk = None
+            checkpoint.processed = checkpoint.written = 0
+        if checkpoint.last_pk is None or checkpoint.finished_at is not None:
+            checkpoint.started_at = timezone.now()
+        checkpoint.finished_at = None
+        checkpoint.save()
+
+        source = self.get_queryset().order_by('pk')
+        remaining = source.filter(pk__gt=checkpoint.last_pk).count() if checkpoint.last_pk is not None else source.count()
+        if checkpoint.last_pk is not None:
+            self.stdout.write(f'Resuming {self.backfill_name} after pk {checkpoint.last_pk} ({checkpoint.processed} rows done)')
+
+        done = written = batches = 0
+        started = time.monotonic()
+        while options['max_batches'] is None or batches < options['max_batches']:
+            page = source.filter(pk__gt=checkpoint.last_pk) if checkpoint.last_pk is not None else source
+            rows = list(page[:options['batch_size']])
+            if not rows:
+                checkpoint.finished_at = timezone.now()
+                checkpoint.save(update_fields=['finished_at', 'updated_at'])
+                break
+
+            with transaction.atomic():
+                # The checkpoint row lock also keeps two runs of the same backfill apart
+                current = BackfillCheckpoint.objects.select_for_update().get(pk=checkpoint.pk)
+                if current.last_pk != checkpoint.last_pk:
+                    raise CommandError(f'{self.backfill_name} checkpoint moved under this run; is another run active?')
+                count = self.process_batch(rows) or 0
+                checkpoint.last_pk = rows[-1].pk
+                checkpoint.processed += len(rows)
+                checkpoint.written += count
+                checkpoint.save(update_fields=['last_pk', 'processed', 'written', 'updated_at'])
+
+            batches += 1
+            done += len(rows)
+            written += count
+            self.report(done, remaining, written, time.monotonic() - started)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        state = 'complete' if checkpoint.finished_at else f'stopped after pk {checkpoint.last_pk}'
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.backfill_name} {state}: {done} rows processed, {written} written this run '
+            f'({checkpoint.processed} processed, {checkpoint.written} written in total)'
+        ))
+
+    def report(self, done, remaining, written, elapsed):
+        rate = done / elapsed if elapsed else 0
+        # remaining was counted at the start; rows added meanwhile can push done past it
+        left = max(remaining - done, 0)
+        eta = timedelta(seconds=round(left / rate)) if rate else '?'
+        percent = f'{done * 100 / remaining:5.1f}%' if remaining else '  n/a'
+        self.stdout.write(f'{done}/{remaining} {percent}  {written} written  {rate:.0f} rows/s  ETA {eta}')
@@ -0,0 +1,507 @@
+"""
+Bulk catalog import/export (manage.py import_catalog / export_catalog).
+
+Every catalog type is described by a Node: its model, the natural key that
+identifies a row across environments, how foreign keys and many-to-many
+fields are written (by the related row's natural key), and its child rows.
+Plain fields are taken from the model, so new columns are picked up without
+touching this module.
+
+Records are nested dicts, one per top-level object:
+
+    {"type": "property", "slug": "tea-valley-resort-munnar", "name": "Tea Valley Resort", ...,
+     "amenities": ["Pool", "WiFi"], "discount": "Monsoon 10",
+     "room_types": [{"name": "Deluxe", ..., "options": [{"name": "Breakfast Included", ...}]}]}
+
+Imports upsert by natural key, a chunk of records at a time: one query loads
+the existing rows of the chunk, new rows go in with bulk_create and changed
+rows with bulk_update, level by level down the tree. Rows that are not in
+the file are left alone.
+
+A key must pick out at most one row: a key that several existing rows share,
+or that the input repeats, is reported as an error on its line and nothing
+is written for it. Related rows referenced by an ambiguous name keep their
+current link when it already has that name and are an error otherwise.
+"""
+import datetime
+import json
+from collections import Counter, defaultdict
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from apps.activities.models import Activity, ActivityType
+from apps.cabs.models import Cab, CabCategory, CabPricingOption, CabTransferType
+from apps.houseboats.models import HouseBoat, HouseBoatSpecification, HouseBoatTiming
+from apps.packages.models import HolidayPackage, PackageItinerary, PackageTheme
+from apps.properties.models import Amenity, Discount, Property, RoomOption, RoomType
+from apps.properties.signals import sync_entire_place_room_type
+
+# Maintained by code, never imported or exported
+SKIP_FIELDS = {"id", "created_at", "updated_at"}
+
+
+class Lookup:
+    """A related model referenced by natural key; create=True adds missing names."""
+
+    def __init__(self, model, fields, create=False):
+        self.model = model
+        self.fields = fields
+        self.create = create
+
+    def key(self, value):
+        # Single-field keys are written as a plain value, composite ones as a list
+        return tuple(value) if len(self.fields) > 1 else (value,)
+
+
+class Node:
+    def __init__(self, name, model, key, parent=None, lookups=None, m2m=None, children=(), single=False, exclude=None):
+        self.name = name  # record type, or the key (and reverse accessor) under the parent record
+        self.model = model
+        self.key = key
+        self.parent = parent  # FK field pointing at the parent row
+        self.lookups = lookups or {}
+        self.m2m = m2m or {}
+        self.children = children
+        self.single = single  # one-to-one child: a dict instead of a list
+        self.exclude = exclude or {}  # rows the catalog files never cover
+
+        relational = set(self.lookups) | set(self.m2m) | {parent}
+        self.fields = [
+            field.name for field in model._meta.concrete_fields
+            if field.name not in SKIP_FIELDS and field.name not in relational
+            and not field.is_relation and not isinstance(field, models.FileField)
+        ]
+
+    def queryset(self):
+        return self.model.objects.exclude(**self.exclude) if self.exclude else self.model.objects.all()
+
+    def prefetches(self, prefix=""):
+        paths = [f"{prefix}{name}" for name in self.m2m]
+        paths += [f"{prefix}{name}" for name in self.lookups]
+        for child in self.children:
+            paths.append(Prefetch(f"{prefix}{child.name}", queryset=child.queryset()))
+            paths += child.prefetches(f"{prefix}{child.name}__")
+        return paths
+
+
+CATALOG = {
+    "property": Node(
+        "property", Property, key=("slug",),
+        lookups={"discount": Lookup(Discount, ("name",))},
+        m2m={"amenities": Lookup(Amenity, ("name",), create=True)},
+        children=[
+            Node(
+                "room_types", RoomType, key=("name",), parent="property",
+                # Entire-place room types are generated from the property (properties/signals.py)
+                exclude={"is_entire_place": True},
+                children=[Node("options", RoomOption, key=("name",), parent="room_type")],
+            ),
+        ],
+    ),
+    "package": Node(
+        "package", HolidayPackage, key=("slug",),
+        lookups={"discount": Lookup(Discount, ("name",))},
+        m2m={"themes": Lookup(PackageTheme, ("name",), create=True)},
+        children=[
+            Node(
+                "itinerary", PackageItinerary, key=("day_number", "order"), parent="package",
+                lookups={
+                    "stay_property": Lookup(Property, ("slug",)),
+                    "stay_houseboat": Lookup(HouseBoat, ("slug",)),
+                },
+            ),
+        ],
+    ),
+    "houseboat": Node(
+        "houseboat", HouseBoat, key=("slug",),
+        lookups={"discount": Lookup(Discount, ("name",))},
+        children=[
+            Node("specification", HouseBoatSpecification, key=(), parent="houseboat", single=True),
+            Node("timing", HouseBoatTiming, key=(), parent="houseboat", single=True),
+        ],
+    ),
+    "activity": Node(
+        "activity", Activity, key=("slug",),
+        lookups={"discount": Lookup(Discount, ("name",))},
+        m2m={"types": Lookup(ActivityType, ("name",), create=True)},
+    ),
+    "cab": Node(
+        "cab", Cab, key=("slug",),
+        lookups={
+            "category": Lookup(CabCategory, ("name",), create=True),
+            "discount": Lookup(Discount, ("name",)),
+        },
+        m2m={"transfer_types": Lookup(CabTransferType, ("name",), create=True)},
+        children=[Node("pricing_options", CabPricingOption, key=("option_type",), parent="cab")],
+    ),
+}
+
+
+def encode(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def serialize(node, instance):
+    """Nested record for one row (relations should be prefetched)."""
+    record = {field: encode(getattr(instance, field)) for field in node.fields}
+    for name, lookup in node.lookups.items():
+        related = getattr(instance, name)
+        if related is None:
+            record[name] = None
+        else:
+            values = [encode(getattr(related, field)) for field in lookup.fields]
+            record[name] = values if len(values) > 1 else values[0]
+    for name, lookup in node.m2m.items():
+        record[name] = sorted(getattr(related, lookup.fields[0]) for related in getattr(instance, name).all())
+    for child in node.children:
+        if child.single:
+            related = getattr(instance, child.name, None)
+            record[child.name] = serialize(child, related) if related is not None else None
+        else:
+            record[child.name] = [serialize(child, row) for row in getattr(instance, child.name).all()]
+    return record
+
+
+def export_records(node, chunk_size=500):
+    """Yields {"type": ..., **record} for every row of a top-level node, in constant memory."""
+    queryset = node.queryset().prefetch_related(*node.prefetches()).order_by("pk")
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield {"type": node.name, **serialize(node, instance)}
+
+
+def csv_columns(node):
+    return [*node.fields, *node.lookups, *node.m2m, *(child.name for child in node.children)]
+
+
+def to_csv_row(node, record):
+    # Nested values (lists, child rows) travel as JSON inside the cell
+    return [
+        json.dumps(record.get(column)) if isinstance(record.get(column), (list, dict)) else
+        ("" if record.get(column) is None else record.get(column))
+        for column in csv_columns(node)
+    ]
+
+
+def from_csv_row(node, row):
+    nested = set(node.m2m) | {child.name for child in node.children} | {
+        name for name, lookup in node.lookups.items() if len(lookup.fields) > 1
+    } | {field for field in node.fields if isinstance(node.model._meta.get_field(field), models.JSONField)}
+    record = {}
+    for column, cell in row.items():
+        if column == "type":
+            continue
+        if column in nested:
+            record[column] = json.loads(cell) if cell else None
+        else:
+            record[column] = None if cell == "" else cell
+    return record
+
+
+class RecordError(Exception):
+    pass
+
+
+class Resolver:
+    """
+    Natural key -> pk for lookup models, loaded once per key and cached. A key
+    that several rows share is cached as the tuple of their pks.
+    """
+
+    def __init__(self):
+        self.cache = defaultdict(dict)
+
+    def reset(self):
+        self.cache.clear()
+
+    def pk(self, lookup, value, current=None):
+        """pk for value; of several rows with that key, only the one already linked (current) is accepted."""
+        key = lookup.key(value)
+        cache = self.cache[(lookup.model, lookup.fields)]
+        if key not in cache:
+            self.load(lookup, [key])
+        pk = cache.get(key)
+        if pk is None:
+            raise RecordError(f"{lookup.model.__name__} {value!r} does not exist")
+        if isinstance(pk, tuple):
+            if current in pk:
+                return current
+            raise RecordError(f"{lookup.model.__name__} {value!r} is ambiguous: {len(pk)} rows have it")
+        return pk
+
+    def preload(self, lookup, values):
+        keys = {lookup.key(value) for value in values if value not in (None, "", [])}
+        cache = self.cache[(lookup.model, lookup.fields)]
+        missing = [key for key in keys if key not in cache]
+        if missing:
+            self.load(lookup, missing)
+
+    def load(self, lookup, keys):
+        cache = self.cache[(lookup.model, lookup.fields)]
+        rows = lookup.model.objects.filter(key_filter(lookup.fields, keys)).values_list("pk", *lookup.fields)
+        matches = defaultdict(list)
+        for pk, *values in rows:
+            matches[tuple(values)].append(pk)
+        for key, pks in matches.items():
+            cache[key] = pks[0] if len(pks) == 1 else tuple(pks)
+        unknown = [key for key in keys if key not in cache]
+        if unknown and lookup.create:
+            created = lookup.model.objects.bulk_create(
+                [lookup.model(**dict(zip(lookup.fields, key))) for key in unknown]
+            )
+            for key, obj in zip(unknown, created):
+                cache[key] = obj.pk
+        for key in unknown:
+            cache.setdefault(key, None)
+
+
+def key_filter(fields, keys):
+    if len(fields) == 1:
+        return Q(**{f"{fields[0]}__in": [key[0] for key in keys]})
+    return reduce(or_, (Q(**dict(zip(fields, key))) for key in keys))
+
+
+class CatalogImporter:
+    """
+    Upserts chunks of records. With dry_run every chunk is written and then
+    rolled back, so the reported diff is exactly what a real run would do.
+    """
+
+    def __init__(self, dry_run=False, report=None, batch_size=500):
+        self.dry_run = dry_run
+        self.report = report or (lambda line: None)
+        self.batch_size = batch_size
+        self.resolver = Resolver()
+        self.stats = defaultdict(Counter)
+        self.errors = []
+        # Top-level natural key -> line it was imported from, to catch repeats across chunks
+        self.seen = defaultdict(dict)
+
+    def import_chunk(self, node, records):
+        """records: [(line number, record dict)] of one top-level type."""
+        with transaction.atomic():
+            created, changed = self.upsert(node, [(line, record, None) for line, record in records])
+            if node.model is Property and not self.dry_run:
+                # bulk writes send no post_save; new properties without entire-place booking have nothing to sync
+                for instance in [*(p for p in created if p.allow_entire_place_booking), *changed]:
+                    sync_entire_place_room_type(Property, instance, created=instance in created)
+            if self.dry_run:
+                transaction.set_rollback(True)
+        if self.dry_run:
+            # Lookup rows created inside the rolled-back chunk are gone again
+            self.resolver.reset()
+
+    def upsert(self, node, items):
+        """Writes one level of the tree; returns (created rows, changed rows)."""
+        model_fields = {field: node.model._meta.get_field(field) for field in node.fields}
+
+        # Keys of this level, plus natural keys of everything the rows reference
+        keyed = []
+        for line, record, parent in items:
+            try:
+                key = tuple(model_fields[field].to_python(record.get(field)) for field in node.key)
+            except ValidationError as exc:
+                self.error(line, node, record, exc)
+                continue
+            if any(value is None for value in key):
+                self.error(line, node, record, RecordError(f"missing {'/'.join(node.key)}"))
+                continue
+            keyed.append((line, record, parent, ((parent.pk,) if parent else ()) + key))
+
+        # A key repeated in the input would silently overwrite itself; reject every copy
+        lines = defaultdict(list)
+        for line, _, _, key in keyed:
+            lines[key].append(line)
+        unique = []
+        for line, record, parent, key in keyed:
+            if len(lines[key]) > 1:
+                self.error(line, node, record, RecordError(
+                    f"repeated in the input (lines {', '.join(map(str, lines[key]))})"
+                ))
+            elif parent is None and key in self.seen[node.name]:
+                self.error(line, node, record, RecordError(f"repeats line {self.seen[node.name][key]}"))
+            else:
+                if parent is None:
+                    self.seen[node.name][key] = line
+                unique.append((line, record, parent, key))
+        keyed = unique
+        for name, lookup in node.lookups.items():
+            self.resolver.preload(lookup, [record.get(name) for _, record, _, _ in keyed if name in record])
+        for name, lookup in node.m2m.items():
+            self.resolver.preload(lookup, [value for _, record, _, _ in keyed for value in record.get(name) or []])
+
+        matches = defaultdict(list)
+        if keyed:
+            if node.parent:
+                rows = node.queryset().filter(**{f"{node.parent}__in": {parent.pk for _, _, parent, _ in keyed}})
+                for row in rows:
+                    matches[(getattr(row, f"{node.parent}_id"), *(getattr(row, field) for field in node.key))].append(row)
+            else:
+                rows = node.queryset().filter(key_filter(node.key, [key for *_, key in keyed]))
+                for row in rows:
+                    matches[tuple(getattr(row, field) for field in node.key)].append(row)
+        existing = {key: rows[0] for key, rows in matches.items() if len(rows) == 1}
+
+        created, changed, changed_fields, pairs = [], [], set(), []
+        for line, record, parent, key in keyed:
+            if len(matches.get(key, ())) > 1:
+                self.error(line, node, record, RecordError(f"ambiguous: {len(matches[key])} existing rows have this key"))
+                continue
+            instance = existing.get(key)
+            try:
+                values = self.values(node, model_fields, record, instance)
+            except (RecordError, ValidationError) as exc:
+                self.error(line, node, record, exc)
+                continue
+            if instance is None:
+                instance = node.model(**values)
+                if parent is not None:
+                    setattr(instance, node.parent, parent)
+                if not self.check(node, instance, node.fields, line, record):
+                    continue
+                existing[key] = instance
+                created.append(instance)
+                self.stats[node.name]["created"] += 1
+                self.report(f"+ {self.label(node, record, parent)}")
+            else:
+                diff = {
+                    field: (getattr(instance, field), value) for field, value in values.items()
+                    if getattr(instance, field) != value
+                }
+                if not diff:
+                    self.stats[node.name]["unchanged"] += 1
+                    pairs.append((line, record, instance))
+                    continue
+                for field, (_, value) in diff.items():
+                    setattr(instance, field, value)
+                if not self.check(node, instance, diff, line, record):
+                    for field, (old, _) in diff.items():
+                        setattr(instance, field, old)
+                    continue
+                if instance.pk is not None and instance not in changed:
+                    changed.append(instance)
+                    self.stats[node.name]["updated"] += 1
+                changed_fields.update(diff)
+                self.report(f"~ {self.label(node, record, parent)}: " + ", ".join(
+                    f"{field}: {old!r} -> {new!r}" for field, (old, new) in diff.items()
+                ))
+            pairs.append((line, record, instance))
+
+        node.model.objects.bulk_create(created, batch_size=self.batch_size)
+        if changed:
+            # bulk_update skips auto_now; pricing versions depend on updated_at
+            now = timezone.now()
+            for instance in changed:
+                instance.updated_at = now
+            node.model.objects.bulk_update(changed, [*changed_fields, "updated_at"], batch_size=self.batch_size)
+
+        for name, lookup in node.m2m.items():
+            self.sync_m2m(node, name, lookup, [(line, record, instance) for line, record, instance in pairs if name in record])
+
+        for child in node.children:
+            child_items = []
+            for line, record, instance in pairs:
+                value = record.get(child.name)
+                if value is None:
+                    continue
+                for child_record in ([value] if child.single else value):
+                    child_items.append((line, child_record, instance))
+            self.upsert(child, child_items)
+
+        return created, changed
+
+    def values(self, node, model_fields, record, instance=None):
+        values = {}
+        for field_name, field in model_fields.items():
+            if field_name not in record:
+                continue
+            value = record[field_name]
+            if value is None and not field.null:
+                if not isinstance(field, (models.CharField, models.TextField)):
+                    continue
+                value = ""
+            values[field_name] = field.to_python(value)
+        for name, lookup in node.lookups.items():
+            if name in record:
+                value = record[name]
+                attname = node.model._meta.get_field(name).attname
+                current = getattr(instance, attname) if instance is not None else None
+                values[attname] = None if value in (None, "", []) else self.resolver.pk(lookup, value, current)
+        return values
+
+    def check(self, node, instance, fields, line, record):
+        """Field validation (required values, choices, lengths) for the given fields only."""
+        try:
+            instance.clean_fields(exclude=[
+                field.name for field in node.model._meta.concrete_fields if field.name not in fields
+            ])
+        except ValidationError as exc:
+            self.error(line, node, record, exc)
+            return False
+        return True
+
+    def sync_m2m(self, node, name, lookup, pairs):
+        """Makes each row's related set exactly the names in its record."""
+        if not pairs:
+            return
+        through = getattr(node.model, name).through
+        source = f"{node.model._meta.model_name}_id"
+        target = f"{lookup.model._meta.model_name}_id"
+        label = f"{lookup.model._meta.model_name}__{lookup.fields[0]}"
+        current = defaultdict(dict)
+        rows = through.objects.filter(**{f"{source}__in": [i.pk for _, _, i in pairs]}).values_list(source, target, label)
+        for source_pk, target_pk, target_name in rows:
+            current[source_pk][target_pk] = target_name
+
+        stale, missing = [], []
+        for line, record, instance in pairs:
+            have = current[instance.pk]
+            wanted = {}
+            try:
+                for value in record[name] or []:
+                    # Already linked rows with this name stay, even when the name is not unique
+                    linked = [pk for pk, label in have.items() if label == value]
+                    for pk in linked or [self.resolver.pk(lookup, value)]:
+                        wanted[pk] = value
+            except RecordError as exc:
+                self.error(line, node, record, exc)
+                continue
+            added = [pk for pk in wanted if pk not in have]
+            removed = [pk for pk in have if pk not in wanted]
+            if not (added or removed):
+                continue
+            stale += [(instance.pk, pk) for pk in removed]
+            missing += [(instance.pk, pk) for pk in added]
+            self.stats[node.name]["relinked"] += 1
+            self.report(f"~ {self.label(node, record, None)}: {name} " + " ".join(
+                [f"+{wanted[pk]}" for pk in added] + [f"-{have[pk]}" for pk in removed]
+            ))
+
+        if stale:
+            through.objects.filter(reduce(or_, (Q(**{source: s, target: t}) for s, t in stale))).delete()
+        through.objects.bulk_create(
+            [through(**{source: s, target: t}) for s, t in missing], batch_size=self.batch_size
+        )
+
+    def label(self, node, record, parent):
+        key = "/".join(str(record.get(field)) for field in node.key) or node.name
+        return f"{node.name} {key}" + (f" of {parent}" if parent is not None else "")
+
+    def error(self, line, node, record, exc):
+        if isinstance(exc, ValidationError) and hasattr(exc, "error_dict"):
+            message = "; ".join(f"{field}: {' '.join(errors)}" for field, errors in exc.message_dict.items())
+        elif isinstance(exc, ValidationError):
+            message = "; ".join(exc.messages)
+        else:
+            message = str(exc)
+        self.errors.append((line, f"{node.name} {'/'.join(str(record.get(f)) for f in node.key)}: {message}"))
+        self.stats[node.name]["failed"] += 1
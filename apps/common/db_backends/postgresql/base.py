@@ -0,0 +1,7 @@
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+
+from apps.common.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, PostgresDatabaseWrapper):
+    """PostgreSQL backend that borrows connections from the process pool."""
@@ -0,0 +1,253 @@
+"""
+Process-wide database connection pool.
+
+Without pooling every Django thread keeps its own connection for CONN_MAX_AGE
+seconds, so gunicorn workers x threads (plus the async read pool) multiplies
+the connections each instance opens. The pooled backends in
+apps/common/db_backends/ instead borrow a raw DB-API connection from a bounded
+pool per alias when a thread first needs one and hand it back when Django
+closes it at the end of the request.
+
+Enable with DATABASE_POOL=True; sizing and lifetimes come from
+DATABASE_POOL_OPTIONS in config/settings.py.
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from django.db import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+def ping(conn):
+    """Cheap liveness check that works for any DB-API connection."""
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """
+    Bounded LIFO pool of raw DB-API connections.
+
+    Connections idle for longer than health_check_after are pinged before being
+    handed out, and any connection older than max_lifetime is closed instead of
+    being reused, so server-side restarts and failovers age out on their own.
+    """
+
+    def __init__(self, alias, max_size=10, timeout=10.0, max_lifetime=1800, health_check_after=30):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, last_used)
+        self._created_at = {}
+        self._size = 0
+        self._peak_size = 0
+        self._metrics = Counter()
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self, connect, check=ping):
+        """Returns a pooled connection, opening one with connect() if there is room."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            conn, created_at, last_used = self._checkout(deadline)
+            if conn is None:
+                try:
+                    conn = connect()
+                except Exception:
+                    self._forget(None)
+                    raise
+                created_at = time.monotonic()
+                self._metrics["created"] += 1
+                break
+            if time.monotonic() - last_used >= self.health_check_after and not check(conn):
+                self._discard(conn, "discarded_unhealthy")
+                continue
+            self._metrics["reused"] += 1
+            break
+
+        self._created_at[conn] = created_at
+        waited = time.monotonic() - started
+        with self._cond:
+            self._metrics["checkouts"] += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn):
+        """Returns a connection to the pool, rolling back anything left open."""
+        created_at = self._created_at.get(conn)
+        if created_at is None or os.getpid() != self.pid:
+            self._close_quietly(conn)
+            return
+        if time.monotonic() - created_at > self.max_lifetime:
+            self._discard(conn, "discarded_lifetime")
+            return
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn, "discarded_unhealthy")
+            return
+        with self._cond:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, conn):
+        """Closes a checked-out connection instead of returning it to the pool."""
+        self._discard(conn, "discarded")
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._metrics["checkouts"]
+            return {
+                "alias": self.alias,
+                "max_size": self.max_size,
+                "size": self._size,
+                "peak_size": self._peak_size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "created": self._metrics["created"],
+                "reused": self._metrics["reused"],
+                "checkouts": checkouts,
+                "waits": self._metrics["waits"],
+                "timeouts": self._metrics["timeouts"],
+                "discarded_lifetime": self._metrics["discarded_lifetime"],
+                "discarded_unhealthy": self._metrics["discarded_unhealthy"],
+                "discarded": self._metrics["discarded"],
+                "wait_avg_ms": round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._created_at.pop(conn, None)
+            self._close_quietly(conn)
+
+    def _checkout(self, deadline):
+        # Returns an idle connection, or (None, None, None) once a slot has been
+        # reserved for a new connection; waits while the pool is exhausted
+        expired = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        conn, created_at, last_used = self._idle.pop()
+                        if now - created_at > self.max_lifetime:
+                            self._size -= 1
+                            self._metrics["discarded_lifetime"] += 1
+                            expired.append(conn)
+                            continue
+                        return conn, created_at, last_used
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._peak_size = max(self._peak_size, self._size)
+                        return None, None, None
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"Connection pool for '{self.alias}' exhausted "
+                            f"({self.max_size} connections) after {self.timeout}s"
+                        )
+                    if not waited:
+                        self._metrics["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+        finally:
+            for conn in expired:
+                self._created_at.pop(conn, None)
+                self._close_quietly(conn)
+
+    def _discard(self, conn, reason):
+        self._close_quietly(conn)
+        self._forget(conn)
+        with self._cond:
+            self._metrics[reason] += 1
+
+    def _forget(self, conn):
+        if conn is not None:
+            self._created_at.pop(conn, None)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    """Returns this process's pool for a database alias, creating it on first use."""
+    pool = _pools.get(alias)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(alias)
+            # A forked worker must never share its parent's sockets
+            if pool is None or pool.pid != os.getpid():
+                options = settings_dict.get("POOL", {})
+                pool = ConnectionPool(
+                    alias,
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", 10.0),
+                    max_lifetime=options.get("MAX_LIFETIME", 1800),
+                    health_check_after=options.get("HEALTH_CHECK_AFTER", 30),
+                )
+                _pools[alias] = pool
+    return pool
+
+
+def pool_stats():
+    """Metrics for every pool opened by this process."""
+    return [pool.stats() for pool in list(_pools.values()) if pool.pid == os.getpid()]
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixed into a Django DatabaseWrapper: opening a connection borrows one from
+    the pool and closing it gives it back. Use with CONN_MAX_AGE = 0 so Django
+    hands the connection back at the end of every request.
+    """
+
+    def get_new_connection(self, conn_params):
+        parent_connect = super().get_new_connection
+        return get_pool(self.alias, self.settings_dict).acquire(lambda: parent_connect(conn_params))
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.settings_dict)
+        if self.in_atomic_block:
+            # Closed mid-transaction; Django keeps the handle around, so never lend it out again
+            pool.discard(self.connection)
+        else:
+            pool.release(self.connection)
@@ -0,0 +1,145 @@
+"""
+Primary/replica database routing.
+
+Replicas are configured with DATABASE_REPLICA_URLS (see config/settings.py) and
+are only ever used by the public catalog read endpoints wrapped with
+api.async_views.read_view(). Everything else - bookings, auth, wallet, admin -
+reads and writes the primary ("default").
+
+Read-your-writes: after a user's successful write, PrimaryPinningMiddleware pins
+them to the primary for REPLICA_STICKY_SECONDS, so a catalog read straight after
+a booking never sees a replica that has not caught up yet. Pins live in the
+Django cache, so configure a shared CACHES backend when running several processes.
+
+Replicas are probed at most every REPLICA_HEALTH_CHECK_INTERVAL seconds; a
+replica that fails the probe, lags too far behind, or raises OperationalError
+during a request is skipped until the next probe.
+
+To try it locally with two SQLite files:
+
+    cp db.sqlite3 /tmp/replica.sqlite3
+    DATABASE_REPLICA_URLS=sqlite:////tmp/replica.sqlite3 python manage.py runserver
+"""
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Alias reads should go to for the current request; None means the primary
+_read_alias = contextvars.ContextVar("read_alias", default=None)
+
+# alias -> (healthy, checked_at), per process
+_health = {}
+_health_lock = threading.Lock()
+
+
+def _probe(alias):
+    try:
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                )
+                return cursor.fetchone()[0] <= settings.REPLICA_MAX_LAG_SECONDS
+            cursor.execute("SELECT 1")
+        return True
+    except DatabaseError:
+        return False
+
+
+def is_healthy(alias):
+    """Cached health of a replica, re-probed once the check interval has passed."""
+    healthy, checked_at = _health.get(alias, (True, 0.0))
+    if time.monotonic() - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        return healthy
+    healthy = _probe(alias)
+    with _health_lock:
+        _health[alias] = (healthy, time.monotonic())
+    return healthy
+
+
+def mark_unhealthy(alias):
+    with _health_lock:
+        _health[alias] = (False, time.monotonic())
+
+
+def _pin_key(user_id):
+    return f"db-router:pinned:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.set(_pin_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+def token_user_id(request):
+    """
+    User id from the request's access token, validated without a DB lookup.
+    Returns None for anonymous or invalid-token requests.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header is None:
+        return None
+    raw_token = auth.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = auth.get_validated_token(raw_token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+def replica_for(request):
+    """Picks a healthy replica for a catalog read, or None to stay on the primary."""
+    if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+        return None
+    user_id = token_user_id(request)
+    if user_id is not None and is_pinned(user_id):
+        return None
+    healthy = [alias for alias in settings.DATABASE_REPLICAS if is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+@contextmanager
+def reading_from(alias):
+    """Routes reads made inside the block to the given database alias."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to the replica chosen for the current request (if any) and all
+    writes to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,46 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.common.catalog_io import CATALOG, csv_columns, export_records, to_csv_row
+
+
+class Command(BaseCommand):
+    help = (
+        'Export the catalog (properties, packages, houseboats, activities, cabs) as JSON lines '
+        'or, for a single --type, CSV. Rows are streamed, so memory stays flat on large catalogs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=sorted(CATALOG), action='append', dest='types', help='Catalog type to export (repeatable, default: all)')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help='Output format')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Top-level rows loaded per query')
+
+    def handle(self, *args, **options):
+        types = options['types'] or list(CATALOG)
+        if options['format'] == 'csv' and len(types) != 1:
+            raise CommandError('CSV export needs exactly one --type')
+
+        out = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        count = 0
+        try:
+            if options['format'] == 'csv':
+                node = CATALOG[types[0]]
+                writer = csv.writer(out)
+                writer.writerow(csv_columns(node))
+                for record in export_records(node, options['chunk_size']):
+                    writer.writerow(to_csv_row(node, record))
+                    count += 1
+            else:
+                for name in types:
+                    for record in export_records(CATALOG[name], options['chunk_size']):
+                        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        # Keep stdout clean when the export itself goes there
+        (self.stdout if options['output'] else self.stderr).write(self.style.SUCCESS(f'Exported {count} records'))
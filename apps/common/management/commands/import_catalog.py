@@ -0,0 +1,87 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.common.catalog_io import CATALOG, CatalogImporter, from_csv_row
+
+
+class Command(BaseCommand):
+    help = (
+        'Upsert catalog records from a JSON lines file (as written by export_catalog) or a CSV '
+        'of one --type, matching existing rows by natural key. --dry-run prints the changes without keeping them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help='Input format (default: from the file extension)')
+        parser.add_argument('--type', choices=sorted(CATALOG), help='Catalog type of every row (required for CSV)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Records written per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Show the diff and roll every change back')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['path'].endswith('.csv') else 'jsonl')
+        if fmt == 'csv' and not options['type']:
+            raise CommandError('CSV import needs --type')
+
+        importer = CatalogImporter(
+            dry_run=options['dry_run'],
+            report=self.stdout.write if options['dry_run'] else None,
+            batch_size=options['chunk_size'],
+        )
+        source = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        try:
+            chunk, chunk_type = [], None
+            for line, record_type, record in self.read(source, fmt, options['type'], importer.errors):
+                if record_type not in CATALOG:
+                    importer.errors.append((line, f'unknown type {record_type!r}'))
+                    continue
+                # A chunk holds one type so each level is a single bulk write
+                if chunk and (record_type != chunk_type or len(chunk) == options['chunk_size']):
+                    importer.import_chunk(CATALOG[chunk_type], chunk)
+                    chunk = []
+                chunk_type = record_type
+                chunk.append((line, record))
+            if chunk:
+                importer.import_chunk(CATALOG[chunk_type], chunk)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        for line, message in importer.errors:
+            self.stderr.write(self.style.ERROR(f'line {line}: {message}'))
+        for name, counts in importer.stats.items():
+            summary = ', '.join(f'{counts[key]} {key}' for key in ('created', 'updated', 'unchanged', 'relinked', 'failed') if counts[key])
+            self.stdout.write(f'{name}: {summary}')
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        style = self.style.WARNING if importer.errors else self.style.SUCCESS
+        self.stdout.write(style(f'{verb} with {len(importer.errors)} errors'))
+
+    def read(self, source, fmt, record_type, errors):
+        """Yields (line number, type, record) without loading the whole file.
+
+        Lines that cannot be parsed are added to ``errors`` and skipped.
+        """
+        if fmt == 'csv':
+            node = CATALOG[record_type]
+            reader = csv.DictReader(source)
+            for row in reader:
+                try:
+                    record = from_csv_row(node, row)
+                except ValueError as exc:
+                    errors.append((reader.line_num, str(exc)))
+                    continue
+                yield reader.line_num, record_type, record
+            return
+        for number, text in enumerate(source, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                errors.append((number, str(exc)))
+                continue
+            if not isinstance(record, dict):
+                errors.append((number, 'expected a JSON object'))
+                continue
+            yield number, record.pop('type', record_type), record
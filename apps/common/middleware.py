@@ -0,0 +1,26 @@
+from django.conf import settings
+
+from apps.common import db_router
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pins a user's catalog reads to the primary database for a short window after
+    they make a successful write (read-your-writes with replicas).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in db_router.SAFE_METHODS
+            and response.status_code < 400
+        ):
+            # DRF copies the authenticated (JWT) user back onto the HttpRequest
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                db_router.pin_to_primary(user.pk)
+        return response
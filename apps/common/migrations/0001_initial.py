@@ -0,0 +1,27 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('name', models.CharField(help_text='Series name, e.g. booking-reference or invoice:TB/26-27', max_length=100, unique=True)),
+                ('next_value', models.BigIntegerField(default=1, help_text='Next value that has not been handed out')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('name', models.CharField(help_text='Backfill name (the management command)', max_length=100, unique=True)),
+                ('last_pk', models.BigIntegerField(blank=True, help_text='Highest source primary key already processed', null=True)),
+                ('processed', models.BigIntegerField(default=0, help_text='Source rows processed so far')),
+                ('written', models.BigIntegerField(default=0, help_text='Rows created or updated so far')),
+                ('started_at', models.DateTimeField(blank=True, help_text='When the current pass started', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the last pass reached the end of the source', null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
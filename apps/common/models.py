@@ -7,3 +7,31 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Sequence(TimeStampedModel):
+    """
+    Named counter behind human-readable numbers; allocated through
+    apps.common.sequences.SequenceService only.
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Series name, e.g. booking-reference or invoice:TB/26-27")
+    next_value = models.BigIntegerField(default=1, help_text="Next value that has not been handed out")
+
+    def __str__(self):
+        return f"{self.name} -> {self.next_value}"
+
+
+class BackfillCheckpoint(TimeStampedModel):
+    """
+    Progress of a backfill command (apps.common.backfill): the last primary key
+    it has committed, so an interrupted run picks up where it stopped.
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Backfill name (the management command)")
+    last_pk = models.BigIntegerField(null=True, blank=True, help_text="Highest source primary key already processed")
+    processed = models.BigIntegerField(default=0, help_text="Source rows processed so far")
+    written = models.BigIntegerField(default=0, help_text="Rows created or updated so far")
+    started_at = models.DateTimeField(null=True, blank=True, help_text="When the current pass started")
+    finished_at = models.DateTimeField(null=True, blank=True, help_text="When the last pass reached the end of the source")
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_pk}"
@@ -0,0 +1,112 @@
+"""
+Per-date rates, shared by room types (apps.properties) and houseboats.
+
+A rate row sets the nightly base price of one bookable thing on one date, in
+place of its static base price, and can close the night for sale. Rows are
+either entered by hand (MANUAL) or expanded from a season (SEASON): a price
+over a date range, optionally on some weekdays only. Where seasons overlap the
+one starting later wins, and a manual row wins over the seasonal one for its
+night.
+
+Lookups read a date range for a set of targets in one query and lay the result
+out as day-indexed lists (price_line, occupancy_line), so a calendar is a few
+element-wise passes over short lists rather than a query per day, and the
+price of every stay of a given length is a sliding sum (window_sums).
+"""
+from datetime import timedelta
+from itertools import accumulate
+
+MANUAL = "manual"
+SEASON = "season"
+RATE_SOURCE_CHOICES = (
+    (MANUAL, "Manual"),
+    (SEASON, "Season"),
+)
+
+# Bookings that hold their rooms on the calendar; drafts are carts and hold nothing
+HELD_STATUSES = ("pending", "confirmed", "completed")
+
+# Seasons are expanded into one row per night, so their length is capped
+MAX_SEASON_DAYS = 400
+
+
+def stay_nights(check_in, check_out):
+    """Nights of a stay; a same-day stay is priced as one night, as in booking pricing."""
+    return [check_in + timedelta(days=offset) for offset in range(max((check_out - check_in).days, 1))]
+
+
+def season_dates(season):
+    """Dates a season applies to."""
+    weekdays = {int(day) for day in season.weekdays} if season.weekdays else None
+    night = season.start_date
+    while night <= season.end_date:
+        if weekdays is None or night.weekday() in weekdays:
+            yield night
+        night += timedelta(days=1)
+
+
+def expand_seasons(rate_model, target, seasons):
+    """
+    Replaces the seasonal rate rows of one target (its foreign key values,
+    e.g. {"houseboat_id": 3}) with the expansion of `seasons`, which must be
+    all the seasons of that target.
+    """
+    rate_model.objects.filter(source=SEASON, **target).delete()
+    winners = {}
+    for season in sorted(seasons, key=lambda season: (season.start_date, season.pk)):
+        for night in season_dates(season):
+            winners[night] = season
+    rate_model.objects.bulk_create(
+        [
+            rate_model(date=night, price=season.price, source=SEASON, season=season, **target)
+            for night, season in sorted(winners.items())
+        ],
+        batch_size=1000,
+    )
+
+
+def price_line(rates, start, days, base_price):
+    """
+    Nightly (prices, closed) lists for `days` nights from `start`, from rate
+    dicts (date, price, is_closed, source) of one target. Nights without a rate
+    keep base_price; a manual row without a price only changes is_closed.
+    """
+    prices = [base_price] * days
+    closed = [False] * days
+    # Seasonal rows first, so manual rows for the same night overwrite them
+    for rate in sorted(rates, key=lambda rate: rate["source"] == MANUAL):
+        index = (rate["date"] - start).days
+        if 0 <= index < days:
+            if rate["price"] is not None:
+                prices[index] = rate["price"]
+            closed[index] = rate["is_closed"]
+    return prices, closed
+
+
+def occupancy_line(stays, start, days):
+    """Units occupied on each of `days` nights from `start`, from (check_in, check_out) pairs of one unit each."""
+    change = [0] * (days + 1)
+    for check_in, check_out in stays:
+        first = max((check_in - start).days, 0)
+        last = min((check_out - start).days, days)
+        if first < last:
+            change[first] += 1
+            change[last] -= 1
+    occupied, running = [], 0
+    for delta in change[:days]:
+        running += delta
+        occupied.append(running)
+    return occupied
+
+
+def window_sums(values, size):
+    """
+    Sums of every run of `size` consecutive values (one per start index), or
+    None for runs containing a None; differences of prefix sums, not a sum per run.
+    """
+    totals = list(accumulate((0 if value is None else value for value in values), initial=0))
+    missing = list(accumulate((value is None for value in values), initial=0))
+    return [
+        None if missing[index + size] - missing[index] else totals[index + size] - totals[index]
+        for index in range(len(values) - size + 1)
+    ]
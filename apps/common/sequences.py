@@ -0,0 +1,120 @@
+"""
+Allocation of human-readable numbers from the Sequence table.
+
+Two strategies, depending on whether gaps are acceptable:
+
+    SequenceService.next_value(name)      booking references
+        Each process reserves SEQUENCE_BLOCK_SIZE values in one short
+        transaction and hands them out from memory, so checkouts never queue
+        on the counter row. Values are unique but not consecutive: a block
+        left unused when a worker restarts becomes a gap.
+
+    SequenceService.next_gap_free(name)   invoice numbers
+        Increments the counter inside the caller's transaction, so the number
+        commits or rolls back together with the document that carries it.
+        Callers holding the row lock serialize, so use it at the very end of a
+        short transaction.
+"""
+import os
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Sequence
+
+# Crockford's base 32: no I, L, O or U, so references survive being read out
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+
+def encode(value, width=6):
+    digits = ""
+    while value:
+        value, remainder = divmod(value, 32)
+        digits = ALPHABET[remainder] + digits
+    return digits.rjust(width, "0")
+
+
+class SequenceService:
+
+    @staticmethod
+    def ensure(name):
+        if not Sequence.objects.filter(name=name).exists():
+            try:
+                with transaction.atomic(using=router.db_for_write(Sequence)):
+                    Sequence.objects.create(name=name)
+            except IntegrityError:
+                # Created concurrently
+                pass
+
+    @staticmethod
+    def reserve(name, count):
+        """Takes count consecutive values; returns the first one."""
+        with transaction.atomic(using=router.db_for_write(Sequence)):
+            SequenceService.ensure(name)
+            # The UPDATE holds the row lock until commit, so the read below sees only our increment
+            Sequence.objects.filter(name=name).update(next_value=F("next_value") + count)
+            end = Sequence.objects.filter(name=name).values_list("next_value", flat=True).get()
+        return end - count
+
+    @staticmethod
+    def reserve_committed(name, count):
+        """
+        reserve() that commits straight away even when called inside a
+        transaction: a block that rolled back with the caller would be handed
+        out again by another process.
+        """
+        alias = router.db_for_write(Sequence)
+        connection = connections[alias]
+        # SQLite allows one writer at a time, so a second connection would only wait on this one
+        if not connection.in_atomic_block or connection.vendor == "sqlite":
+            return SequenceService.reserve(name, count)
+
+        table = connection.ops.quote_name(Sequence._meta.db_table)
+        now = timezone.now()
+        own = connections.create_connection(alias)
+        try:
+            with own.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (name, next_value, created_at, updated_at) VALUES (%s, 1, %s, %s) "
+                    f"ON CONFLICT (name) DO NOTHING",
+                    [name, now, now],
+                )
+                cursor.execute(
+                    f"UPDATE {table} SET next_value = next_value + %s, updated_at = %s WHERE name = %s RETURNING next_value",
+                    [count, now, name],
+                )
+                end = cursor.fetchone()[0]
+        finally:
+            own.close()
+        return end - count
+
+    @staticmethod
+    def next_value(name):
+        """Next value from this process's pre-allocated block."""
+        with _blocks_lock:
+            block = _blocks.get(name)
+            # A forked worker must not hand out its parent's values
+            if block is None or block["pid"] != os.getpid() or block["next"] >= block["end"]:
+                size = settings.SEQUENCE_BLOCK_SIZE
+                start = SequenceService.reserve_committed(name, size)
+                block = _blocks[name] = {"pid": os.getpid(), "next": start, "end": start + size}
+            value = block["next"]
+            block["next"] += 1
+        return value
+
+    @staticmethod
+    def next_gap_free(name):
+        """Next consecutive value; must be called inside the transaction that uses it."""
+        if not transaction.get_connection(router.db_for_write(Sequence)).in_atomic_block:
+            raise RuntimeError("next_gap_free() must run inside the transaction that stores the number.")
+        return SequenceService.reserve(name, 1)
+
+    @staticmethod
+    def booking_reference():
+        return f"{settings.BOOKING_REFERENCE_PREFIX}{encode(SequenceService.next_value('booking-reference'))}"
@@ -1,2 +1,16 @@
 # Common utility functions for the application
+from django.utils.text import slugify
 
+
+def unique_slug(instance, text, field="slug"):
+    """slugify(text), with -2, -3, ... appended until no other row of the model uses it."""
+    max_length = instance._meta.get_field(field).max_length
+    base = slugify(text)[:max_length - 6].strip("-") or instance._meta.model_name
+    taken = set(
+        type(instance)._default_manager.filter(**{f"{field}__startswith": base})
+        .exclude(pk=instance.pk).values_list(field, flat=True)
+    )
+    slug, number = base, 2
+    while slug in taken:
+        slug, number = f"{base}-{number}", number + 1
+    return slug
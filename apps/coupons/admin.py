@@ -1,19 +1,20 @@
 from django.contrib import admin
-from .models import Coupon, CouponUsage
+from .models import Coupon, CouponUsage, CouponUserCounter
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 
 @admin.register(Coupon)
-class CouponAdmin(admin.ModelAdmin):
-    list_display = ('code', 'discount_amount', 'valid_from', 'valid_to', 'created_at')
-    list_filter = ('valid_from', 'valid_to', 'created_at', 'updated_at')
+class CouponAdmin(PerformanceModelAdmin):
+    list_display = ('code', 'discount_amount', 'valid_from', 'valid_to', 'is_active', 'times_used', 'usage_limit', 'created_at')
+    list_filter = ('is_active', 'valid_from', 'valid_to', 'created_at', 'updated_at')
     search_fields = ('code',)
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('times_used', 'created_at', 'updated_at')
 
 
 @admin.register(CouponUsage)
-class CouponUsageAdmin(admin.ModelAdmin):
+class CouponUsageAdmin(PerformanceModelAdmin):
     list_display = ('coupon', 'booking', 'user', 'created_at')
     list_filter = ('created_at', 'updated_at', 'coupon__code')
     search_fields = ('coupon__code', 'booking__id', 'user__username', 'user__email')
@@ -21,3 +22,11 @@ class CouponUsageAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(CouponUserCounter)
+class CouponUserCounterAdmin(PerformanceModelAdmin):
+    list_display = ('coupon', 'user', 'times_used', 'updated_at')
+    search_fields = ('coupon__code', 'user__username', 'user__phone')
+    raw_id_fields = ('coupon', 'user')
+    readonly_fields = ('times_used', 'created_at', 'updated_at')
@@ -5,3 +5,5 @@ class CouponsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.coupons'
 
+    def ready(self):
+        import apps.coupons.signals
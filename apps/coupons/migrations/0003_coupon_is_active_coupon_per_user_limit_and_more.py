@@ -0,0 +1,51 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('coupons', '0002_alter_coupon_code_alter_coupon_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coupon',
+            name='is_active',
+            field=models.BooleanField(default=True, help_text='Uncheck to withdraw the coupon before its end date'),
+        ),
+        migrations.AddField(
+            model_name='coupon',
+            name='per_user_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum redemptions per user; empty for unlimited', null=True),
+        ),
+        migrations.AddField(
+            model_name='coupon',
+            name='times_used',
+            field=models.PositiveIntegerField(default=0, help_text='Redemptions so far (updated atomically on booking confirmation)'),
+        ),
+        migrations.AddField(
+            model_name='coupon',
+            name='usage_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum redemptions across all users; empty for unlimited', null=True),
+        ),
+        migrations.CreateModel(
+            name='CouponUserCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('times_used', models.PositiveIntegerField(default=0, help_text='Redemptions of this coupon by this user')),
+                ('coupon', models.ForeignKey(help_text='Coupon being counted', on_delete=django.db.models.deletion.CASCADE, related_name='user_counters', to='coupons.coupon')),
+                ('user', models.ForeignKey(help_text='User who redeemed the coupon', on_delete=django.db.models.deletion.CASCADE, related_name='coupon_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='couponusercounter',
+            constraint=models.UniqueConstraint(fields=('coupon', 'user'), name='unique_coupon_counter_per_user'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0003_coupon_is_active_coupon_per_user_limit_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='couponusage',
+            constraint=models.UniqueConstraint(fields=('coupon', 'booking'), name='unique_coupon_usage_per_booking'),
+        ),
+    ]
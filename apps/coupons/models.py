@@ -7,6 +7,10 @@ class Coupon(TimeStampedModel):
     discount_amount = models.DecimalField(max_digits=10, decimal_places=2, help_text="Discount amount for the coupon")
     valid_from = models.DateField(help_text="Start date for coupon validity")
     valid_to = models.DateField(help_text="End date for coupon validity")
+    is_active = models.BooleanField(default=True, help_text="Uncheck to withdraw the coupon before its end date")
+    usage_limit = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum redemptions across all users; empty for unlimited")
+    per_user_limit = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum redemptions per user; empty for unlimited")
+    times_used = models.PositiveIntegerField(default=0, help_text="Redemptions so far (updated atomically on booking confirmation)")
 
     def __str__(self):
         return f"{self.code} - ₹{self.discount_amount}"
@@ -16,3 +20,26 @@ class CouponUsage(TimeStampedModel):
     coupon = models.ForeignKey(Coupon, on_delete=models.CASCADE, help_text="Used coupon")
     booking = models.ForeignKey("bookings.Booking", on_delete=models.CASCADE, help_text="Related booking")
     user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, help_text="User who used the coupon")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["coupon", "booking"], name="unique_coupon_usage_per_booking"),
+        ]
+
+
+class CouponUserCounter(TimeStampedModel):
+    """
+    Per-user redemption counter for coupons with a per_user_limit, so limits are
+    checked with a single conditional UPDATE instead of counting CouponUsage rows.
+    """
+    coupon = models.ForeignKey(Coupon, on_delete=models.CASCADE, related_name="user_counters", help_text="Coupon being counted")
+    user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, related_name="coupon_counters", help_text="User who redeemed the coupon")
+    times_used = models.PositiveIntegerField(default=0, help_text="Redemptions of this coupon by this user")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["coupon", "user"], name="unique_coupon_counter_per_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.coupon.code} x{self.times_used} ({self.user_id})"
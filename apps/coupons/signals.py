@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.coupons.services import CouponService
+from .models import Coupon
+
+
+@receiver(post_save, sender=Coupon)
+@receiver(post_delete, sender=Coupon)
+def refresh_coupon_cache(sender, instance, **kwargs):
+    """
+    Makes every process reload its active-coupon cache on the next lookup.
+    Usage counters are bumped with update(), which does not fire this.
+    """
+    CouponService.invalidate()
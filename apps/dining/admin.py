@@ -1,12 +1,13 @@
 from django.contrib import admin
 from .models import FoodDestination, FoodDestinationImage
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 class FoodDestinationImageInline(admin.TabularInline):
     model = FoodDestinationImage
     extra = 1
 
 @admin.register(FoodDestination)
-class FoodDestinationAdmin(admin.ModelAdmin):
+class FoodDestinationAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = ("name", "location", "price_per_person", "rating", "is_active")
     list_filter = ("is_active", "location")
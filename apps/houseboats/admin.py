@@ -1,23 +1,14 @@
 from django.contrib import admin
-from django.utils.html import format_html
 from .models import (
     HouseBoat, HouseBoatImage, HouseBoatSpecification,
     HouseBoatTiming, HouseBoatMealPlan, HouseBoatRoute,
-    HouseBoatPolicy, HouseBoatInclusion
+    HouseBoatPolicy, HouseBoatInclusion, HouseBoatRate, HouseBoatRateSeason
 )
+from apps.common.admin_mixins import ImagePreviewMixin, PerformanceModelAdmin
 
-class HouseBoatImageInline(admin.TabularInline):
+class HouseBoatImageInline(ImagePreviewMixin, admin.TabularInline):
     model = HouseBoatImage
     extra = 1
-    readonly_fields = ("image_preview",)
-
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
 class HouseBoatSpecificationInline(admin.StackedInline):
     model = HouseBoatSpecification
@@ -47,8 +38,13 @@ class HouseBoatInclusionInline(admin.TabularInline):
     model = HouseBoatInclusion
     extra = 1
 
+class HouseBoatRateSeasonInline(admin.TabularInline):
+    model = HouseBoatRateSeason
+    extra = 0
+    fields = ("name", "start_date", "end_date", "weekdays", "price")
+
 @admin.register(HouseBoat)
-class HouseBoatAdmin(admin.ModelAdmin):
+class HouseBoatAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = ("name", "location", "base_price_per_night", "rating", "is_active", "created_at")
     list_filter = ("is_active", "location", "rating")
@@ -63,6 +59,7 @@ class HouseBoatAdmin(admin.ModelAdmin):
         HouseBoatRouteInline,
         HouseBoatInclusionInline,
         HouseBoatPolicyInline,
+        HouseBoatRateSeasonInline,
     ]
     
     date_hierarchy = "created_at"
@@ -81,3 +78,18 @@ class HouseBoatAdmin(admin.ModelAdmin):
             "classes": ("collapse",)
         }),
     )
+
+@admin.register(HouseBoatRate)
+class HouseBoatRateAdmin(PerformanceModelAdmin):
+    """Per-night prices and stop sales; seasonal rows are managed through the houseboat's seasons."""
+    list_display = ("houseboat", "date", "price", "is_closed", "source")
+    list_filter = ("source", "is_closed")
+    search_fields = ("houseboat__name",)
+    readonly_fields = ("source", "season")
+    date_hierarchy = "date"
+    ordering = ("houseboat", "date")
+
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and obj.season_id:
+            return False
+        return super().has_change_permission(request, obj)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class HouseboatsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.houseboats'
+
+    def ready(self):
+        import apps.houseboats.signals
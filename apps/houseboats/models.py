@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import RegexValidator
 from django.db import models
 from apps.common.models import TimeStampedModel
+from apps.common.rates import MANUAL, MAX_SEASON_DAYS, RATE_SOURCE_CHOICES
 from apps.properties.models import Discount
 
 class HouseBoat(TimeStampedModel):
@@ -33,11 +36,12 @@ class HouseBoat(TimeStampedModel):
     def __str__(self):
         return self.name
 
-    def calculate_pricing(self):
+    def calculate_pricing(self, base_price=None):
         """
-        Calculates pricing dictionary including discounts.
+        Calculates pricing dictionary including discounts, for the regular
+        nightly price or a given one (e.g. a per-date rate).
         """
-        base = self.base_price_per_night
+        base = self.base_price_per_night if base_price is None else base_price
         discounted = base
         discount_data = None
 
@@ -162,3 +166,58 @@ class HouseBoatInclusion(TimeStampedModel):
     def __str__(self):
         status = "Inclusion" if self.is_included else "Exclusion"
         return f"{status}: {self.text[:50]}..."
+
+class HouseBoatRateSeason(TimeStampedModel):
+    """
+    A nightly price for a houseboat over a date range. Saving or deleting a
+    season re-expands the boat's seasonal HouseBoatRate rows (see
+    apps/common/rates.py); where seasons overlap, the later start wins.
+    """
+    houseboat = models.ForeignKey(HouseBoat, on_delete=models.CASCADE, related_name="rate_seasons", help_text="Related houseboat")
+    name = models.CharField(max_length=100, help_text="Season name (e.g. Onam, Monsoon weekends)")
+    start_date = models.DateField(help_text="First night of the season")
+    end_date = models.DateField(help_text="Last night of the season")
+    weekdays = models.CharField(
+        max_length=7, blank=True, validators=[RegexValidator(r"^[0-6]*$", "Use digits 0 (Monday) to 6 (Sunday).")],
+        help_text="Nights the price applies on, as digits 0 (Monday) to 6 (Sunday); empty for every night"
+    )
+    price = models.DecimalField(max_digits=12, decimal_places=2, help_text="Base price per night during the season")
+
+    class Meta:
+        ordering = ["start_date"]
+
+    def __str__(self):
+        return f"{self.name} ({self.start_date} to {self.end_date})"
+
+    def clean(self):
+        if self.start_date and self.end_date:
+            if self.end_date < self.start_date:
+                raise ValidationError({"end_date": "The season cannot end before it starts."})
+            if (self.end_date - self.start_date).days > MAX_SEASON_DAYS:
+                raise ValidationError({"end_date": f"A season can cover at most {MAX_SEASON_DAYS} nights."})
+
+class HouseBoatRate(TimeStampedModel):
+    """
+    Nightly base price of a houseboat on one date, in place of
+    base_price_per_night, or a night closed for sale.
+    """
+    houseboat = models.ForeignKey(HouseBoat, on_delete=models.CASCADE, related_name="rates", help_text="Related houseboat")
+    date = models.DateField(help_text="Night the rate applies to")
+    price = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True, help_text="Base price for the night; empty keeps the regular price"
+    )
+    is_closed = models.BooleanField(default=False, help_text="Stop sale: the houseboat cannot be booked for this night")
+    source = models.CharField(max_length=10, choices=RATE_SOURCE_CHOICES, default=MANUAL, help_text="Entered by hand or expanded from a season")
+    season = models.ForeignKey(
+        HouseBoatRateSeason, on_delete=models.CASCADE, null=True, blank=True, related_name="rates", help_text="Season the rate was expanded from"
+    )
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            # Also the index for date-range reads per houseboat
+            models.UniqueConstraint(fields=["houseboat", "date", "source"], name="unique_houseboat_rate"),
+        ]
+
+    def __str__(self):
+        return f"{self.houseboat.name} on {self.date}"
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from apps.common.rates import expand_seasons
+from .models import HouseBoatRate, HouseBoatRateSeason
+
+
+@receiver(pre_save, sender=HouseBoatRateSeason)
+def remember_houseboat_rate_season_target(sender, instance, **kwargs):
+    """Keeps the houseboat the season applied to before this save, in case it moves."""
+    instance._previous_target = (
+        HouseBoatRateSeason.objects.filter(pk=instance.pk).values("houseboat_id").first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=HouseBoatRateSeason)
+@receiver(post_delete, sender=HouseBoatRateSeason)
+def expand_houseboat_rate_seasons(sender, instance, **kwargs):
+    """Rewrites the seasonal nightly rates of the season's houseboat, and of the one it moved from."""
+    target = {"houseboat_id": instance.houseboat_id}
+    previous = getattr(instance, "_previous_target", None)
+    for rates_target in [target] + ([previous] if previous and previous != target else []):
+        expand_seasons(HouseBoatRate, rates_target, HouseBoatRateSeason.objects.filter(**rates_target))
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Invoice
+from apps.common.admin_mixins import PerformanceModelAdmin
+
+
+@admin.register(Invoice)
+class InvoiceAdmin(PerformanceModelAdmin):
+    list_display = ('number', 'booking', 'issued_at', 'status', 'size', 'rendered_at')
+    list_filter = ('status', 'issued_at')
+    search_fields = ('number', 'booking__id', 'booking__gst_number', 'booking__company_name')
+    raw_id_fields = ('booking',)
+    date_hierarchy = 'issued_at'
+    ordering = ('-issued_at',)
+    readonly_fields = ('number', 'issued_at', 'status', 'content_hash', 'file', 'size', 'rendered_at', 'last_error', 'created_at', 'updated_at')
@@ -0,0 +1,7 @@
+from api.invoices.services import InvoiceService
+from apps.jobs.queue import job
+
+
+@job("invoices.generate")
+def generate_invoice(booking_id, force=False):
+    InvoiceService.generate(booking_id, force=force)
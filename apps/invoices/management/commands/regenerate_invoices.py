@@ -0,0 +1,71 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.bookings.models import Booking
+from apps.invoices.models import Invoice
+from api.invoices.services import INVOICEABLE_STATUSES, InvoiceService
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenerate the GST invoices issued in a month, rendering in a process pool. '
+        'Writes one CSV row per invoice to stdout as it completes (redirect to a file for finance).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', help='Month to regenerate, YYYY-MM')
+        parser.add_argument('--force', action='store_true', help='Re-render even when the invoice data is unchanged')
+        parser.add_argument('--create-missing', action='store_true', help='Also issue invoices for confirmed bookings created that month without one')
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='Renderer processes')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Invoices loaded and submitted per batch')
+
+    def handle(self, *args, **options):
+        try:
+            start = timezone.make_aware(datetime.strptime(options['month'], '%Y-%m'))
+        except ValueError:
+            raise CommandError('month must look like 2026-09')
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+
+        if options['create_missing']:
+            missing = Booking.objects.filter(
+                status__in=INVOICEABLE_STATUSES, created_at__gte=start, created_at__lt=end, invoice__isnull=True
+            )
+            for booking in missing.only('id').iterator(chunk_size=options['chunk_size']):
+                InvoiceService.ensure(booking)
+
+        ids = Invoice.objects.filter(issued_at__gte=start, issued_at__lt=end).order_by('issued_at', 'id').values_list('id', flat=True)
+        writer = csv.writer(self.stdout)
+        writer.writerow(['invoice_number', 'booking_id', 'issued_at', 'status', 'outcome', 'size', 'etag', 'error'])
+
+        counts = {'rendered': 0, 'unchanged': 0, 'failed': 0}
+        executor = ProcessPoolExecutor(options['processes'], mp_context=multiprocessing.get_context('spawn')) if options['processes'] > 0 else None
+        try:
+            chunk = []
+            for invoice_id in ids.iterator(chunk_size=options['chunk_size']):
+                chunk.append(invoice_id)
+                if len(chunk) == options['chunk_size']:
+                    self.render_chunk(chunk, executor, options['force'], writer, counts)
+                    chunk = []
+            if chunk:
+                self.render_chunk(chunk, executor, options['force'], writer, counts)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        self.stderr.write(self.style.SUCCESS(
+            f"{counts['rendered']} rendered, {counts['unchanged']} unchanged, {counts['failed']} failed"
+        ))
+
+    def render_chunk(self, ids, executor, force, writer, counts):
+        invoices = Invoice.objects.filter(id__in=ids).select_related('booking').order_by('issued_at', 'id')
+        for invoice, outcome in InvoiceService.render(invoices, executor, force):
+            counts[outcome] += 1
+            writer.writerow([
+                invoice.number, invoice.booking_id, invoice.issued_at.isoformat(), invoice.status,
+                outcome, invoice.size, invoice.content_hash, invoice.last_error,
+            ])
+            self.stdout.flush()
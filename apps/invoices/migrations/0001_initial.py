@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:35
+
+import apps.invoices.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('bookings', '0012_booking_cart_hash_idempotencykey_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('number', models.CharField(help_text='Invoice number printed on the document', max_length=50, unique=True)),
+                ('issued_at', models.DateTimeField(db_index=True, help_text='Invoice date')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', help_text='Rendering state', max_length=20)),
+                ('content_hash', models.CharField(blank=True, help_text='SHA-256 of the data the current PDF was rendered from', max_length=64)),
+                ('file', models.FileField(blank=True, help_text='Rendered PDF', storage=apps.invoices.models.invoice_storage, upload_to=apps.invoices.models.invoice_upload_to)),
+                ('size', models.PositiveIntegerField(default=0, help_text='PDF size in bytes')),
+                ('rendered_at', models.DateTimeField(blank=True, help_text='When the current PDF was rendered', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='Most recent rendering error')),
+                ('booking', models.OneToOneField(help_text='Invoiced booking', on_delete=django.db.models.deletion.PROTECT, related_name='invoice', to='bookings.booking')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
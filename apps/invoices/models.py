@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+from django.utils.module_loading import import_string
+from apps.common.models import TimeStampedModel
+
+
+def invoice_storage():
+    # PDFs are not images, so they can't go to the default (image) media storage
+    return import_string(settings.INVOICE_FILE_STORAGE)()
+
+
+def invoice_upload_to(instance, filename):
+    return f"invoices/{instance.issued_at:%Y/%m}/{filename}"
+
+
+class Invoice(TimeStampedModel):
+    """
+    GST invoice for a confirmed booking. The PDF is rendered in the background
+    (see api/invoices/services.py) and kept in INVOICE_FILE_STORAGE;
+    content_hash identifies the data it was rendered from and doubles as the
+    download ETag.
+    """
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (READY, "Ready"),
+        (FAILED, "Failed"),
+    )
+
+    booking = models.OneToOneField("bookings.Booking", on_delete=models.PROTECT, related_name="invoice", help_text="Invoiced booking")
+    number = models.CharField(max_length=50, unique=True, help_text="Invoice number printed on the document")
+    issued_at = models.DateTimeField(db_index=True, help_text="Invoice date")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, help_text="Rendering state")
+    content_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the data the current PDF was rendered from")
+    file = models.FileField(upload_to=invoice_upload_to, storage=invoice_storage, blank=True, help_text="Rendered PDF")
+    size = models.PositiveIntegerField(default=0, help_text="PDF size in bytes")
+    rendered_at = models.DateTimeField(null=True, blank=True, help_text="When the current PDF was rendered")
+    last_error = models.TextField(blank=True, help_text="Most recent rendering error")
+
+    def __str__(self):
+        return f"{self.number} (booking {self.booking_id})"
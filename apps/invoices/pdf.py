@@ -0,0 +1,148 @@
+"""
+Minimal PDF writer for GST invoices.
+
+Renders plain invoice data (strings only, no Django objects) into a text PDF
+using the built-in Helvetica fonts, so it needs no extra dependency and can run
+in a process pool worker without Django set up. Output is deterministic: the
+same data always produces the same bytes.
+"""
+import zlib
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+MARGIN = 48
+LINE_HEIGHT = 14
+
+
+def escape(text):
+    text = str(text).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    # Standard fonts only cover Latin-1
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+class Canvas:
+    """Collects text operations page by page."""
+
+    def __init__(self):
+        self.pages = []
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def text(self, x, text, bold=False, size=10):
+        self.ops.append(f"BT /{'F2' if bold else 'F1'} {size} Tf {x} {self.y} Td ({escape(text)}) Tj ET")
+
+    def right(self, x, text, bold=False, size=10):
+        # Helvetica digits are 0.556 em wide; close enough to right-align amounts
+        self.text(x - len(str(text)) * size * 0.556, text, bold, size)
+
+    def rule(self):
+        y = self.y + LINE_HEIGHT - 4
+        self.ops.append(f"0.5 w {MARGIN} {y} m {PAGE_WIDTH - MARGIN} {y} l S")
+
+    def newline(self, lines=1):
+        self.y -= LINE_HEIGHT * lines
+        if self.y < MARGIN:
+            self.new_page()
+
+
+def build(pages):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for ops in pages:
+        stream = zlib.compress("\n".join(ops).encode("latin-1"))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render_invoice_pdf(data):
+    """Returns the PDF bytes for the dict built by InvoiceService.build_data()."""
+    canvas = Canvas()
+    right_edge = PAGE_WIDTH - MARGIN
+
+    seller = data["seller"]
+    canvas.text(MARGIN, seller["name"], bold=True, size=14)
+    canvas.right(right_edge, "TAX INVOICE", bold=True, size=14)
+    canvas.newline()
+    for line in seller["address"].splitlines():
+        canvas.text(MARGIN, line)
+        canvas.newline()
+    if seller["gstin"]:
+        canvas.text(MARGIN, f"GSTIN: {seller['gstin']}")
+        canvas.newline()
+    canvas.newline()
+
+    for label, value in (
+        ("Invoice No.", data["number"]),
+        ("Invoice Date", data["date"]),
+        ("Booking", data["booking_reference"]),
+        ("Place of Supply", data["place_of_supply"]),
+    ):
+        canvas.text(MARGIN, label, bold=True)
+        canvas.text(MARGIN + 110, value)
+        canvas.newline()
+    canvas.newline()
+
+    buyer = data["buyer"]
+    canvas.text(MARGIN, "Billed To", bold=True)
+    canvas.newline()
+    for line in [buyer["name"], *buyer["address"].splitlines()]:
+        if line:
+            canvas.text(MARGIN, line)
+            canvas.newline()
+    if buyer["gstin"]:
+        canvas.text(MARGIN, f"GSTIN: {buyer['gstin']}")
+        canvas.newline()
+    canvas.newline()
+
+    canvas.text(MARGIN, "Description", bold=True)
+    canvas.text(MARGIN + 300, "SAC", bold=True)
+    canvas.text(MARGIN + 360, "Qty", bold=True)
+    canvas.right(right_edge, "Amount incl. GST (INR)", bold=True)
+    canvas.newline()
+    canvas.rule()
+    for line in data["lines"]:
+        canvas.text(MARGIN, line["description"][:55])
+        canvas.text(MARGIN + 300, data["sac"])
+        canvas.text(MARGIN + 360, line["quantity"])
+        canvas.right(right_edge, line["amount"])
+        canvas.newline()
+        if line["detail"]:
+            canvas.text(MARGIN + 10, line["detail"][:70], size=8)
+            canvas.newline()
+    canvas.rule()
+
+    for label, value in data["totals"]:
+        canvas.text(MARGIN + 260, label, bold=label == "Total")
+        canvas.right(right_edge, value, bold=label == "Total")
+        canvas.newline()
+    canvas.newline()
+    canvas.text(MARGIN, f"Amount paid: INR {data['amount_paid']}")
+    canvas.newline(2)
+    canvas.text(MARGIN, "This is a computer generated invoice and does not require a signature.", size=8)
+    return build(canvas.pages)
@@ -0,0 +1,21 @@
+from django.contrib import admin, messages
+from django.utils import timezone
+from .models import Job
+from apps.common.admin_mixins import PerformanceModelAdmin
+
+
+@admin.register(Job)
+class JobAdmin(PerformanceModelAdmin):
+    list_display = ('id', 'name', 'queue', 'priority', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'queue', 'name')
+    search_fields = ('name', 'locked_by', 'last_error')
+    ordering = ('-id',)
+    readonly_fields = ('attempts', 'locked_by', 'locked_at', 'finished_at', 'last_error', 'created_at', 'updated_at')
+    actions = ('retry_jobs',)
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, locked_by="", locked_at=None, finished_at=None
+        )
+        self.message_user(request, f"Requeued {updated} jobs.", messages.SUCCESS)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import JobQueue
+
+
+class Command(BaseCommand):
+    help = "Deletes succeeded background jobs older than --days (failed jobs are kept for inspection)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        deleted = JobQueue.purge(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished jobs"))
@@ -0,0 +1,54 @@
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs.queue import JobQueue
+
+
+class Command(BaseCommand):
+    help = "Runs background jobs from the database queue until stopped (SIGTERM finishes the current batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="append", dest="queues", help="Queue to serve (repeatable; default: all)")
+        parser.add_argument("--batch", type=int, default=10, help="Jobs claimed per poll")
+        parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL, help="Seconds to sleep when no job is due")
+        parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}", help="Name recorded on claimed jobs")
+        parser.add_argument("--once", action="store_true", help="Drain the due jobs and exit")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker_id = options["worker_id"]
+        self.stdout.write(f"Worker {worker_id} serving {', '.join(options['queues'] or ['all queues'])}")
+        processed = failed = 0
+        last_sweep = 0.0
+        while not self.stopping:
+            close_old_connections()
+            if time.monotonic() - last_sweep > settings.JOB_LOCK_TIMEOUT / 2:
+                requeued, expired = JobQueue.requeue_stale()
+                if requeued or expired:
+                    self.stdout.write(f"Requeued {requeued} stale jobs, failed {expired}")
+                last_sweep = time.monotonic()
+
+            jobs = JobQueue.claim(worker_id, options["queues"], options["batch"])
+            for job in jobs:
+                processed += 1
+                if not JobQueue.run(job):
+                    failed += 1
+
+            if not jobs:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} stopped: {processed} jobs run, {failed} failed"))
+
+    def stop(self, signum, frame):
+        self.stopping = True
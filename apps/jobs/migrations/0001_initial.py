@@ -0,0 +1,38 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('queue', models.CharField(default='default', help_text='Queue the job is routed to; workers can serve a subset', max_length=50)),
+                ('name', models.CharField(help_text='Registered handler name, e.g. bookings.confirmed', max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Keyword arguments passed to the handler')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Higher runs first')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', help_text='Current state of the job', max_length=20)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may run (pushed back on retry)')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Times the job has been started')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, help_text='Attempts before the job is marked failed')),
+                ('locked_by', models.CharField(blank=True, help_text='Worker currently running the job', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, help_text='When the current worker claimed the job', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the job succeeded or finally failed', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='Traceback of the most recent failure')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'queue', '-priority', 'run_at'], name='job_claim_idx'), models.Index(fields=['status', 'locked_at'], name='job_locked_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+from apps.common.models import TimeStampedModel
+
+
+class Job(TimeStampedModel):
+    """
+    A unit of background work, claimed and run by the run_jobs worker.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    )
+
+    queue = models.CharField(max_length=50, default="default", help_text="Queue the job is routed to; workers can serve a subset")
+    name = models.CharField(max_length=100, help_text="Registered handler name, e.g. bookings.confirmed")
+    payload = models.JSONField(default=dict, blank=True, help_text="Keyword arguments passed to the handler")
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED, help_text="Current state of the job")
+    run_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the job may run (pushed back on retry)")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Times the job has been started")
+    max_attempts = models.PositiveSmallIntegerField(default=5, help_text="Attempts before the job is marked failed")
+    locked_by = models.CharField(max_length=100, blank=True, help_text="Worker currently running the job")
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="When the current worker claimed the job")
+    finished_at = models.DateTimeField(null=True, blank=True, help_text="When the job succeeded or finally failed")
+    last_error = models.TextField(blank=True, help_text="Traceback of the most recent failure")
+
+    class Meta:
+        indexes = [
+            # Claim order: WHERE status='queued' AND run_at <= now ORDER BY priority DESC, run_at
+            models.Index(fields=["status", "queue", "-priority", "run_at"], name="job_claim_idx"),
+            models.Index(fields=["status", "locked_at"], name="job_locked_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
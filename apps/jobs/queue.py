@@ -0,0 +1,168 @@
+"""
+Database-backed job queue.
+
+Jobs are rows in apps.jobs.Job, so enqueueing needs no broker and shares the
+application's database and transactions. Workers (manage.py run_jobs) claim
+due jobs in priority order: on PostgreSQL with SELECT ... FOR UPDATE SKIP
+LOCKED so concurrent workers never block on or double-claim a row, elsewhere
+(SQLite) with a conditional UPDATE per job that only one worker can win.
+
+Handlers are plain functions registered with @job("app.event") in an app's
+jobs.py module; they receive the job payload as keyword arguments and must be
+safe to run more than once, since a job whose worker dies is retried.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def job(name):
+    """Registers the decorated function as the handler for jobs called name."""
+    def register(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f"A handler for job '{name}' is already registered.")
+        _registry[name] = func
+        return func
+    return register
+
+
+def get_handler(name):
+    return _registry.get(name)
+
+
+class JobQueue:
+    """
+    Enqueue, claim and settle jobs. Every state change is a single conditional
+    UPDATE, so a job is only ever moved by the worker that holds it.
+    """
+
+    @staticmethod
+    def enqueue(name, payload=None, queue="default", priority=0, delay=0, max_attempts=None):
+        """Adds a job; delay (seconds) postpones its first run."""
+        return Job.objects.create(
+            name=name,
+            payload=payload or {},
+            queue=queue,
+            priority=priority,
+            run_at=timezone.now() + timedelta(seconds=delay),
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        )
+
+    @staticmethod
+    def enqueue_on_commit(name, payload=None, **options):
+        """
+        Enqueues once the surrounding transaction commits, so a rolled-back
+        booking never triggers side effects. Outside a transaction it enqueues
+        straight away.
+        """
+        transaction.on_commit(lambda: JobQueue.enqueue(name, payload, **options))
+
+    @staticmethod
+    def claim(worker_id, queues=None, limit=1):
+        """Marks up to limit due jobs as running for this worker and returns them."""
+        now = timezone.now()
+        due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+        if queues:
+            due = due.filter(queue__in=queues)
+        due = due.order_by("-priority", "run_at", "id")
+        running = dict(
+            status=Job.RUNNING, locked_by=worker_id, locked_at=now, attempts=F("attempts") + 1
+        )
+
+        alias = router.db_for_write(Job)
+        if connections[alias].features.has_select_for_update_skip_locked:
+            with transaction.atomic(using=alias):
+                ids = list(
+                    due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+                )
+                Job.objects.filter(id__in=ids).update(**running)
+        else:
+            # No row locks to skip: whoever flips the status first owns the job
+            ids = [
+                pk for pk in due.values_list("id", flat=True)[:limit]
+                if Job.objects.filter(pk=pk, status=Job.QUEUED).update(**running)
+            ]
+
+        return list(Job.objects.filter(id__in=ids, locked_by=worker_id).order_by("-priority", "run_at", "id"))
+
+    @staticmethod
+    def run(job_obj):
+        """Runs a claimed job and records the outcome. Returns True on success."""
+        handler = get_handler(job_obj.name)
+        if handler is None:
+            JobQueue.fail(job_obj, f"No handler registered for job '{job_obj.name}'.", retry=False)
+            return False
+        try:
+            handler(**job_obj.payload)
+        except Exception:
+            logger.exception("Job %s (%s) failed on attempt %s", job_obj.pk, job_obj.name, job_obj.attempts)
+            JobQueue.fail(job_obj, traceback.format_exc())
+            return False
+        JobQueue.complete(job_obj)
+        return True
+
+    @staticmethod
+    def complete(job_obj):
+        Job.objects.filter(pk=job_obj.pk, status=Job.RUNNING, locked_by=job_obj.locked_by).update(
+            status=Job.SUCCEEDED, finished_at=timezone.now(), locked_by="", locked_at=None, last_error=""
+        )
+
+    @staticmethod
+    def backoff(attempts):
+        """Seconds before retry number attempts: exponential, capped, with jitter."""
+        delay = min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+        # Jitter spreads retries of jobs that failed together (e.g. a provider outage)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def fail(job_obj, error, retry=True):
+        """Schedules a retry with backoff, or marks the job failed once attempts run out."""
+        jobs = Job.objects.filter(pk=job_obj.pk, status=Job.RUNNING, locked_by=job_obj.locked_by)
+        if retry and job_obj.attempts < job_obj.max_attempts:
+            jobs.update(
+                status=Job.QUEUED,
+                run_at=timezone.now() + timedelta(seconds=JobQueue.backoff(job_obj.attempts)),
+                locked_by="",
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            jobs.update(
+                status=Job.FAILED, finished_at=timezone.now(), locked_by="", locked_at=None, last_error=error
+            )
+
+    @staticmethod
+    def requeue_stale():
+        """
+        Releases jobs whose worker died mid-run (locked for longer than
+        JOB_LOCK_TIMEOUT); jobs without attempts left are marked failed.
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+        stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff)
+        error = "Worker stopped responding while running this job."
+        failed = stale.filter(attempts__gte=F("max_attempts")).update(
+            status=Job.FAILED, finished_at=timezone.now(), locked_by="", locked_at=None, last_error=error
+        )
+        requeued = stale.update(
+            status=Job.QUEUED, run_at=timezone.now(), locked_by="", locked_at=None, last_error=error
+        )
+        return requeued, failed
+
+    @staticmethod
+    def purge(days):
+        """Deletes succeeded jobs finished more than days ago."""
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = Job.objects.filter(status=Job.SUCCEEDED, finished_at__lt=cutoff).delete()
+        return deleted
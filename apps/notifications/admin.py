@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import Notification
+from apps.common.admin_mixins import PerformanceModelAdmin
+
+
+@admin.register(Notification)
+class NotificationAdmin(PerformanceModelAdmin):
+    list_display = ('id', 'kind', 'channel', 'recipient', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'channel', 'kind')
+    search_fields = ('recipient', 'booking__id', 'provider_message_id')
+    raw_id_fields = ('booking',)
+    ordering = ('-id',)
+    readonly_fields = [field.name for field in Notification._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,45 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.notifications.services import NotificationService
+
+
+class Command(BaseCommand):
+    help = "Delivers pending outbox notifications in batches until stopped (SIGTERM finishes the current batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=200, help="Notifications claimed per round")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when nothing is due")
+        parser.add_argument("--once", action="store_true", help="Drain the due notifications and exit")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        total_sent = total_failed = 0
+        last_sweep = 0.0
+        while not self.stopping:
+            close_old_connections()
+            if time.monotonic() - last_sweep > settings.JOB_LOCK_TIMEOUT / 2:
+                NotificationService.requeue_stale()
+                last_sweep = time.monotonic()
+
+            notifications = NotificationService.claim(options["batch"])
+            if notifications:
+                sent, failed = NotificationService.dispatch(notifications)
+                total_sent += sent
+                total_failed += failed
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} notifications, {total_failed} failed"))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('bookings', '0012_booking_cart_hash_idempotencykey_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('channel', models.CharField(choices=[('sms', 'SMS'), ('email', 'Email')], help_text='Delivery channel; picks the provider', max_length=10)),
+                ('kind', models.CharField(choices=[('otp', 'Login OTP'), ('booking_confirmed', 'Booking confirmed'), ('booking_cancelled', 'Booking cancelled')], help_text='What the message is about', max_length=30)),
+                ('recipient', models.CharField(help_text='Phone number or email address', max_length=255)),
+                ('subject', models.CharField(blank=True, help_text='Email subject', max_length=255)),
+                ('body', models.TextField(help_text='Rendered message text (cleared after sending for OTPs)')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Higher is sent first')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('expired', 'Expired')], default='pending', help_text='Delivery state', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Delivery attempts so far')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time of the next attempt')),
+                ('expires_at', models.DateTimeField(blank=True, help_text='Drop instead of sending after this time', null=True)),
+                ('locked_at', models.DateTimeField(blank=True, help_text='When a dispatcher claimed the message', null=True)),
+                ('sent_at', models.DateTimeField(blank=True, help_text='When the provider accepted the message', null=True)),
+                ('provider_message_id', models.CharField(blank=True, help_text='Id returned by the provider', max_length=255)),
+                ('last_error', models.TextField(blank=True, help_text='Most recent delivery error')),
+                ('booking', models.ForeignKey(blank=True, help_text='Booking the message is about', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='bookings.booking')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-priority', 'next_attempt_at'], name='notification_outbox_idx')],
+            },
+        ),
+    ]
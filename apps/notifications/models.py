@@ -0,0 +1,70 @@
+from django.db import models
+from django.utils import timezone
+from apps.common.models import TimeStampedModel
+
+
+class Notification(TimeStampedModel):
+    """
+    Outbox row for an SMS or email. Rows are written in the same transaction as
+    the change they announce and delivered later by send_notifications, so a
+    request never waits on a provider and a rolled-back change sends nothing.
+    """
+    SMS = "sms"
+    EMAIL = "email"
+    CHANNEL_CHOICES = (
+        (SMS, "SMS"),
+        (EMAIL, "Email"),
+    )
+
+    OTP = "otp"
+    BOOKING_CONFIRMED = "booking_confirmed"
+    BOOKING_CANCELLED = "booking_cancelled"
+    KIND_CHOICES = (
+        (OTP, "Login OTP"),
+        (BOOKING_CONFIRMED, "Booking confirmed"),
+        (BOOKING_CANCELLED, "Booking cancelled"),
+    )
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+        (EXPIRED, "Expired"),
+    )
+
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES, help_text="Delivery channel; picks the provider")
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, help_text="What the message is about")
+    recipient = models.CharField(max_length=255, help_text="Phone number or email address")
+    subject = models.CharField(max_length=255, blank=True, help_text="Email subject")
+    body = models.TextField(help_text="Rendered message text (cleared after sending for OTPs)")
+    booking = models.ForeignKey(
+        "bookings.Booking",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="notifications",
+        help_text="Booking the message is about",
+    )
+    priority = models.SmallIntegerField(default=0, help_text="Higher is sent first")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING, help_text="Delivery state")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Delivery attempts so far")
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time of the next attempt")
+    expires_at = models.DateTimeField(null=True, blank=True, help_text="Drop instead of sending after this time")
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="When a dispatcher claimed the message")
+    sent_at = models.DateTimeField(null=True, blank=True, help_text="When the provider accepted the message")
+    provider_message_id = models.CharField(max_length=255, blank=True, help_text="Id returned by the provider")
+    last_error = models.TextField(blank=True, help_text="Most recent delivery error")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-priority", "next_attempt_at"], name="notification_outbox_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.recipient} ({self.status})"
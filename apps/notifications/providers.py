@@ -0,0 +1,154 @@
+"""
+Delivery providers for outbox notifications.
+
+A provider receives plain message dicts ({"id", "recipient", "subject",
+"body"}) and never touches the ORM, so send_notifications can drive many of them
+concurrently on one asyncio loop. Subclasses implement send() for one message,
+or send_batch() when the upstream API accepts several messages per call
+(batch_size). dispatch() applies the per-provider rate limit and concurrency
+configured in NOTIFICATION_PROVIDERS.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core import mail
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderError(Exception):
+    """A message was not delivered; retry=False means trying again won't help."""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+class RateLimiter:
+    """
+    At most limit sends per period seconds, allowing a burst of limit
+    (GCRA). Only plain floats are kept, so one limiter serves successive loops.
+    """
+
+    def __init__(self, rate):
+        limit, period = rate.split("/")
+        self.period = float(period)
+        self.interval = self.period / int(limit)
+        self.tat = 0.0  # theoretical arrival time of the next free slot
+
+    async def acquire(self, count=1):
+        now = time.monotonic()
+        # Reserve before sleeping so concurrent callers queue up behind each other
+        self.tat = max(self.tat, now) + self.interval * count
+        wait = self.tat - self.period - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BaseProvider:
+    batch_size = 1
+
+    def __init__(self, name, rate="10/1", concurrency=4, **options):
+        self.name = name
+        self.limiter = RateLimiter(rate)
+        self.concurrency = concurrency
+        self.options = options
+
+    async def send(self, message):
+        """Delivers one message and returns the provider's message id."""
+        raise NotImplementedError
+
+    async def send_batch(self, messages):
+        """
+        Delivers messages in one call where the API allows it. Returns
+        {message id: provider id or ProviderError}.
+        """
+        results = await asyncio.gather(*(self.send(message) for message in messages), return_exceptions=True)
+        return {message["id"]: result for message, result in zip(messages, results)}
+
+    async def dispatch(self, messages):
+        """Sends all messages in batch_size chunks within the rate and concurrency limits."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        chunks = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+
+        async def run(chunk):
+            async with semaphore:
+                await self.limiter.acquire(len(chunk))
+                try:
+                    return await self.send_batch(chunk)
+                except Exception as exc:
+                    return {message["id"]: exc for message in chunk}
+
+        results = {}
+        for chunk_results in await asyncio.gather(*(run(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+        return results
+
+
+class ConsoleProvider(BaseProvider):
+    """Local stand-in: logs each message (OTPs included) instead of sending it."""
+
+    async def send(self, message):
+        logger.warning("[%s] to %s: %s %s", self.name, message["recipient"], message["subject"], message["body"])
+        return f"console-{message['id']}"
+
+
+class FileProvider(BaseProvider):
+    """Local stand-in: appends each batch as JSON lines to OPTIONS["path"]."""
+
+    batch_size = 50
+    _lock = threading.Lock()
+
+    def write(self, messages):
+        sent_at = timezone.now().isoformat()
+        lines = "".join(
+            json.dumps({"provider": self.name, "sent_at": sent_at, **message}) + "\n" for message in messages
+        )
+        with self._lock, open(self.options.get("path", settings.BASE_DIR / "outbox.log"), "a") as handle:
+            handle.write(lines)
+
+    async def send_batch(self, messages):
+        await asyncio.to_thread(self.write, messages)
+        return {message["id"]: f"file-{message['id']}" for message in messages}
+
+
+class DjangoEmailProvider(BaseProvider):
+    """Sends email through Django's EMAIL_BACKEND, one connection per batch."""
+
+    batch_size = 50
+
+    def write(self, messages):
+        emails = [
+            mail.EmailMessage(message["subject"], message["body"], to=[message["recipient"]])
+            for message in messages
+        ]
+        with mail.get_connection(fail_silently=False) as connection:
+            connection.send_messages(emails)
+
+    async def send_batch(self, messages):
+        await asyncio.to_thread(self.write, messages)
+        return {message["id"]: "" for message in messages}
+
+
+_providers = {}
+
+
+def get_provider(channel):
+    """The configured provider for a channel, built once per process."""
+    provider = _providers.get(channel)
+    if provider is None:
+        config = settings.NOTIFICATION_PROVIDERS[channel]
+        provider = import_string(config["BACKEND"])(
+            channel,
+            rate=config.get("RATE", "10/1"),
+            concurrency=config.get("CONCURRENCY", 4),
+            **config.get("OPTIONS", {}),
+        )
+        _providers[channel] = provider
+    return provider
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.jobs.queue import JobQueue
+from .models import Notification
+from .providers import ProviderError, get_provider
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """
+    Writes outbox rows for user-facing messages and delivers them in batches.
+
+    The enqueue helpers only insert rows, so call them inside the transaction
+    whose outcome they announce. send_notifications claims due rows, sends
+    each channel's batch concurrently through its provider and records the
+    results.
+    """
+
+    @staticmethod
+    def otp(phone, code):
+        return Notification.objects.create(
+            channel=Notification.SMS,
+            kind=Notification.OTP,
+            recipient=phone,
+            body=f"{code} is your Thrillobay login code. It expires in {settings.OTP_TTL_SECONDS // 60} minutes.",
+            priority=10,
+            # An OTP that arrives after it has expired is just noise
+            expires_at=timezone.now() + timedelta(seconds=settings.OTP_TTL_SECONDS),
+        )
+
+    @staticmethod
+    def booking_confirmed(booking):
+        return NotificationService.for_booking(
+            booking,
+            Notification.BOOKING_CONFIRMED,
+            subject=f"Booking {booking.display_reference} confirmed",
+            body=(
+                f"Hi {booking.full_name or 'there'}, your {booking.get_booking_type_display().lower()} "
+                f"booking {booking.display_reference} is confirmed. Total ₹{booking.total_amount}, paid ₹{booking.amount_paid}."
+            ),
+        )
+
+    @staticmethod
+    def booking_cancelled(booking):
+        return NotificationService.for_booking(
+            booking,
+            Notification.BOOKING_CANCELLED,
+            subject=f"Booking {booking.display_reference} cancelled",
+            body=(
+                f"Hi {booking.full_name or 'there'}, your booking {booking.display_reference} has been cancelled. "
+                f"Any refund due will be processed to your original payment method."
+            ),
+        )
+
+    @staticmethod
+    def for_booking(booking, kind, subject, body):
+        """One SMS and one email per booking contact that is filled in."""
+        recipients = []
+        if booking.phone:
+            recipients.append((Notification.SMS, f"{booking.country_code}{booking.phone}"))
+        if booking.email:
+            recipients.append((Notification.EMAIL, booking.email))
+        return Notification.objects.bulk_create([
+            Notification(channel=channel, kind=kind, recipient=recipient, subject=subject, body=body, booking=booking)
+            for channel, recipient in recipients
+        ])
+
+    @staticmethod
+    def claim(limit):
+        """Marks up to limit due notifications as sending and returns them."""
+        now = timezone.now()
+        due = Notification.objects.filter(
+            status=Notification.PENDING, next_attempt_at__lte=now
+        ).order_by("-priority", "next_attempt_at", "id")
+        sending = dict(status=Notification.SENDING, locked_at=now, attempts=F("attempts") + 1)
+
+        alias = router.db_for_write(Notification)
+        if connections[alias].features.has_select_for_update_skip_locked:
+            with transaction.atomic(using=alias):
+                ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+                Notification.objects.filter(id__in=ids).update(**sending)
+        else:
+            ids = list(due.values_list("id", flat=True)[:limit])
+            # One statement: rows another dispatcher took meanwhile are skipped
+            Notification.objects.filter(id__in=ids, status=Notification.PENDING).update(**sending)
+            ids = list(Notification.objects.filter(id__in=ids, status=Notification.SENDING, locked_at=now).values_list("id", flat=True))
+
+        return list(Notification.objects.filter(id__in=ids))
+
+    @staticmethod
+    def dispatch(notifications):
+        """Sends claimed notifications and records the outcome. Returns (sent, failed)."""
+        now = timezone.now()
+        by_channel = {}
+        for notification in notifications:
+            if notification.expires_at and notification.expires_at <= now:
+                notification.status = Notification.EXPIRED
+                notification.body = ""
+                continue
+            by_channel.setdefault(notification.channel, []).append(notification)
+
+        async def send_all():
+            channels = list(by_channel)
+            results = await asyncio.gather(*(
+                get_provider(channel).dispatch([
+                    {"id": n.id, "recipient": n.recipient, "subject": n.subject, "body": n.body}
+                    for n in by_channel[channel]
+                ])
+                for channel in channels
+            ), return_exceptions=True)
+            return dict(zip(channels, results))
+
+        results = asyncio.run(send_all()) if by_channel else {}
+
+        sent = failed = 0
+        for channel, channel_notifications in by_channel.items():
+            outcome = results[channel]
+            for notification in channel_notifications:
+                result = outcome if isinstance(outcome, Exception) else outcome.get(notification.id)
+                if isinstance(result, Exception) or result is None:
+                    failed += 1
+                    NotificationService.record_failure(notification, result)
+                else:
+                    sent += 1
+                    notification.status = Notification.SENT
+                    notification.sent_at = timezone.now()
+                    notification.provider_message_id = str(result)
+                    notification.last_error = ""
+                    if notification.kind == Notification.OTP:
+                        notification.body = ""
+
+        for notification in notifications:
+            notification.locked_at = None
+        Notification.objects.bulk_update(
+            notifications,
+            ["status", "body", "sent_at", "provider_message_id", "last_error", "next_attempt_at", "locked_at"],
+        )
+        return sent, failed
+
+    @staticmethod
+    def record_failure(notification, error):
+        error = error or ProviderError("Provider returned no result for this message.")
+        logger.warning("Notification %s to %s failed: %s", notification.id, notification.recipient, error)
+        notification.last_error = str(error)
+        retry = getattr(error, "retry", True)
+        if retry and notification.attempts < settings.NOTIFICATION_MAX_ATTEMPTS:
+            notification.status = Notification.PENDING
+            notification.next_attempt_at = timezone.now() + timedelta(seconds=JobQueue.backoff(notification.attempts))
+        else:
+            notification.status = Notification.FAILED
+            if notification.kind == Notification.OTP:
+                notification.body = ""
+
+    @staticmethod
+    def requeue_stale():
+        """Releases notifications claimed by a dispatcher that died mid-batch."""
+        cutoff = timezone.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+        return Notification.objects.filter(status=Notification.SENDING, locked_at__lt=cutoff).update(
+            status=Notification.PENDING, locked_at=None
+        )
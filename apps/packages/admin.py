@@ -8,6 +8,7 @@ from .models import (
     PackageAccommodation, PackageActivity, PackageTransfer, PackageInclusion,
     PackageTheme
 )
+from apps.common.admin_mixins import AutocompleteMixin, ImagePreviewMixin, PerformanceModelAdmin
 
 # --- FORMS & VALIDATION ---
 
@@ -47,27 +48,18 @@ class PackageItineraryForm(forms.ModelForm):
 
 # --- INLINES ---
 
-class PackageImageInline(admin.TabularInline):
+class PackageImageInline(ImagePreviewMixin, admin.TabularInline):
     model = PackageImage
     extra = 1
     classes = ("collapse",)
     verbose_name = "Gallery Image"
-    readonly_fields = ("image_preview",)
-
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
 class PackageFeatureInline(admin.TabularInline):
     model = PackageFeature
     extra = 1
     classes = ("collapse",)
 
-class PackageItineraryInline(admin.StackedInline):
+class PackageItineraryInline(AutocompleteMixin, admin.StackedInline):
     model = PackageItinerary
     form = PackageItineraryForm
     extra = 1
@@ -112,12 +104,12 @@ class PackageInclusionInline(admin.TabularInline):
 # --- MAIN ADMIN ---
 
 @admin.register(PackageTheme)
-class PackageThemeAdmin(admin.ModelAdmin):
+class PackageThemeAdmin(PerformanceModelAdmin):
     list_display = ("name",)
     search_fields = ("name",)
 
 @admin.register(HolidayPackage)
-class HolidayPackageAdmin(admin.ModelAdmin):
+class HolidayPackageAdmin(PerformanceModelAdmin):
     save_as = True
     # Display configuration
     list_display = ("title", "primary_location", "duration_days", "duration_nights", "base_price", "is_active")
@@ -189,20 +181,20 @@ class HolidayPackageAdmin(admin.ModelAdmin):
         }
 
 @admin.register(PackageItinerary)
-class PackageItineraryAdmin(admin.ModelAdmin):
+class PackageItineraryAdmin(PerformanceModelAdmin):
     list_display = ("package", "day_number", "title")
     list_filter = ("day_number", "package__primary_location")
     search_fields = ("title", "day_number", "package__title")  # REQUIRED for autocomplete
     raw_id_fields = ("package", "stay_property", "stay_houseboat")
 
 @admin.register(PackageActivity)
-class PackageActivityAdmin(admin.ModelAdmin):
+class PackageActivityAdmin(PerformanceModelAdmin):
     list_display = ("name", "package", "itinerary_day")
     search_fields = ("name", "package__title")
     raw_id_fields = ("package", "itinerary_day")
 
 @admin.register(PackageTransfer)
-class PackageTransferAdmin(admin.ModelAdmin):
+class PackageTransferAdmin(PerformanceModelAdmin):
     list_display = ("transport_type", "package", "itinerary_day")
     search_fields = ("transport_type", "package__title")
     raw_id_fields = ("package", "itinerary_day")
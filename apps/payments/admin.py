@@ -1,9 +1,10 @@
 from django.contrib import admin
 from .models import Payment
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(PerformanceModelAdmin):
     list_display = ('id', 'booking', 'payment_mode', 'amount', 'status', 'transaction_id', 'created_at')
     list_filter = ('payment_mode', 'status', 'created_at', 'updated_at')
     search_fields = ('id', 'transaction_id', 'booking__id', 'booking__user__username', 'booking__user__email')
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Property, RoomType, PropertyImage, RoomTypeImage, Discount, Amenity, RoomOption, FamousPlace
+from .models import Property, RoomType, PropertyImage, RoomTypeImage, Discount, Amenity, RoomOption, FamousPlace, RoomRate, RoomRateSeason
+from apps.common.admin_mixins import ImagePreviewMixin, PerformanceModelAdmin
 
 
 @admin.register(FamousPlace)
-class FamousPlaceAdmin(admin.ModelAdmin):
+class FamousPlaceAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = ("name", "city", "location", "is_active")
     list_filter = ("city", "is_active")
@@ -12,49 +13,31 @@ class FamousPlaceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Discount)
-class DiscountAdmin(admin.ModelAdmin):
+class DiscountAdmin(PerformanceModelAdmin):
     list_display = ("name", "discount_type", "value", "is_active")
     list_filter = ("discount_type", "is_active")
     search_fields = ("name",)
 
 
 @admin.register(Amenity)
-class AmenityAdmin(admin.ModelAdmin):
+class AmenityAdmin(PerformanceModelAdmin):
     list_display = ("name", "icon_preview")
     search_fields = ("name",)
 
     def icon_preview(self, obj):
         if obj.icon:
-            return format_html('<img src="{}" width="30" height="30" />', obj.icon.url)
+            return format_html('<img src="{}" width="30" height="30" loading="lazy" />', obj.icon.url)
         return "No Icon"
 
 
-class PropertyImageInline(admin.TabularInline):
+class PropertyImageInline(ImagePreviewMixin, admin.TabularInline):
     model = PropertyImage
     extra = 1
-    readonly_fields = ("image_preview",)
 
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
-
-class RoomTypeImageInline(admin.TabularInline):
+class RoomTypeImageInline(ImagePreviewMixin, admin.TabularInline):
     model = RoomTypeImage
     extra = 1
-    readonly_fields = ("image_preview",)
-
-    def image_preview(self, obj):
-        if obj.image:
-            try:
-                return format_html('<img src="{}" width="100" height="auto" />', obj.image.url)
-            except:
-                return "No image"
-        return "No image"
 
 
 class RoomTypeInline(admin.TabularInline):
@@ -64,7 +47,7 @@ class RoomTypeInline(admin.TabularInline):
 
 
 @admin.register(Property)
-class PropertyAdmin(admin.ModelAdmin):
+class PropertyAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = (
         "name",
@@ -88,10 +71,11 @@ class PropertyAdmin(admin.ModelAdmin):
     filter_horizontal = ("amenities",)
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
+    prepopulated_fields = {"slug": ("name", "city")}
 
     fieldsets = (
         ("Basic Information", {
-            "fields": ("name", "property_type", "description", "is_active")
+            "fields": ("name", "slug", "property_type", "description", "is_active")
         }),
         ("Location", {
             "fields": ("city", "area", "state", "latitude", "longitude")
@@ -122,8 +106,14 @@ class RoomOptionInline(admin.TabularInline):
     fields = ("name", "base_price", "has_breakfast", "has_lunch", "has_dinner", "is_refundable")
 
 
+class RoomRateSeasonInline(admin.TabularInline):
+    model = RoomRateSeason
+    extra = 0
+    fields = ("name", "room_option", "start_date", "end_date", "weekdays", "price")
+
+
 @admin.register(RoomType)
-class RoomTypeAdmin(admin.ModelAdmin):
+class RoomTypeAdmin(PerformanceModelAdmin):
     list_display = (
         "name",
         "property",
@@ -135,7 +125,7 @@ class RoomTypeAdmin(admin.ModelAdmin):
     list_filter = ("has_breakfast", "max_guests", "property__property_type")
     search_fields = ("name", "property__name")
     raw_id_fields = ("property",)
-    inlines = [RoomOptionInline, RoomTypeImageInline]
+    inlines = [RoomOptionInline, RoomRateSeasonInline, RoomTypeImageInline]
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
 
@@ -150,3 +140,20 @@ class RoomTypeAdmin(admin.ModelAdmin):
             "fields": ("total_units",)
         }),
     )
+
+
+@admin.register(RoomRate)
+class RoomRateAdmin(PerformanceModelAdmin):
+    """Per-night prices and stop sales; seasonal rows are managed through the room type's seasons."""
+    list_display = ("room_type", "room_option", "date", "price", "is_closed", "source")
+    list_filter = ("source", "is_closed")
+    search_fields = ("room_type__name", "room_type__property__name")
+    raw_id_fields = ("room_option",)
+    readonly_fields = ("source", "season")
+    date_hierarchy = "date"
+    ordering = ("room_type", "date")
+
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and obj.season_id:
+            return False
+        return super().has_change_permission(request, obj)
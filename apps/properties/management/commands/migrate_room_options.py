@@ -1,23 +1,24 @@
-from django.core.management.base import BaseCommand
+from apps.common.backfill import BackfillCommand
 from apps.properties.models import RoomType, RoomOption
 
-class Command(BaseCommand):
+class Command(BackfillCommand):
     help = 'Migrate RoomType pricing to RoomOption'
 
-    def handle(self, *args, **kwargs):
-        room_types = RoomType.objects.all()
-        count = 0
+    def get_queryset(self):
+        # Room types that already have options are left alone
+        return RoomType.objects.filter(options__isnull=True).only(
+            'id', 'description', 'base_price', 'has_breakfast', 'refund_policy'
+        )
+
+    def process_batch(self, room_types):
+        options = []
         for rt in room_types:
-            # Check if options already exist to avoid duplication
-            if rt.options.exists():
-                continue
-                
             # Create a default option based on current RoomType settings
             option_name = "Standard Rate"
             if rt.has_breakfast:
                 option_name = "Breakfast Included"
-            
-            RoomOption.objects.create(
+
+            options.append(RoomOption(
                 room_type=rt,
                 name=option_name,
                 description=rt.description,
@@ -27,7 +28,5 @@ class Command(BaseCommand):
                 has_dinner=False,
                 is_refundable=True, # Default assumption or check policy text?
                 cancellation_policy=rt.refund_policy
-            )
-            count += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully created {count} RoomOptions'))
+            ))
+        return len(RoomOption.objects.bulk_create(options))
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:03
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0013_property_latitude_property_longitude'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomRateSeason',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('name', models.CharField(help_text='Season name (e.g. Onam, Monsoon weekends)', max_length=100)),
+                ('start_date', models.DateField(help_text='First night of the season')),
+                ('end_date', models.DateField(help_text='Last night of the season')),
+                ('weekdays', models.CharField(blank=True, help_text='Nights the price applies on, as digits 0 (Monday) to 6 (Sunday); empty for every night', max_length=7, validators=[django.core.validators.RegexValidator('^[0-6]*$', 'Use digits 0 (Monday) to 6 (Sunday).')])),
+                ('price', models.DecimalField(decimal_places=2, help_text='Base price per night during the season', max_digits=12)),
+                ('room_option', models.ForeignKey(blank=True, help_text="Option the price is for; empty for the room type's own price", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rate_seasons', to='properties.roomoption')),
+                ('room_type', models.ForeignKey(help_text='Related room type', on_delete=django.db.models.deletion.CASCADE, related_name='rate_seasons', to='properties.roomtype')),
+            ],
+            options={
+                'ordering': ['start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('date', models.DateField(help_text='Night the rate applies to')),
+                ('price', models.DecimalField(blank=True, decimal_places=2, help_text='Base price for the night; empty keeps the regular price', max_digits=12, null=True)),
+                ('is_closed', models.BooleanField(default=False, help_text='Stop sale: the room cannot be booked for this night')),
+                ('source', models.CharField(choices=[('manual', 'Manual'), ('season', 'Season')], default='manual', help_text='Entered by hand or expanded from a season', max_length=10)),
+                ('room_option', models.ForeignKey(blank=True, help_text="Option the price is for; empty for the room type's own price", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='properties.roomoption')),
+                ('room_type', models.ForeignKey(help_text='Related room type', on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='properties.roomtype')),
+                ('season', models.ForeignKey(blank=True, help_text='Season the rate was expanded from', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='properties.roomrateseason')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['room_type', 'date'], name='room_rate_lookup')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='roomrate',
+            constraint=models.UniqueConstraint(condition=models.Q(('room_option__isnull', True)), fields=('room_type', 'date', 'source'), name='unique_room_type_rate'),
+        ),
+        migrations.AddConstraint(
+            model_name='roomrate',
+            constraint=models.UniqueConstraint(condition=models.Q(('room_option__isnull', False)), fields=('room_option', 'date', 'source'), name='unique_room_option_rate'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-19 09:12
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_slugs(apps, schema_editor):
+    """Gives every existing property a unique slug from its name and city, in id order."""
+    Property = apps.get_model("properties", "Property")
+    taken = set()
+    for row in Property.objects.order_by("id").iterator():
+        base = slugify(f"{row.name} {row.city}")[:249].strip("-") or "property"
+        slug, number = base, 2
+        while slug in taken:
+            slug, number = f"{base}-{number}", number + 1
+        taken.add(slug)
+        Property.objects.filter(pk=row.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0014_roomrateseason_roomrate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='slug',
+            field=models.SlugField(blank=True, default='', help_text='Unique slug for the property, generated from name and city when left blank', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='property',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Unique slug for the property, generated from name and city when left blank', max_length=255, unique=True),
+        ),
+    ]
@@ -1,7 +1,11 @@
 import builtins
 from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.core.validators import RegexValidator
 from django.db import models
 from apps.common.models import TimeStampedModel
+from apps.common.rates import MANUAL, MAX_SEASON_DAYS, RATE_SOURCE_CHOICES
+from apps.common.utils import unique_slug
 
 
 class Discount(TimeStampedModel):
@@ -50,6 +54,9 @@ class Property(TimeStampedModel):
     ]
 
     name = models.CharField(max_length=255, help_text="Name of the property")
+    slug = models.SlugField(
+        max_length=255, unique=True, blank=True, help_text="Unique slug for the property, generated from name and city when left blank"
+    )
     property_type = models.CharField(max_length=20, choices=PROPERTY_TYPE_CHOICES, help_text="Type of property")
     city = models.CharField(max_length=100, help_text="City where the property is located")
     area = models.CharField(max_length=100, blank=True, null=True, help_text="Area or locality")
@@ -90,6 +97,11 @@ class Property(TimeStampedModel):
     class Meta:
         verbose_name_plural = "Properties"
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(self, f"{self.name} {self.city}")
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} ({self.get_property_type_display()})"
 
@@ -152,6 +164,19 @@ class Property(TimeStampedModel):
             "total_payable": f"{total_payable:.2f}",
         }
 
+    def discount_for(self, base_price):
+        """Active property discount on a room price (per night)."""
+        if not self.discount or not self.discount.is_active:
+            return Decimal("0.00")
+
+        if self.discount.discount_type == "percentage":
+            return (base_price * self.discount.value / Decimal("100.00")).quantize(Decimal("0.01"))
+        return self.discount.value
+
+    def gst_for(self, discounted_price):
+        """GST on a discounted room price."""
+        return (discounted_price * self.gst_percent / Decimal("100.00")).quantize(Decimal("0.01"))
+
 
 class RoomType(TimeStampedModel):
     """
@@ -194,13 +219,7 @@ class RoomType(TimeStampedModel):
     @builtins.property
     def discount_amount(self):
         """Calculates discount amount based on property-level discount."""
-        discount_obj = self.property.discount
-        if not discount_obj or not discount_obj.is_active:
-            return Decimal("0.00")
-        
-        if discount_obj.discount_type == "percentage":
-            return (self.base_price * discount_obj.value / Decimal("100.00")).quantize(Decimal("0.01"))
-        return discount_obj.value
+        return self.property.discount_for(self.base_price)
 
     @builtins.property
     def discounted_price(self):
@@ -210,8 +229,7 @@ class RoomType(TimeStampedModel):
     @builtins.property
     def gst_amount(self):
         """Calculates GST based on discounted price."""
-        gst_factor = self.property.gst_percent / Decimal("100.00")
-        return (self.discounted_price * gst_factor).quantize(Decimal("0.01"))
+        return self.property.gst_for(self.discounted_price)
 
     @builtins.property
     def total_payable_amount(self):
@@ -279,13 +297,7 @@ class RoomOption(TimeStampedModel):
     @builtins.property
     def discount_amount(self):
         """Calculates discount amount based on property-level discount."""
-        discount_obj = self.room_type.property.discount
-        if not discount_obj or not discount_obj.is_active:
-            return Decimal("0.00")
-        
-        if discount_obj.discount_type == "percentage":
-            return (self.base_price * discount_obj.value / Decimal("100.00")).quantize(Decimal("0.01"))
-        return discount_obj.value
+        return self.room_type.property.discount_for(self.base_price)
 
     @builtins.property
     def discounted_price(self):
@@ -295,8 +307,7 @@ class RoomOption(TimeStampedModel):
     @builtins.property
     def gst_amount(self):
         """Calculates GST based on discounted price."""
-        gst_factor = self.room_type.property.gst_percent / Decimal("100.00")
-        return (self.discounted_price * gst_factor).quantize(Decimal("0.01"))
+        return self.room_type.property.gst_for(self.discounted_price)
 
     @builtins.property
     def total_payable_amount(self):
@@ -304,6 +315,90 @@ class RoomOption(TimeStampedModel):
         return self.discounted_price + self.gst_amount
 
 
+class RoomRateSeason(TimeStampedModel):
+    """
+    A nightly price for a room type, or one of its options, over a date range.
+    Saving or deleting a season re-expands the room's seasonal RoomRate rows
+    (see apps/common/rates.py); where seasons overlap, the later start wins.
+    """
+    room_type = models.ForeignKey(
+        RoomType, on_delete=models.CASCADE, related_name="rate_seasons", help_text="Related room type"
+    )
+    room_option = models.ForeignKey(
+        RoomOption, on_delete=models.CASCADE, null=True, blank=True, related_name="rate_seasons",
+        help_text="Option the price is for; empty for the room type's own price"
+    )
+    name = models.CharField(max_length=100, help_text="Season name (e.g. Onam, Monsoon weekends)")
+    start_date = models.DateField(help_text="First night of the season")
+    end_date = models.DateField(help_text="Last night of the season")
+    weekdays = models.CharField(
+        max_length=7, blank=True, validators=[RegexValidator(r"^[0-6]*$", "Use digits 0 (Monday) to 6 (Sunday).")],
+        help_text="Nights the price applies on, as digits 0 (Monday) to 6 (Sunday); empty for every night"
+    )
+    price = models.DecimalField(max_digits=12, decimal_places=2, help_text="Base price per night during the season")
+
+    class Meta:
+        ordering = ["start_date"]
+
+    def __str__(self):
+        return f"{self.name} ({self.start_date} to {self.end_date})"
+
+    def clean(self):
+        if self.start_date and self.end_date:
+            if self.end_date < self.start_date:
+                raise ValidationError({"end_date": "The season cannot end before it starts."})
+            if (self.end_date - self.start_date).days > MAX_SEASON_DAYS:
+                raise ValidationError({"end_date": f"A season can cover at most {MAX_SEASON_DAYS} nights."})
+        if self.room_option_id and self.room_option.room_type_id != self.room_type_id:
+            raise ValidationError({"room_option": "The option belongs to another room type."})
+
+
+class RoomRate(TimeStampedModel):
+    """
+    Nightly base price of a room type, or one of its options, on one date,
+    in place of base_price. A row on the room type itself (no option) that is
+    closed closes every option of the room for that night.
+    """
+    room_type = models.ForeignKey(
+        RoomType, on_delete=models.CASCADE, related_name="rates", help_text="Related room type"
+    )
+    room_option = models.ForeignKey(
+        RoomOption, on_delete=models.CASCADE, null=True, blank=True, related_name="rates",
+        help_text="Option the price is for; empty for the room type's own price"
+    )
+    date = models.DateField(help_text="Night the rate applies to")
+    price = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True, help_text="Base price for the night; empty keeps the regular price"
+    )
+    is_closed = models.BooleanField(default=False, help_text="Stop sale: the room cannot be booked for this night")
+    source = models.CharField(max_length=10, choices=RATE_SOURCE_CHOICES, default=MANUAL, help_text="Entered by hand or expanded from a season")
+    season = models.ForeignKey(
+        RoomRateSeason, on_delete=models.CASCADE, null=True, blank=True, related_name="rates", help_text="Season the rate was expanded from"
+    )
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room_type", "date", "source"], condition=models.Q(room_option__isnull=True), name="unique_room_type_rate"
+            ),
+            models.UniqueConstraint(
+                fields=["room_option", "date", "source"], condition=models.Q(room_option__isnull=False), name="unique_room_option_rate"
+            ),
+        ]
+        indexes = [
+            # Date-range reads per room type (the calendar and booking pricing)
+            models.Index(fields=["room_type", "date"], name="room_rate_lookup"),
+        ]
+
+    def __str__(self):
+        return f"{self.room_option or self.room_type} on {self.date}"
+
+    def clean(self):
+        if self.room_option_id and self.room_option.room_type_id != self.room_type_id:
+            raise ValidationError({"room_option": "The option belongs to another room type."})
+
+
 class FamousPlace(TimeStampedModel):
     name = models.CharField(max_length=255, help_text="Name of the famous place")
     description = models.TextField(help_text="Detailed description of the place")
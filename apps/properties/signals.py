@@ -1,6 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import Property, RoomType
+from apps.common.rates import expand_seasons
+from .models import Property, RoomRate, RoomRateSeason, RoomType
 
 @receiver(post_save, sender=Property)
 def sync_entire_place_room_type(sender, instance, created, **kwargs):
@@ -36,3 +37,21 @@ def sync_entire_place_room_type(sender, instance, created, **kwargs):
     else:
         # If disabled, remove the Entire Place option
         RoomType.objects.filter(property=instance, is_entire_place=True).delete()
+
+
+@receiver(pre_save, sender=RoomRateSeason)
+def remember_room_rate_season_target(sender, instance, **kwargs):
+    """Keeps the room type/option the season applied to before this save, in case it moves."""
+    instance._previous_target = (
+        RoomRateSeason.objects.filter(pk=instance.pk).values("room_type_id", "room_option_id").first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=RoomRateSeason)
+@receiver(post_delete, sender=RoomRateSeason)
+def expand_room_rate_seasons(sender, instance, **kwargs):
+    """Rewrites the seasonal nightly rates of the season's room type (or option), and of the one it moved from."""
+    target = {"room_type_id": instance.room_type_id, "room_option_id": instance.room_option_id}
+    previous = getattr(instance, "_previous_target", None)
+    for rates_target in [target] + ([previous] if previous and previous != target else []):
+        expand_seasons(RoomRate, rates_target, RoomRateSeason.objects.filter(**rates_target))
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import DailyRollup
+from apps.common.admin_mixins import PerformanceModelAdmin
+
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(PerformanceModelAdmin):
+    list_display = ('date', 'dimension', 'object_id', 'bookings', 'units', 'room_nights', 'units_available', 'revenue', 'cancellations')
+    list_filter = ('dimension', 'date')
+    search_fields = ('object_id',)
+    date_hierarchy = 'date'
+    ordering = ('-date', 'dimension', 'object_id')
+    # Maintained from bookings; fix data with manage.py rebuild_rollups
+    readonly_fields = [field.name for field in DailyRollup._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,7 @@
+from api.reports.services import RollupService
+from apps.jobs.queue import job
+
+
+@job("reports.refresh_booking")
+def refresh_booking(booking_id):
+    RollupService.refresh(booking_id)
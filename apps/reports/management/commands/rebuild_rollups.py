@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from api.reports.services import RollupService
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily booking rollups from scratch (after imports, item edits or fixes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Bookings read per round trip')
+
+    def handle(self, *args, **options):
+        report = lambda count: self.stdout.write(f'{count} bookings read')
+        bookings, rows = RollupService.rebuild(chunk_size=options['chunk_size'], report=report)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rollups from {bookings} bookings: {rows} rows'))
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('bookings', '0013_booking_reference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('contribution', models.JSONField(blank=True, default=list, help_text='[date, dimension, object id, {metric: amount}] entries applied for this booking')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('date', models.DateField(help_text='Day the figures belong to')),
+                ('dimension', models.CharField(choices=[('property', 'Property'), ('room_type', 'Room type'), ('houseboat', 'Houseboat'), ('package', 'Package'), ('activity', 'Activity'), ('cab', 'Cab')], help_text='Kind of catalog object', max_length=20)),
+                ('object_id', models.BigIntegerField(help_text='Id of the property, room type, houseboat, package, activity or cab')),
+                ('bookings', models.IntegerField(default=0, help_text='Confirmed bookings made this day that include the object')),
+                ('units', models.IntegerField(default=0, help_text='Booked units (booking items) in those bookings')),
+                ('room_nights', models.IntegerField(default=0, help_text='Units occupied on this night (stays and houseboats)')),
+                ('units_available', models.IntegerField(blank=True, help_text='Sellable units when last updated (room types and properties)', null=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text='Amount payable by customers, incl. taxes, after coupons', max_digits=14)),
+                ('taxes', models.DecimalField(decimal_places=2, default=0, help_text='GST included in revenue', max_digits=14)),
+                ('coupon_discount', models.DecimalField(decimal_places=2, default=0, help_text='Coupon discounts given', max_digits=14)),
+                ('cancellations', models.IntegerField(default=0, help_text='Bookings cancelled this day')),
+                ('cancelled_revenue', models.DecimalField(decimal_places=2, default=0, help_text='Amount of the bookings cancelled this day', max_digits=14)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('dimension', 'object_id', 'date'), name='unique_daily_rollup'),
+        ),
+        migrations.AddField(
+            model_name='bookingrollupstate',
+            name='booking',
+            field=models.OneToOneField(help_text='Related booking', on_delete=django.db.models.deletion.CASCADE, related_name='rollup_state', to='bookings.booking'),
+        ),
+    ]
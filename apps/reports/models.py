@@ -0,0 +1,61 @@
+from django.db import models
+from apps.common.models import TimeStampedModel
+
+
+class DailyRollup(TimeStampedModel):
+    """
+    Per-day booking totals for one catalog object, maintained by
+    api/reports/services.py as bookings change. Reports and dashboards read
+    these rows instead of aggregating Booking/BookingItem.
+
+    Sales figures (bookings, units, revenue, taxes, coupon discounts) sit on
+    the day the booking was made; room_nights on each night stayed;
+    cancellations on the day of cancellation.
+    """
+    PROPERTY = "property"
+    ROOM_TYPE = "room_type"
+    HOUSEBOAT = "houseboat"
+    PACKAGE = "package"
+    ACTIVITY = "activity"
+    CAB = "cab"
+    DIMENSION_CHOICES = (
+        (PROPERTY, "Property"),
+        (ROOM_TYPE, "Room type"),
+        (HOUSEBOAT, "Houseboat"),
+        (PACKAGE, "Package"),
+        (ACTIVITY, "Activity"),
+        (CAB, "Cab"),
+    )
+
+    date = models.DateField(help_text="Day the figures belong to")
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES, help_text="Kind of catalog object")
+    object_id = models.BigIntegerField(help_text="Id of the property, room type, houseboat, package, activity or cab")
+    bookings = models.IntegerField(default=0, help_text="Confirmed bookings made this day that include the object")
+    units = models.IntegerField(default=0, help_text="Booked units (booking items) in those bookings")
+    room_nights = models.IntegerField(default=0, help_text="Units occupied on this night (stays and houseboats)")
+    units_available = models.IntegerField(null=True, blank=True, help_text="Sellable units when last updated (room types and properties)")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Amount payable by customers, incl. taxes, after coupons")
+    taxes = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="GST included in revenue")
+    coupon_discount = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Coupon discounts given")
+    cancellations = models.IntegerField(default=0, help_text="Bookings cancelled this day")
+    cancelled_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Amount of the bookings cancelled this day")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "object_id", "date"], name="unique_daily_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.object_id} on {self.date}"
+
+
+class BookingRollupState(TimeStampedModel):
+    """
+    What a booking currently contributes to DailyRollup, so a change to the
+    booking only applies the difference instead of re-aggregating the day.
+    """
+    booking = models.OneToOneField("bookings.Booking", on_delete=models.CASCADE, related_name="rollup_state", help_text="Related booking")
+    contribution = models.JSONField(default=list, blank=True, help_text="[date, dimension, object id, {metric: amount}] entries applied for this booking")
+
+    def __str__(self):
+        return f"Rollup state of booking {self.booking_id}"
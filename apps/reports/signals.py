@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.bookings.models import Booking
+from apps.jobs.queue import JobQueue
+
+# Statuses whose bookings show up in the rollups
+ROLLUP_STATUSES = ("confirmed", "completed", "cancelled")
+
+
+@receiver(post_save, sender=Booking)
+def refresh_rollups(sender, instance, **kwargs):
+    """
+    Queues a rollup refresh once the save commits. Drafts and pending bookings
+    are skipped: they contribute nothing, and confirmed bookings only leave
+    the rollups by being cancelled, which is itself a tracked status.
+    """
+    if instance.status in ROLLUP_STATUSES:
+        JobQueue.enqueue_on_commit("reports.refresh_booking", {"booking_id": instance.pk}, queue="reports")
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import SupportRequest, SupportTimeline, FAQ, FAQItem
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 
 class SupportTimelineInline(admin.TabularInline):
@@ -17,7 +18,7 @@ class FAQItemInline(admin.StackedInline):
 
 
 @admin.register(SupportRequest)
-class SupportRequestAdmin(admin.ModelAdmin):
+class SupportRequestAdmin(PerformanceModelAdmin):
     list_display = ('id', 'booking', 'request_type', 'status', 'created_at', 'updated_at')
     list_filter = ('request_type', 'status', 'created_at', 'updated_at')
     search_fields = ('id', 'booking__id', 'booking__user__username', 'booking__user__email', 'request_type')
@@ -29,7 +30,7 @@ class SupportRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(SupportTimeline)
-class SupportTimelineAdmin(admin.ModelAdmin):
+class SupportTimelineAdmin(PerformanceModelAdmin):
     list_display = ('id', 'support_request', 'message', 'created_at')
     list_filter = ('created_at', 'updated_at', 'support_request__status')
     search_fields = ('message', 'support_request__id', 'support_request__booking__id')
@@ -40,7 +41,7 @@ class SupportTimelineAdmin(admin.ModelAdmin):
 
 
 @admin.register(FAQ)
-class FAQAdmin(admin.ModelAdmin):
+class FAQAdmin(PerformanceModelAdmin):
     save_as = True
     list_display = ("id", "location", "question", "is_active")
     list_filter = ("location", "is_active")
@@ -51,7 +52,7 @@ class FAQAdmin(admin.ModelAdmin):
 
 
 @admin.register(FAQItem)
-class FAQItemAdmin(admin.ModelAdmin):
+class FAQItemAdmin(PerformanceModelAdmin):
     list_display = ("id", "faq", "title", "order")
     list_filter = ("faq__location", "faq")
     search_fields = ("title", "description")
@@ -1,24 +1,44 @@
 from django.contrib import admin
-from .models import Wallet, WalletTransaction
+from .models import Wallet, WalletTransaction, WalletBalanceSnapshot
+from apps.common.admin_mixins import PerformanceModelAdmin
 
 
 @admin.register(Wallet)
-class WalletAdmin(admin.ModelAdmin):
+class WalletAdmin(PerformanceModelAdmin):
     list_display = ('user', 'balance', 'created_at', 'updated_at')
     list_filter = ('created_at', 'updated_at')
     search_fields = ('user__username', 'user__email', 'user__phone')
     raw_id_fields = ('user',)
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    # Balances only move through WalletService, together with a ledger entry
+    readonly_fields = ('balance', 'created_at', 'updated_at')
 
 
 @admin.register(WalletTransaction)
-class WalletTransactionAdmin(admin.ModelAdmin):
-    list_display = ('id', 'wallet', 'transaction_type', 'amount', 'reference', 'created_at')
+class WalletTransactionAdmin(PerformanceModelAdmin):
+    list_display = ('id', 'wallet', 'transaction_type', 'amount', 'balance_after', 'reference', 'created_at')
     list_filter = ('transaction_type', 'created_at', 'updated_at')
     search_fields = ('reference', 'wallet__user__username', 'wallet__user__email')
     raw_id_fields = ('wallet',)
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at')
+
+    # The ledger is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WalletBalanceSnapshot)
+class WalletBalanceSnapshotAdmin(PerformanceModelAdmin):
+    list_display = ('wallet', 'last_transaction_id', 'balance', 'credits_total', 'debits_total', 'created_at')
+    raw_id_fields = ('wallet',)
+    ordering = ('-created_at',)
+    readonly_fields = ('wallet', 'last_transaction_id', 'balance', 'credits_total', 'debits_total', 'created_at', 'updated_at')
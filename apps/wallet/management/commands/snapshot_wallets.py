@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, OuterRef, Subquery
+from apps.wallet.models import Wallet, WalletBalanceSnapshot
+from api.wallet.services import WalletService
+
+class Command(BaseCommand):
+    help = 'Reconcile wallets against their ledger and record balance snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Wallets loaded per query')
+
+    def handle(self, *args, **options):
+        # Only wallets with ledger entries after their latest snapshot need work
+        latest_snapshot = WalletBalanceSnapshot.objects.filter(wallet=OuterRef('pk')).order_by(
+            '-last_transaction_id'
+        ).values('last_transaction_id')[:1]
+        wallets = (
+            Wallet.objects.annotate(last_entry=Max('transactions__id'), last_snapshot=Subquery(latest_snapshot))
+            .filter(last_entry__isnull=False)
+            .values_list('pk', 'last_entry', 'last_snapshot')
+        )
+
+        snapshots = mismatches = 0
+        for wallet_id, last_entry, last_snapshot in wallets.iterator(chunk_size=options['batch_size']):
+            if last_snapshot is not None and last_snapshot >= last_entry:
+                continue
+            result = WalletService.take_snapshot(wallet_id)
+            if result['ok']:
+                snapshots += 1
+            else:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(
+                    f"Wallet {wallet_id}: balance {result['balance']} but ledger adds up to {result['expected']}"
+                ))
+
+        self.stdout.write(self.style.SUCCESS(f'Recorded {snapshots} snapshots, {mismatches} wallets out of balance'))
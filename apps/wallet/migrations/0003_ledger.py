@@ -0,0 +1,107 @@
+# Generated by Django 4.2.16 on 2026-10-19 04:27
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+import django.db.models.deletion
+from decimal import Decimal
+
+
+def backfill_balance_after(apps, schema_editor):
+    """
+    Normalizes transaction types to the "credit"/"debit" choices, then
+    rebuilds running balances for existing entries so that each wallet's last
+    entry ends on its current Wallet.balance.
+    """
+    Wallet = apps.get_model("wallet", "Wallet")
+    WalletTransaction = apps.get_model("wallet", "WalletTransaction")
+
+    WalletTransaction.objects.exclude(transaction_type__in=["credit", "debit"]).update(transaction_type=Lower("transaction_type"))
+
+    for wallet in Wallet.objects.filter(transactions__isnull=False).distinct().iterator():
+        entries = list(wallet.transactions.order_by("id").values_list("id", "transaction_type", "amount"))
+        signed = [
+            (pk, -amount if transaction_type == "debit" else amount)
+            for pk, transaction_type, amount in entries
+        ]
+        running = wallet.balance - sum((delta for _, delta in signed), Decimal(0))
+        for pk, delta in signed:
+            running += delta
+            WalletTransaction.objects.filter(pk=pk).update(balance_after=running)
+
+
+def create_opening_snapshots(apps, schema_editor):
+    """
+    Records each wallet's balance before its first entry (its whole balance
+    when it has none), so reconciliation replays from there instead of from 0.
+    """
+    Wallet = apps.get_model("wallet", "Wallet")
+    WalletBalanceSnapshot = apps.get_model("wallet", "WalletBalanceSnapshot")
+
+    snapshots = []
+    for wallet in Wallet.objects.iterator():
+        first = wallet.transactions.order_by("id").values_list("id", "transaction_type", "amount", "balance_after").first()
+        if first is None:
+            if wallet.balance:
+                snapshots.append(WalletBalanceSnapshot(wallet=wallet, last_transaction_id=0, balance=wallet.balance))
+            continue
+        pk, transaction_type, amount, balance_after = first
+        opening = balance_after + amount if transaction_type == "debit" else balance_after - amount
+        snapshots.append(WalletBalanceSnapshot(wallet=wallet, last_transaction_id=pk - 1, balance=opening))
+    WalletBalanceSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0002_alter_wallet_balance_alter_wallet_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp when the record was last updated')),
+                ('last_transaction_id', models.BigIntegerField(help_text='Id of the last ledger entry included in this snapshot')),
+                ('balance', models.DecimalField(decimal_places=2, help_text='Balance after last_transaction_id', max_digits=12)),
+                ('credits_total', models.DecimalField(decimal_places=2, default=0, help_text='Credits since the previous snapshot', max_digits=14)),
+                ('debits_total', models.DecimalField(decimal_places=2, default=0, help_text='Debits since the previous snapshot', max_digits=14)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='balance_after',
+            field=models.DecimalField(decimal_places=2, help_text='Wallet balance right after this entry', max_digits=12, null=True),
+        ),
+        migrations.RunPython(backfill_balance_after, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='balance_after',
+            field=models.DecimalField(decimal_places=2, help_text='Wallet balance right after this entry', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='description',
+            field=models.CharField(blank=True, help_text='Statement line shown to the user', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('credit', 'Credit'), ('debit', 'Debit')], help_text='Type of transaction (credit/debit)', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', 'created_at'], name='wallet_txn_wallet_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletbalancesnapshot',
+            name='wallet',
+            field=models.ForeignKey(help_text='Related wallet', on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='wallet.wallet'),
+        ),
+        migrations.AddConstraint(
+            model_name='walletbalancesnapshot',
+            constraint=models.UniqueConstraint(fields=('wallet', 'last_transaction_id'), name='unique_wallet_snapshot_point'),
+        ),
+        migrations.RunPython(create_opening_snapshots, migrations.RunPython.noop),
+    ]
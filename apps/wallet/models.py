@@ -11,10 +11,58 @@ class Wallet(TimeStampedModel):
 
 
 class WalletTransaction(TimeStampedModel):
+    """
+    Append-only ledger entry. Rows are only ever written by WalletService,
+    which moves Wallet.balance in the same transaction; they are never edited
+    or deleted afterwards (corrections are new, opposite entries).
+    """
+    CREDIT = "credit"
+    DEBIT = "debit"
+    TRANSACTION_TYPE = (
+        (CREDIT, "Credit"),
+        (DEBIT, "Debit"),
+    )
+
     wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name="transactions", help_text="Related wallet")
-    transaction_type = models.CharField(max_length=20, help_text="Type of transaction (credit/debit)")
+    transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPE, help_text="Type of transaction (credit/debit)")
     amount = models.DecimalField(max_digits=10, decimal_places=2, help_text="Transaction amount")
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2, help_text="Wallet balance right after this entry")
     reference = models.CharField(max_length=100, blank=True, help_text="Transaction reference ID")
+    description = models.CharField(max_length=255, blank=True, help_text="Statement line shown to the user")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["wallet", "created_at"], name="wallet_txn_wallet_created_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not self._state.adding:
+            raise ValueError("Wallet transactions are append-only and cannot be modified.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Wallet transactions are append-only and cannot be deleted.")
 
     def __str__(self):
         return f"{self.transaction_type.upper()} - ₹{self.amount} - {self.wallet.user.username}"
+
+
+class WalletBalanceSnapshot(TimeStampedModel):
+    """
+    Balance of a wallet as of a given ledger entry, written periodically by the
+    snapshot_wallets command. Reconciliation only sums entries after the latest
+    snapshot instead of the wallet's whole history.
+    """
+    wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name="snapshots", help_text="Related wallet")
+    last_transaction_id = models.BigIntegerField(help_text="Id of the last ledger entry included in this snapshot")
+    balance = models.DecimalField(max_digits=12, decimal_places=2, help_text="Balance after last_transaction_id")
+    credits_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Credits since the previous snapshot")
+    debits_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Debits since the previous snapshot")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["wallet", "last_transaction_id"], name="unique_wallet_snapshot_point"),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet_id} @ {self.last_transaction_id}: ₹{self.balance}"
@@ -2,6 +2,12 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with uvicorn workers, e.g.:
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
+Under ASGI the public read endpoints are served as async views (see
+api/async_views.py) unless ASYNC_READ_VIEWS is explicitly set to False.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +18,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
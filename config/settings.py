@@ -70,6 +70,10 @@ INSTALLED_APPS = [
     'apps.common',
     'apps.houseboats',
     'apps.dining',
+    'apps.jobs',
+    'apps.notifications',
+    'apps.invoices',
+    'apps.reports',
     'api',
 ]
 
@@ -81,6 +85,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.common.middleware.PrimaryPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -120,6 +125,52 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES['default'].update(db_from_env)
 
+# Shared cache (auth user cache, replica pins); per-process memory unless REDIS_URL is set
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+
+# Read replicas for the public catalog endpoints (comma-separated database URLs)
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(','))):
+    alias = f'replica_{index + 1}'
+    DATABASES[alias] = dj_database_url.parse(replica_url.strip(), conn_max_age=500)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['apps.common.db_router.PrimaryReplicaRouter']
+
+# Pooled connections: one bounded pool per process and alias instead of a
+# persistent connection per thread (see apps/common/db_pool.py)
+DATABASE_POOL = os.environ.get('DATABASE_POOL', 'False') == 'True'
+DATABASE_POOL_OPTIONS = {
+    'MAX_SIZE': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+    'TIMEOUT': float(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+    'MAX_LIFETIME': int(os.environ.get('DATABASE_POOL_MAX_LIFETIME', 1800)),
+    'HEALTH_CHECK_AFTER': int(os.environ.get('DATABASE_POOL_HEALTH_CHECK_AFTER', 30)),
+}
+if DATABASE_POOL:
+    for database in DATABASES.values():
+        vendor = database['ENGINE'].rsplit('.', 1)[-1]
+        if vendor in ('postgresql', 'sqlite3'):
+            database['ENGINE'] = f'apps.common.db_backends.{vendor}'
+            # Hand the connection back to the pool at the end of every request
+            database['CONN_MAX_AGE'] = 0
+            database['POOL'] = DATABASE_POOL_OPTIONS
+
+# Seconds a user's catalog reads stay on the primary after they write
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 15))
+
+# Seconds between replica health probes (also how long a failed replica is skipped)
+REPLICA_HEALTH_CHECK_INTERVAL = int(os.environ.get('REPLICA_HEALTH_CHECK_INTERVAL', 30))
+
+# Replicas further behind than this many seconds are skipped (Postgres only)
+REPLICA_MAX_LAG_SECONDS = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 30))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -181,7 +232,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -198,6 +249,101 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# Signed price quotes issued at booking review (seconds until a quote expires)
+PRICE_QUOTE_MAX_AGE = int(os.environ.get('PRICE_QUOTE_MAX_AGE', 900))
+
+# OTP login: code lifetime (seconds), wrong codes allowed per OTP, and
+# sliding-window limits as "requests/seconds" per phone and per client IP
+OTP_TTL_SECONDS = int(os.environ.get('OTP_TTL_SECONDS', 900))
+OTP_MAX_ATTEMPTS = int(os.environ.get('OTP_MAX_ATTEMPTS', 5))
+OTP_RATE_LIMITS = {
+    'send_phone': os.environ.get('OTP_RATE_LIMIT_SEND_PHONE', '5/900'),
+    'send_ip': os.environ.get('OTP_RATE_LIMIT_SEND_IP', '20/900'),
+    'verify_ip': os.environ.get('OTP_RATE_LIMIT_VERIFY_IP', '30/900'),
+}
+
+# Upper bound (seconds) on how stale a process's active-coupon cache can get
+COUPON_CACHE_TTL = int(os.environ.get('COUPON_CACHE_TTL', 300))
+
+# Seconds an authenticated user record is cached (shared cache / per process)
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 300))
+AUTH_USER_CACHE_LOCAL_TTL = int(os.environ.get('AUTH_USER_CACHE_LOCAL_TTL', 5))
+
+# How long (seconds) an Idempotency-Key on booking writes is remembered
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+
+# Serve the public read endpoints as async views (config.asgi turns this on)
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Worker threads (and so DB connections) per process for the async read views
+ASYNC_READ_THREADS = int(os.environ.get('ASYNC_READ_THREADS', 16))
+
+# Background jobs (manage.py run_jobs): attempts before a job is marked failed,
+# retry backoff base/cap (seconds), how long a running job may stay locked
+# before it is presumed abandoned, and the idle poll interval
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_BASE_DELAY = int(os.environ.get('JOB_RETRY_BASE_DELAY', 30))
+JOB_RETRY_MAX_DELAY = int(os.environ.get('JOB_RETRY_MAX_DELAY', 3600))
+JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 600))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2))
+
+# Outbox delivery (manage.py send_notifications): provider class per channel,
+# its rate limit as "messages/seconds" and how many sends it runs at once.
+# The console/file providers are local stand-ins for the real SMS/email APIs.
+NOTIFICATION_PROVIDERS = {
+    'sms': {
+        'BACKEND': os.environ.get('NOTIFICATION_SMS_BACKEND', 'apps.notifications.providers.ConsoleProvider'),
+        'RATE': os.environ.get('NOTIFICATION_SMS_RATE', '20/1'),
+        'CONCURRENCY': int(os.environ.get('NOTIFICATION_SMS_CONCURRENCY', 10)),
+    },
+    'email': {
+        'BACKEND': os.environ.get('NOTIFICATION_EMAIL_BACKEND', 'apps.notifications.providers.FileProvider'),
+        'RATE': os.environ.get('NOTIFICATION_EMAIL_RATE', '50/1'),
+        'CONCURRENCY': int(os.environ.get('NOTIFICATION_EMAIL_CONCURRENCY', 4)),
+        'OPTIONS': {'path': os.environ.get('NOTIFICATION_FILE_PATH', str(BASE_DIR / 'outbox.log'))},
+    },
+}
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 5))
+
+# GST invoices: supplier details printed on every invoice, number prefix,
+# where the PDFs are stored (Cloudinary raw files in production) and how many
+# processes render them (0 renders inline)
+INVOICE_SELLER = {
+    'name': os.environ.get('INVOICE_SELLER_NAME', 'Thrillobay'),
+    'address': os.environ.get('INVOICE_SELLER_ADDRESS', 'Kochi, Kerala, India'),
+    'gstin': os.environ.get('INVOICE_SELLER_GSTIN', ''),
+    'state_code': os.environ.get('INVOICE_SELLER_STATE_CODE', '32'),
+}
+INVOICE_NUMBER_PREFIX = os.environ.get('INVOICE_NUMBER_PREFIX', 'TB')
+INVOICE_FILE_STORAGE = os.environ.get('INVOICE_FILE_STORAGE', 'cloudinary_storage.storage.RawMediaCloudinaryStorage')
+INVOICE_RENDER_PROCESSES = int(os.environ.get('INVOICE_RENDER_PROCESSES', 2))
+
+# Booking references are handed out from per-process blocks of this many
+# values (gaps of up to one block per worker restart are expected)
+BOOKING_REFERENCE_PREFIX = os.environ.get('BOOKING_REFERENCE_PREFIX', 'TB')
+SEQUENCE_BLOCK_SIZE = int(os.environ.get('SEQUENCE_BLOCK_SIZE', 50))
+
+# Admin changelists of tables at least this big (by the database's own
+# estimate) show an estimated total instead of running COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000))
+
+# Cab fares: road distance is estimated as the straight-line distance times
+# the circuity factor (single routes can be set by hand in the admin), the
+# driver allowance of a trip longer than the cab's included_kms is charged
+# per started CAB_KMS_PER_DAY of the whole trip, and resolved pickup/drop
+# distances are cached this many seconds
+CAB_ROAD_CIRCUITY = float(os.environ.get('CAB_ROAD_CIRCUITY', 1.3))
+CAB_KMS_PER_DAY = int(os.environ.get('CAB_KMS_PER_DAY', 300))
+CAB_ROUTE_CACHE_TTL = int(os.environ.get('CAB_ROUTE_CACHE_TTL', 3600))
+
+# Cab scheduling: a trip keeps its vehicle for the drive at the average speed
+# plus a turnaround, or for the default when its route is unknown; no trip is
+# taken to last longer than the maximum (bounds how far back lookups read)
+CAB_AVERAGE_SPEED_KMPH = float(os.environ.get('CAB_AVERAGE_SPEED_KMPH', 40))
+CAB_TURNAROUND_MINUTES = int(os.environ.get('CAB_TURNAROUND_MINUTES', 60))
+CAB_DEFAULT_TRIP_HOURS = float(os.environ.get('CAB_DEFAULT_TRIP_HOURS', 4))
+CAB_MAX_TRIP_HOURS = float(os.environ.get('CAB_MAX_TRIP_HOURS', 72))
+
 # Media settings
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -0,0 +1,170 @@
+"""
+Compare concurrency ceilings of the sync (WSGI) and async (ASGI) deployments.
+
+Starts gunicorn twice against the same database - once with sync workers on
+config.wsgi, once with uvicorn workers on config.asgi - and drives the public
+read endpoints at increasing concurrency levels. For each level it reports
+throughput, p50/p95 latency and errors; the "ceiling" is the highest level
+that stays error-free with p95 under --slo-ms.
+
+--slow-clients keeps that many extra connections open for each level, trickling
+their request headers a byte at a time (a mobile client on a bad network). A
+sync worker is pinned by each of them; the uvicorn event loop is not.
+
+    python scripts/benchmark_asgi.py --workers 2 --levels 1,8,32,64,128
+"""
+import argparse
+import os
+import socket
+import statistics
+import threading
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATHS = [
+    "/api/home/popular-hotels/",
+    "/api/home/popular-holiday-packages/",
+    "/api/home/search/?type=hotel&destination=Munnar",
+    "/api/listings/hotels/",
+    "/api/listings/packages/",
+    "/api/listings/cabs/",
+]
+
+MODES = {
+    "wsgi": ["config.wsgi", "-k", "sync"],
+    "asgi": ["config.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+}
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def start_server(mode, port, workers):
+    env = dict(os.environ, ASYNC_READ_VIEWS="True" if mode == "asgi" else "False")
+    cmd = [
+        sys.executable, "-m", "gunicorn", *MODES[mode],
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
+    wait_for_port(port)
+    return proc
+
+
+def fetch(url, timeout):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            resp.read()
+            ok = resp.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def trickle(port, stop):
+    """Holds one connection open by sending the request head very slowly."""
+    head = b"GET /api/home/popular-hotels/ HTTP/1.1\r\nHost: localhost\r\nX-Slow: "
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(head)
+            while not stop.is_set():
+                sock.sendall(b"a")
+                stop.wait(0.5)
+    except OSError:
+        pass
+
+
+def run_level(port, concurrency, requests_per_client, timeout, slow_clients=0):
+    stop = threading.Event()
+    slow = [threading.Thread(target=trickle, args=(port, stop), daemon=True) for _ in range(slow_clients)]
+    for thread in slow:
+        thread.start()
+    time.sleep(0.5 if slow_clients else 0)
+
+    urls = [
+        f"http://127.0.0.1:{port}{PATHS[i % len(PATHS)]}"
+        for i in range(concurrency * requests_per_client)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda url: fetch(url, timeout), urls))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in slow:
+        thread.join()
+
+    latencies = sorted(latency for latency, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    if latencies:
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1 if len(latencies) > 1 else 0] * 1000
+    else:
+        p50 = p95 = float("inf")
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": p50,
+        "p95": p95,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes per mode")
+    parser.add_argument("--levels", default="1,8,32,64,128", help="comma-separated client concurrency levels")
+    parser.add_argument("--requests", type=int, default=10, help="requests per client at each level")
+    parser.add_argument("--slo-ms", type=float, default=500, help="p95 latency budget for the ceiling")
+    parser.add_argument("--timeout", type=float, default=10, help="per-request timeout in seconds")
+    parser.add_argument("--slow-clients", type=int, default=0, help="slow connections held open during each level")
+    parser.add_argument("--port", type=int, default=8765, help="first port to bind")
+    parser.add_argument("--modes", default="wsgi,asgi", help="which deployments to run")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    ceilings = {}
+
+    for offset, mode in enumerate(args.modes.split(",")):
+        port = args.port + offset
+        proc = start_server(mode, port, args.workers)
+        try:
+            # Warm up connections, URL resolver and any lazy imports
+            run_level(port, 2, 5, args.timeout)
+            print(f"\n{mode.upper()} ({args.workers} workers, {args.slow_clients} slow clients)")
+            print(f"{'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+            ceiling = 0
+            for level in levels:
+                stats = run_level(port, level, args.requests, args.timeout, args.slow_clients)
+                print(
+                    f"{level:>8} {stats['rps']:>9.1f} {stats['p50']:>9.1f} "
+                    f"{stats['p95']:>9.1f} {stats['errors']:>7}"
+                )
+                if stats["errors"] == 0 and stats["p95"] <= args.slo_ms:
+                    ceiling = level
+            ceilings[mode] = ceiling
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    print(f"\nConcurrency ceiling (no errors, p95 <= {args.slo_ms:.0f} ms):")
+    for mode, ceiling in ceilings.items():
+        print(f"  {mode}: {ceiling or 'below ' + str(levels[0])} clients")
+
+
+if __name__ == "__main__":
+    main()
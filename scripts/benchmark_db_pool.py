@@ -0,0 +1,142 @@
+"""
+Connection acquisition latency under thread-heavy worker configurations.
+
+Simulates request threads that each take a connection, run a query, hold it for
+--hold-ms (the rest of the request) and release it, against three setups built
+from the configured default database:
+
+    direct      CONN_MAX_AGE=0, a new server connection per request
+    persistent  CONN_MAX_AGE=500 (current settings), one connection per thread
+    pooled      apps.common.db_backends pool of --pool-size connections
+
+    python scripts/benchmark_db_pool.py --threads 8,32,64 --requests 50 --pool-size 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import connections
+
+from apps.common.db_pool import get_pool
+
+
+def add_alias(alias, **overrides):
+    config = dict(connections.settings["default"])
+    config["ENGINE"] = config["ENGINE"].replace("apps.common.db_backends.", "django.db.backends.")
+    config.update(overrides)
+    connections.settings[alias] = config
+
+
+def configure(pool_size):
+    vendor = connections.settings["default"]["ENGINE"].rsplit(".", 1)[-1]
+    add_alias("bench_direct", CONN_MAX_AGE=0)
+    add_alias("bench_persistent", CONN_MAX_AGE=500)
+    add_alias(
+        "bench_pooled",
+        ENGINE=f"apps.common.db_backends.{vendor}",
+        CONN_MAX_AGE=0,
+        POOL={"MAX_SIZE": pool_size, "TIMEOUT": 30, "MAX_LIFETIME": 1800, "HEALTH_CHECK_AFTER": 30},
+    )
+
+
+class Tracker:
+    """Counts physical connections opened and the peak held at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Keep the raw connections alive so id() values are never recycled
+        self.seen = {}
+        self.open_now = 0
+        self.peak = 0
+
+    def checkout(self, raw):
+        with self.lock:
+            self.seen[id(raw)] = raw
+            self.open_now += 1
+            self.peak = max(self.peak, self.open_now)
+
+    def checkin(self):
+        with self.lock:
+            self.open_now -= 1
+
+
+def simulate_request(alias, hold, tracker, latencies):
+    connection = connections[alias]
+    started = time.perf_counter()
+    connection.ensure_connection()
+    latencies.append(time.perf_counter() - started)
+    raw = connection.connection
+    tracker.checkout(raw)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    time.sleep(hold)
+    tracker.checkin()
+    # What request_finished does: close unless CONN_MAX_AGE says keep it
+    connection.close_if_unusable_or_obsolete()
+
+
+def run(alias, threads, requests, hold):
+    tracker = Tracker()
+    latencies = []
+
+    def worker(_):
+        for _ in range(requests):
+            simulate_request(alias, hold, tracker, latencies)
+        # Thread exit: persistent connections would live on in the real worker
+        connections[alias].close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max": latencies[-1] * 1000,
+        "opened": len(tracker.seen),
+        "peak": tracker.peak,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", default="8,32,64", help="comma-separated worker thread counts")
+    parser.add_argument("--requests", type=int, default=50, help="requests per thread")
+    parser.add_argument("--hold-ms", type=float, default=5, help="time a request keeps its connection")
+    parser.add_argument("--pool-size", type=int, default=10, help="max connections in the pooled setup")
+    args = parser.parse_args()
+
+    configure(args.pool_size)
+    hold = args.hold_ms / 1000
+
+    print(f"database: {connections.settings['default']['ENGINE']}  hold: {args.hold_ms} ms  pool: {args.pool_size}")
+    print(f"{'setup':<11} {'threads':>7} {'req/s':>8} {'acq p50':>9} {'acq p95':>9} {'acq max':>9} {'opened':>7} {'peak':>5}")
+    for threads in [int(value) for value in args.threads.split(",")]:
+        for mode in ("direct", "persistent", "pooled"):
+            alias = f"bench_{mode}"
+            stats = run(alias, threads, args.requests, hold)
+            print(
+                f"{mode:<11} {threads:>7} {stats['rps']:>8.0f} {stats['p50']:>8.3f}ms "
+                f"{stats['p95']:>8.3f}ms {stats['max']:>8.3f}ms {stats['opened']:>7} {stats['peak']:>5}"
+            )
+        pool = get_pool("bench_pooled", connections.settings["bench_pooled"])
+        print(f"  pool: {pool.stats()}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()